@@ -11,6 +11,31 @@ class Settings:
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "app/data/clario.db")
+    DB_POOL_MAX_CONNECTIONS: int = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "16"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    
+    # Executors for blocking work (0 = size automatically)
+    DB_EXECUTOR_WORKERS: int = int(os.getenv("DB_EXECUTOR_WORKERS", "0"))
+    ML_EXECUTOR_WORKERS: int = int(os.getenv("ML_EXECUTOR_WORKERS", "0"))
+    HTTP_EXECUTOR_WORKERS: int = int(os.getenv("HTTP_EXECUTOR_WORKERS", "0"))
+    
+    # Resource catalog cache
+    RESOURCE_CATALOG_TTL_SECONDS: float = float(os.getenv("RESOURCE_CATALOG_TTL_SECONDS", "300"))
+    
+    # HTTP caching for catalog and facet endpoints
+    HTTP_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("HTTP_CACHE_MAX_AGE_SECONDS", "60"))
+    
+    # Recommendation result cache (single-flight)
+    RECOMMENDATION_CACHE_SIZE: int = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "1024"))
+    RECOMMENDATION_CACHE_TTL_SECONDS: float = float(os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", "60"))
+    
+    # Response compression
+    COMPRESSION_MIN_SIZE_BYTES: int = int(os.getenv("COMPRESSION_MIN_SIZE_BYTES", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    COMPRESSION_CACHE_SIZE: int = int(os.getenv("COMPRESSION_CACHE_SIZE", "256"))
     
     # ML Settings
     ML_DATA_DIR: str = os.getenv("ML_DATA_DIR", "app/ml/data")
@@ -20,12 +45,26 @@ class Settings:
     GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "")
     GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
     GOOGLE_REDIRECT_URI: str = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8000/api/v1/auth/google/callback")
+    GOOGLE_OAUTH_BASE_URL: str = os.getenv("GOOGLE_OAUTH_BASE_URL", "https://accounts.google.com")
+    GOOGLE_OAUTH_TIMEOUT_SECONDS: float = float(os.getenv("GOOGLE_OAUTH_TIMEOUT_SECONDS", "10"))
+    GOOGLE_OAUTH_MAX_RETRIES: int = int(os.getenv("GOOGLE_OAUTH_MAX_RETRIES", "2"))
+    GOOGLE_OAUTH_METADATA_TTL_SECONDS: float = float(os.getenv("GOOGLE_OAUTH_METADATA_TTL_SECONDS", "3600"))
     
     # JWT Settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     
+    # Auth caches
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+    
+    # Token revocation
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = int(os.getenv("TOKEN_REVOCATION_BLOOM_CAPACITY", "100000"))
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = float(os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", "5"))
+    TOKEN_REVOCATION_CLEANUP_SECONDS: float = float(os.getenv("TOKEN_REVOCATION_CLEANUP_SECONDS", "3600"))
+    
     # API Settings
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Clario"
@@ -2,6 +2,7 @@ from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict, Any
 from app.services.auth_service import AuthService
+from app.utils.executors import run_db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,7 +36,7 @@ class AuthMiddleware:
         """
         try:
             token = credentials.credentials
-            user = self.auth_service.get_current_user(token)
+            user = await run_db(self.auth_service.get_current_user, token)
             
             if not user:
                 raise HTTPException(
@@ -75,7 +76,7 @@ class AuthMiddleware:
                 return None
             
             token = auth_header.split(" ")[1]
-            user = self.auth_service.get_current_user(token)
+            user = await run_db(self.auth_service.get_current_user, token)
             
             return user
             
@@ -0,0 +1,263 @@
+"""
+Response Compression
+
+Pure ASGI middleware that compresses response bodies with brotli (when the
+brotli package is installed) or gzip, negotiated from Accept-Encoding.
+
+- Bodies smaller than COMPRESSION_MIN_SIZE_BYTES go out unchanged; small
+  payloads gain little and cost a compressor per request.
+- Only text-like media types are compressed.
+- Streaming responses (such as NDJSON exports) are compressed incrementally,
+  and each chunk is flushed so the client still receives rows as they are produced.
+- Responses that carry an ETag (the catalog and facet endpoints) keep their
+  compressed body in an LRU keyed by (ETag, encoding, body digest), so a
+  payload that has not changed is compressed only once. The digest keeps a
+  route whose ETag misses a content change from getting a stale body;
+  hashing is far cheaper than compressing.
+"""
+
+import gzip
+import hashlib
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+def _supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw header value
+
+    Returns:
+        "br", "gzip" or None (send the body uncompressed)
+    """
+    if not accept_encoding:
+        return None
+
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in _supported_encodings():
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+# Compressed bodies of ETagged responses, keyed by (etag, encoding, body digest)
+_precompressed = TTLCache(maxsize=settings.COMPRESSION_CACHE_SIZE)
+
+def compression_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the precompressed body cache."""
+    return _precompressed.stats()
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+def _without(headers: List[Tuple[bytes, bytes]], *names: bytes) -> List[Tuple[bytes, bytes]]:
+    return [(key, value) for key, value in headers if key.lower() not in names]
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if b"accept-encoding" in vary.lower() or vary.strip() == b"*":
+        return headers
+    return _without(headers, b"vary") + [(b"vary", vary + b", Accept-Encoding")]
+
+def _weak_etag(etag: bytes) -> bytes:
+    # The compressed representation is not byte-identical to the original,
+    # so a strong validator must become weak (If-None-Match compares weakly)
+    return etag if etag.startswith(b"W/") else b"W/" + etag
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing HTTP responses above a size threshold.
+    """
+
+    def __init__(self, app, minimum_size: int = None):
+        """
+        Args:
+            app: The wrapped ASGI application
+            minimum_size: Smallest body in bytes worth compressing
+        """
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MIN_SIZE_BYTES if minimum_size is None else minimum_size
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        await _CompressedResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+class _CompressedResponder:
+    """Per-request state for CompressionMiddleware."""
+
+    def __init__(self, app, encoding: Optional[str], minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message: Optional[Dict[str, Any]] = None
+        self.started = False
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    def _compressible(self, headers: List[Tuple[bytes, bytes]]) -> bool:
+        if self.start_message["status"] in (204, 206, 304) or self.start_message["status"] < 200:
+            return False
+        if _header(headers, b"content-encoding") is not None:
+            return False
+        content_type = (_header(headers, b"content-type") or b"").decode("latin-1").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send_wrapper(self, message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows the body size
+            self.start_message = message
+            headers = list(message.get("headers", []))
+            compressible = self._compressible(headers)
+            if compressible:
+                # Vary even when this client gets identity, so shared caches
+                # never hand an uncompressed copy to every client (or vice versa)
+                self.start_message = {**message, "headers": _add_vary(headers)}
+            self.passthrough = not compressible or self.encoding is None
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self._start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None and not self.started:
+            if not more_body:
+                await self._send_complete(body)
+                return
+            self.stream = _StreamCompressor(self.encoding)
+            await self._start(compressed=True, streaming=True)
+
+        if self.stream is None:
+            await self.send(message)
+            return
+
+        data = self.stream.chunk(body) if body else b""
+        if not more_body:
+            data += self.stream.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_complete(self, body: bytes):
+        """Compress a body that arrived in one message."""
+        if len(body) < self.minimum_size:
+            await self._start()
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        headers = self.start_message["headers"]
+        etag = _header(headers, b"etag")
+        compressed = None
+        if etag is not None:
+            key = (etag, self.encoding, hashlib.blake2b(body, digest_size=16).digest())
+            compressed = _precompressed.get(key)
+        if compressed is None:
+            compressed = compress(body, self.encoding)
+            if etag is not None:
+                _precompressed.set(key, compressed)
+
+        await self._start(compressed=True, length=len(compressed))
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _start(self, compressed: bool = False, streaming: bool = False, length: int = None):
+        if self.started:
+            return
+        self.started = True
+
+        message = self.start_message
+        if compressed:
+            headers = _without(message["headers"], b"content-length")
+            etag = _header(headers, b"etag")
+            if etag is not None:
+                headers = _without(headers, b"etag") + [(b"etag", _weak_etag(etag))]
+            headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+            if not streaming:
+                headers.append((b"content-length", str(length).encode("latin-1")))
+            message = {**message, "headers": headers}
+        await self.send(message)
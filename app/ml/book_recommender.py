@@ -6,14 +6,23 @@ Completely separate from the schedule maker functionality.
 """
 
 import pandas as pd
+import numpy as np
 import os
 from typing import List, Dict, Any, Optional
 from .utils.similarity import SimilarityCalculator
-from .preprocess import preprocess_for_similarity
+from .utils.artifacts import source_signature
+from .utils.book_store import BookColumnStore
+from .utils.facets import FacetIndex
+from .utils.search_index import BookSearchIndex
+from .utils.loader import combine_text_columns
+from .preprocess import preprocess_for_similarity, preprocess_batch
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Columns with precomputed facet counts
+BOOK_FACETS = ("genre", "difficulty_level", "topic")
+
 class BookRecommender:
     """
     Book recommendation engine using TF-IDF and cosine similarity.
@@ -25,24 +34,33 @@ class BookRecommender:
         self.model_dir = model_dir
         self.similarity_calc = SimilarityCalculator()
         self.books_df = None
+        self.book_store = None
+        self.search_index = None
+        self.facets = FacetIndex()
         self.book_texts = None
         self.is_trained = False
         
         # Model file paths
         self.vectorizer_path = os.path.join(model_dir, "book_vectorizer.pkl")
+        self.bundle_dir = os.path.join(model_dir, "books_bundle")
+        self.books_file = os.path.join(data_dir, "books.csv")
     
     def load_books_data(self):
         """Load and prepare book data for training."""
         try:
-            books_file = os.path.join(self.data_dir, "books.csv")
-            self.books_df = pd.read_csv(books_file)
+            self.books_df = pd.read_csv(self.books_file)
+            
+            # Combine title, author, genre, topic, and description for better matching
+            self.book_texts = combine_text_columns(
+                self.books_df,
+                ['title', 'author', 'genre', 'topic', 'description'],
+                skip_empty=False
+            )
             
-            # Create combined text for ML processing
-            self.book_texts = []
-            for _, book in self.books_df.iterrows():
-                # Combine title, author, genre, topic, and description for better matching
-                combined_text = f"{book['title']} {book['author']} {book['genre']} {book['topic']} {book['description']}"
-                self.book_texts.append(combined_text)
+            # Precompute the columns and facet masks used to filter recommendations
+            self.book_store = BookColumnStore(self.books_df)
+            self.search_index = BookSearchIndex(self.books_df)
+            self.facets = FacetIndex.build(self.books_df, BOOK_FACETS)
             
             logger.info(f"Loaded {len(self.books_df)} books for recommendation")
             return True
@@ -57,16 +75,17 @@ class BookRecommender:
             raise ValueError("No book data loaded. Call load_books_data() first.")
         
         # Preprocess texts
-        processed_texts = [preprocess_for_similarity(text) for text in self.book_texts]
+        processed_texts = preprocess_batch(self.book_texts)
         
         # Filter out empty texts
-        processed_texts = [text for text in processed_texts if text.strip()]
+        training_texts = [text for text in processed_texts if text.strip()]
         
-        if not processed_texts:
+        if not training_texts:
             raise ValueError("No valid texts after preprocessing")
         
-        # Fit the vectorizer
-        self.similarity_calc.fit_vectorizer(processed_texts)
+        # Fit the vectorizer, then vectorize every book so rows stay aligned with books_df
+        self.similarity_calc.fit_vectorizer(training_texts)
+        self.similarity_calc.build_corpus_matrix(processed_texts)
         self.is_trained = True
         
         # Save the model
@@ -82,17 +101,49 @@ class BookRecommender:
         os.makedirs(self.model_dir, exist_ok=True)
         self.similarity_calc.save_model(self.vectorizer_path)
         logger.info(f"Book model saved to {self.vectorizer_path}")
+        
+        # Persist the vectorized corpus so later starts skip re-vectorization
+        if self.similarity_calc.corpus_matrix is not None and self.books_df is not None:
+            self.save_bundle()
+    
+    def save_bundle(self):
+        """Save the vectorizer and corpus matrix as an artifact bundle."""
+        try:
+            self.similarity_calc.save_bundle(self.bundle_dir, self._row_ids(), source_signature(self.books_file))
+        except Exception as e:
+            # The bundle is an optimization; the pickled vectorizer is still usable
+            logger.warning(f"Error saving book model bundle: {e}")
+    
+    def load_bundle(self) -> bool:
+        """Load the vectorizer and memory-mapped corpus matrix from the artifact bundle."""
+        if self.books_df is None:
+            return False
+        
+        if not self.similarity_calc.load_bundle(self.bundle_dir, signature=source_signature(self.books_file)):
+            return False
+        
+        # The bundle is only usable if its rows line up with the loaded books
+        if not np.array_equal(self.similarity_calc.row_ids, self._row_ids()):
+            logger.info("Book model bundle does not match the loaded books, rebuilding")
+            self.similarity_calc = SimilarityCalculator()
+            return False
+        
+        self.is_trained = True
+        return True
+    
+    def _row_ids(self) -> np.ndarray:
+        """Book id for each row of books_df."""
+        return self.books_df['id'].to_numpy(dtype=np.int64)
     
     def load_model(self):
         """Load a pre-trained model from disk."""
         try:
             self.similarity_calc.load_model(self.vectorizer_path)
-            # Recreate fitted texts vectors after loading model
+            # Recreate the corpus matrix after loading model and persist it as a bundle
             if self.book_texts:
-                processed_texts = [preprocess_for_similarity(text) for text in self.book_texts]
-                processed_texts = [text for text in processed_texts if text.strip()]
-                if processed_texts:
-                    self.similarity_calc.fitted_texts_vectors = self.similarity_calc.vectorizer.transform(processed_texts)
+                processed_texts = preprocess_batch(self.book_texts)
+                self.similarity_calc.build_corpus_matrix(processed_texts)
+                self.save_bundle()
             self.is_trained = True
             logger.info("Book recommendation model loaded successfully")
             return True
@@ -107,6 +158,11 @@ class BookRecommender:
             logger.error("Failed to load book data for recommendation.")
             return False
         
+        # Fast path: memory-mapped artifact bundle, no re-vectorization
+        if self.load_bundle():
+            logger.info("Book recommendation model bundle loaded.")
+            return True
+        
         # Try to load existing model
         if self.load_model():
             logger.info("Existing book recommendation model loaded.")
@@ -161,53 +217,14 @@ class BookRecommender:
             return []
 
         # Get similarity scores
-        similarities = self.similarity_calc.get_similarities(processed_topic)
-
-        # Combine with book data
-        recommendations_df = self.books_df.copy()
-        recommendations_df['similarity_score'] = similarities
-
-        # Apply filters
-        if genre:
-            recommendations_df = recommendations_df[
-                recommendations_df['genre'].str.lower() == genre.lower()
-            ]
-        
-        if difficulty_level:
-            recommendations_df = recommendations_df[
-                recommendations_df['difficulty_level'].str.lower() == difficulty_level.lower()
-            ]
-        
-        if min_rating > 0:
-            recommendations_df = recommendations_df[
-                recommendations_df['rating'].astype(float) >= min_rating
-            ]
+        similarities = self.similarity_calc.score(processed_topic)
 
-        # Sort by similarity and get top_k
-        recommendations_df = recommendations_df.sort_values(by='similarity_score', ascending=False)
-        top_recommendations = recommendations_df.head(top_k)
+        # Apply filters as a precomputed facet mask and select the top_k rows
+        mask = self.book_store.filter_mask(genre, difficulty_level, min_rating)
+        top_indices = self.book_store.top_k(similarities, top_k, mask)
 
-        # Format output
-        result = []
-        for _, book in top_recommendations.iterrows():
-            result.append({
-                "id": int(book['id']),
-                "title": book['title'],
-                "author": book['author'],
-                "genre": book['genre'],
-                "topic": book['topic'],
-                "description": book['description'],
-                "rating": float(book['rating']),
-                "price": book['price'],
-                "isbn": book['isbn'],
-                "amazon_url": book['amazon_url'],
-                "goodreads_url": book['goodreads_url'],
-                "publication_year": int(book['publication_year']),
-                "pages": int(book['pages']),
-                "language": book['language'],
-                "difficulty_level": book['difficulty_level'],
-                "similarity_score": round(book['similarity_score'], 3)
-            })
+        # Format output (copies only the selected records)
+        result = self.book_store.format(top_indices, similarities)
 
         logger.info(f"Generated {len(result)} book recommendations for topic '{topic}'")
         return result
@@ -235,38 +252,20 @@ class BookRecommender:
         if self.books_df is None or self.books_df.empty:
             return []
 
-        # Simple text search across title, author, and description
-        search_df = self.books_df.copy()
-        
-        # Create search text
-        search_df['search_text'] = (
-            search_df['title'].str.lower() + ' ' +
-            search_df['author'].str.lower() + ' ' +
-            search_df['description'].str.lower()
-        )
-        
-        # Filter by genre if specified
-        if genre:
-            search_df = search_df[search_df['genre'].str.lower() == genre.lower()]
-        
-        # Search for query in search_text
-        query_lower = query.lower()
-        mask = search_df['search_text'].str.contains(query_lower, na=False)
-        results_df = search_df[mask].head(top_k)
+        # Substring search across title, author, and description through the
+        # prebuilt index, with the genre filter applied as a posting-list intersection
+        rows = self.search_index.search(query, top_k=top_k, genre=genre)
         
         # Format results
         result = []
-        for _, book in results_df.iterrows():
+        for row in rows:
+            book = self.book_store.records[row]
             result.append({
-                "id": int(book['id']),
-                "title": book['title'],
-                "author": book['author'],
-                "genre": book['genre'],
-                "topic": book['topic'],
-                "description": book['description'],
-                "rating": float(book['rating']),
-                "price": book['price'],
-                "difficulty_level": book['difficulty_level']
+                key: book[key]
+                for key in (
+                    "id", "title", "author", "genre", "topic", "description",
+                    "rating", "price", "difficulty_level"
+                )
             })
         
         return result
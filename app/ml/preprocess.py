@@ -1,10 +1,14 @@
 import re
 import string
-from typing import List
+from typing import Iterable, List
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Replacing non-word characters with spaces and collapsing whitespace leaves
+# exactly the runs of word characters, joined by single spaces
+_WORD_RE = re.compile(r'\w+')
+
 def preprocess_for_similarity(text: str) -> str:
     """
     Preprocess text for similarity calculation.
@@ -22,19 +26,29 @@ def preprocess_for_similarity(text: str) -> str:
         # Convert to lowercase
         text = text.lower()
         
-        # Remove special characters and extra whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove leading/trailing whitespace
-        text = text.strip()
-        
-        return text
+        # Remove special characters and extra whitespace in one pass
+        return ' '.join(_WORD_RE.findall(text))
         
     except Exception as e:
         logger.error(f"Error preprocessing text: {e}")
         return ""
 
+def preprocess_batch(texts: Iterable[str]) -> List[str]:
+    """
+    Preprocess a whole corpus, with the same result as preprocess_for_similarity.
+    
+    Args:
+        texts: Raw texts (non-strings become empty)
+        
+    Returns:
+        Preprocessed texts, in input order
+    """
+    find_words = _WORD_RE.findall
+    return [
+        ' '.join(find_words(text.lower())) if isinstance(text, str) else ""
+        for text in texts
+    ]
+
 def clean_text(text: str) -> str:
     """
     Basic text cleaning for display purposes.
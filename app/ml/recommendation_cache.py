@@ -0,0 +1,61 @@
+"""
+Recommendation Coalescing
+
+Identical recommendation queries (same model version, normalized topic,
+filters and top_k) share one computation through a single-flight layer, and
+their results are cached briefly. The model version is the content
+fingerprint of the loaded vectorizer and corpus matrix, so retraining and
+reloading a model changes every key and old results simply age out.
+"""
+
+from typing import Any, Dict, Hashable
+
+from app.config import settings
+from app.utils.executors import run_ml
+from app.utils.single_flight import SingleFlight
+from .preprocess import preprocess_for_similarity
+from .registry import model_registry
+
+recommendation_flight = SingleFlight(
+    maxsize=settings.RECOMMENDATION_CACHE_SIZE,
+    ttl=settings.RECOMMENDATION_CACHE_TTL_SECONDS
+)
+
+def _normalize(value: Any) -> Hashable:
+    # The recommenders compare filters case-insensitively
+    if isinstance(value, str):
+        return value.strip().lower() or None
+    return value
+
+async def coalesced_recommendations(model_name: str, method: str, topic: str, **params) -> Any:
+    """
+    Run a recommender method, sharing the result with identical concurrent queries.
+
+    Args:
+        model_name: Registered model name ("resources" or "books")
+        method: Name of the recommender method to call
+        topic: Topic passed to the method
+        **params: Remaining keyword arguments (filters, top_k)
+
+    Returns:
+        The method's result; shared between callers, so treat it as read-only
+    """
+    model, version = await run_ml(model_registry.get_versioned, model_name)
+    compute = getattr(model, method)
+
+    if version is None:
+        # The model was swapped mid-request; do not file the result under either version
+        return await run_ml(compute, topic=topic, **params)
+
+    key = (
+        model_name,
+        version,
+        method,
+        preprocess_for_similarity(topic),
+        tuple(sorted((name, _normalize(value)) for name, value in params.items()))
+    )
+    return await recommendation_flight.do(key, lambda: run_ml(compute, topic=topic, **params))
+
+def recommendation_cache_stats() -> Dict[str, Any]:
+    """Result cache and coalescing counters."""
+    return recommendation_flight.stats()
@@ -1,9 +1,11 @@
 import pandas as pd
+import numpy as np
 import os
 from typing import List, Dict, Any, Tuple
-from .utils.similarity import SimilarityCalculator
+from .utils.similarity import SimilarityCalculator, top_k_indices
+from .utils.artifacts import source_signature
 from .utils.loader import DataLoader
-from .preprocess import preprocess_for_similarity
+from .preprocess import preprocess_for_similarity, preprocess_batch
 
 class LearningResourceRecommender:
     """
@@ -17,10 +19,12 @@ class LearningResourceRecommender:
         self.similarity_calc = SimilarityCalculator()
         self.resources_df = None
         self.resource_texts = None
+        self.type_indices = {}
         self.is_trained = False
         
         # Model file paths
         self.vectorizer_path = os.path.join(model_dir, "vectorizer.pkl")
+        self.bundle_dir = os.path.join(model_dir, "resources_bundle")
     
     def load_data(self):
         """Load and prepare data for training."""
@@ -31,6 +35,9 @@ class LearningResourceRecommender:
             # Extract text for ML processing
             self.resource_texts = self.data_loader.get_resource_texts(self.resources_df)
             
+            # Precompute row indices per resource type for filtered retrieval
+            self.type_indices = self._build_type_indices(self.resources_df)
+            
             print(f"Loaded {len(self.resources_df)} resources")
             return True
             
@@ -38,6 +45,18 @@ class LearningResourceRecommender:
             print(f"Error loading data: {e}")
             return False
     
+    def _build_type_indices(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Map each lower-cased resource type to the sorted row indices of that type."""
+        if 'type' not in df.columns:
+            return {}
+        
+        types = df['type'].fillna('').astype(str).str.lower().to_numpy()
+        return {
+            resource_type: np.flatnonzero(types == resource_type)
+            for resource_type in np.unique(types)
+            if resource_type
+        }
+    
     def train_model(self):
         """Train the TF-IDF vectorizer on the resource texts."""
         if not self.resource_texts:
@@ -47,16 +66,17 @@ class LearningResourceRecommender:
             raise ValueError("No resource texts available for training")
         
         # Preprocess texts
-        processed_texts = [preprocess_for_similarity(text) for text in self.resource_texts]
+        processed_texts = preprocess_batch(self.resource_texts)
         
         # Filter out empty texts
-        processed_texts = [text for text in processed_texts if text.strip()]
+        training_texts = [text for text in processed_texts if text.strip()]
         
-        if not processed_texts:
+        if not training_texts:
             raise ValueError("No valid texts after preprocessing")
         
-        # Fit the vectorizer
-        self.similarity_calc.fit_vectorizer(processed_texts)
+        # Fit the vectorizer, then vectorize every resource so rows stay aligned with resources_df
+        self.similarity_calc.fit_vectorizer(training_texts)
+        self.similarity_calc.build_corpus_matrix(processed_texts)
         self.is_trained = True
         
         # Save the model
@@ -72,6 +92,45 @@ class LearningResourceRecommender:
         os.makedirs(self.model_dir, exist_ok=True)
         self.similarity_calc.save_model(self.vectorizer_path)
         print(f"Model saved to {self.vectorizer_path}")
+        
+        # Persist the vectorized corpus so later starts skip re-vectorization
+        if self.similarity_calc.corpus_matrix is not None and self.resources_df is not None:
+            self.save_bundle()
+    
+    def save_bundle(self):
+        """Save the vectorizer and corpus matrix as an artifact bundle."""
+        try:
+            self.similarity_calc.save_bundle(self.bundle_dir, self._row_ids(), self._source_signature())
+        except Exception as e:
+            # The bundle is an optimization; the pickled vectorizer is still usable
+            print(f"Error saving model bundle: {e}")
+    
+    def load_bundle(self) -> bool:
+        """Load the vectorizer and memory-mapped corpus matrix from the artifact bundle."""
+        if self.resources_df is None:
+            return False
+        
+        if not self.similarity_calc.load_bundle(self.bundle_dir, signature=self._source_signature()):
+            return False
+        
+        # The bundle is only usable if its rows line up with the loaded resources
+        if not np.array_equal(self.similarity_calc.row_ids, self._row_ids()):
+            print("Artifact bundle does not match the loaded resources, rebuilding")
+            self.similarity_calc = SimilarityCalculator()
+            return False
+        
+        self.is_trained = True
+        print(f"Model bundle loaded from {self.bundle_dir}")
+        return True
+    
+    def _row_ids(self) -> np.ndarray:
+        """Source id for each resource row (falls back to the row position)."""
+        if 'id' in self.resources_df.columns:
+            return self.resources_df['id'].to_numpy(dtype=np.int64)
+        return np.arange(len(self.resources_df), dtype=np.int64)
+    
+    def _source_signature(self) -> str:
+        return source_signature(self.data_loader.resources_file)
     
     def load_model(self):
         """Load a pre-trained model from disk."""
@@ -84,16 +143,32 @@ class LearningResourceRecommender:
             print(f"Error loading model: {e}")
             return False
     
+    def build_corpus_matrix(self):
+        """Vectorize the loaded resource texts once for query-time scoring."""
+        if not self.resource_texts:
+            raise ValueError("No data loaded. Call load_data() first.")
+        
+        processed_texts = preprocess_batch(self.resource_texts)
+        self.similarity_calc.build_corpus_matrix(processed_texts)
+    
     def initialize(self):
         """Initialize the recommender (load data and model)."""
-        # Try to load existing model first
+        data_loaded = self.load_data()
+        
+        # Fast path: memory-mapped artifact bundle, no re-vectorization
+        if data_loaded and self.load_bundle():
+            return True
+        
+        # Try to load existing model next
         if self.load_model():
-            # If model loaded successfully, also load data
-            self.load_data()
+            # If model loaded successfully, vectorize the data once and persist the bundle
+            if data_loaded:
+                self.build_corpus_matrix()
+                self.save_bundle()
             return True
         else:
-            # If no model exists, load data and train
-            if self.load_data():
+            # If no model exists, train on the loaded data
+            if data_loaded:
                 self.train_model()
                 return True
             else:
@@ -117,39 +192,59 @@ class LearningResourceRecommender:
         if not self.resources_df is not None:
             raise ValueError("Resources data not loaded")
         
-        # Preprocess the query
-        processed_topic = preprocess_for_similarity(topic)
+        similarities = self._score_topic(topic)
         
-        if not processed_topic.strip():
-            raise ValueError("Topic query is empty after preprocessing")
+        # Restrict selection to the filtered rows before taking the top-k
+        candidates = None
+        if filter_type:
+            candidates = self.type_indices.get(filter_type.lower(), np.empty(0, dtype=np.intp))
         
-        # Get similarity scores
-        similarities = self.similarity_calc.calculate_similarity(processed_topic, self.resource_texts)
+        top_indices = top_k_indices(similarities, top_k, candidates)
         
-        # Get top-k indices
-        top_indices = sorted(range(len(similarities)), key=lambda i: similarities[i], reverse=True)[:top_k]
+        return self._format_recommendations(top_indices, similarities)
+    
+    def get_recommendations_batch(self, queries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Get recommendations for many topics at once.
         
-        # Prepare recommendations
-        recommendations = []
+        All topics are vectorized into one query matrix and scored with a
+        single sparse product; top-k selection then runs per row with each
+        query's own filter.
         
-        for idx in top_indices:
-            if idx < len(self.resources_df):
-                resource = self.resources_df.iloc[idx]
-                
-                # Apply type filter if specified
-                if filter_type and resource.get('type', '').lower() != filter_type.lower():
-                    continue
-                
-                recommendation = {
-                    'title': resource.get('title', ''),
-                    'type': resource.get('type', ''),
-                    'url': resource.get('url', ''),
-                    'confidence': float(similarities[idx])
-                }
-                
-                recommendations.append(recommendation)
+        Args:
+            queries: Dictionaries with "topic" and optional "top_k" (default 5)
+                and "filter_type"
+            
+        Returns:
+            One list of recommendation dictionaries per query, in input order
+            (empty for topics that are empty after preprocessing)
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before getting recommendations")
         
-        return recommendations
+        if not self.resources_df is not None:
+            raise ValueError("Resources data not loaded")
+        
+        processed_topics = preprocess_batch(query.get('topic', '') for query in queries)
+        scored = [i for i, topic in enumerate(processed_topics) if topic.strip()]
+        
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if not scored:
+            return results
+        
+        similarities = self.similarity_calc.score_batch([processed_topics[i] for i in scored])
+        
+        for row, i in enumerate(scored):
+            query = queries[i]
+            candidates = None
+            filter_type = query.get('filter_type')
+            if filter_type:
+                candidates = self.type_indices.get(filter_type.lower(), np.empty(0, dtype=np.intp))
+            
+            top_indices = top_k_indices(similarities[row], query.get('top_k', 5), candidates)
+            results[i] = self._format_recommendations(top_indices, similarities[row])
+        
+        return results
     
     def get_recommendations_by_type(self, topic: str, top_k: int = 5) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -162,26 +257,63 @@ class LearningResourceRecommender:
         Returns:
             Dictionary with type as key and recommendations as value
         """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before getting recommendations")
+        
         if not self.resources_df is not None:
             raise ValueError("Resources data not loaded")
         
         # Get all resource types
         resource_types = self.data_loader.get_all_resource_types(self.resources_df)
         
+        # Score the corpus once and select per type from the precomputed indices
+        similarities = self._score_topic(topic)
+        
         recommendations_by_type = {}
         
         for resource_type in resource_types:
-            type_recommendations = self.get_recommendations(
-                topic=topic,
-                top_k=top_k,
-                filter_type=resource_type
-            )
+            candidates = self.type_indices.get(resource_type.lower())
+            if candidates is None or candidates.size == 0:
+                continue
+            
+            top_indices = top_k_indices(similarities, top_k, candidates)
+            type_recommendations = self._format_recommendations(top_indices, similarities)
             
             if type_recommendations:
                 recommendations_by_type[resource_type] = type_recommendations
         
         return recommendations_by_type
     
+    def _score_topic(self, topic: str) -> np.ndarray:
+        """Preprocess a topic and score it against every resource."""
+        # Preprocess the query
+        processed_topic = preprocess_for_similarity(topic)
+        
+        if not processed_topic.strip():
+            raise ValueError("Topic query is empty after preprocessing")
+        
+        # Score against the precomputed corpus matrix (one sparse mat-vec)
+        return self.similarity_calc.score(processed_topic)
+    
+    def _format_recommendations(self, indices: np.ndarray, similarities: np.ndarray) -> List[Dict[str, Any]]:
+        """Build recommendation dictionaries for the selected resource rows."""
+        recommendations = []
+        
+        for idx in indices:
+            if idx < len(self.resources_df):
+                resource = self.resources_df.iloc[idx]
+                
+                recommendation = {
+                    'title': resource.get('title', ''),
+                    'type': resource.get('type', ''),
+                    'url': resource.get('url', ''),
+                    'confidence': float(similarities[idx])
+                }
+                
+                recommendations.append(recommendation)
+        
+        return recommendations
+    
     def get_all_resource_types(self) -> List[str]:
         """Get list of all available resource types."""
         if self.resources_df is None:
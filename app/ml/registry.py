@@ -0,0 +1,189 @@
+"""
+Model Registry
+
+Application-scoped owner of the loaded recommender models. Every route module
+resolves models through the shared registry instead of building its own
+instance, so each model's DataFrame and vectorizer exist once per process.
+"""
+
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+from app.config import settings
+from .recommender import LearningResourceRecommender
+from .book_recommender import BookRecommender
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """
+    Holds one initialized instance per registered model.
+
+    Models are built lazily on first use (or eagerly at startup via load()),
+    readiness checks are plain dictionary lookups, and reload() builds a new
+    instance off to the side before swapping it in atomically.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._info: Dict[str, Dict[str, Any]] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """
+        Register a model factory.
+
+        Args:
+            name: Model name (e.g. "resources", "books")
+            factory: Callable returning a new, uninitialized model instance
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._load_locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """
+        Get the loaded instance of a model, loading it on first use.
+
+        Args:
+            name: Model name
+
+        Returns:
+            The initialized model instance
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        return self.load(name)
+
+    def get_versioned(self, name: str) -> Tuple[Any, Optional[str]]:
+        """
+        Get the loaded instance of a model together with its version.
+
+        The version is None if the instance was swapped out concurrently, so
+        callers never label one version's data with another's version.
+
+        Args:
+            name: Model name
+
+        Returns:
+            Tuple of (model instance, version)
+        """
+        instance = self.get(name)
+        with self._lock:
+            if self._instances.get(name) is instance:
+                return instance, self._info[name]["version"]
+        return instance, None
+
+    def load(self, name: str) -> Any:
+        """
+        Load a model if it is not loaded yet.
+
+        Concurrent callers wait for the single in-progress load.
+
+        Args:
+            name: Model name
+
+        Returns:
+            The initialized model instance
+        """
+        with self._get_load_lock(name):
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+
+            instance = self._build(name)
+            self.swap(name, instance)
+            return instance
+
+    def reload(self, name: str) -> Any:
+        """
+        Build a fresh instance of a model and hot-swap it in.
+
+        Requests keep using the previous instance until the new one is fully
+        initialized; if initialization fails the previous instance stays active.
+
+        Args:
+            name: Model name
+
+        Returns:
+            The new model instance
+        """
+        with self._get_load_lock(name):
+            instance = self._build(name)
+            self.swap(name, instance)
+            return instance
+
+    def swap(self, name: str, instance: Any):
+        """
+        Atomically replace the active instance of a model.
+
+        Args:
+            name: Model name
+            instance: Initialized model instance
+        """
+        with self._lock:
+            previous = self._info.get(name, {})
+            self._instances[name] = instance
+            self._info[name] = {
+                "version": self._instance_version(instance),
+                "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "generation": previous.get("generation", 0) + 1
+            }
+        logger.info(f"Model '{name}' is now serving version {self._info[name]['version']}")
+
+    def is_ready(self, name: str) -> bool:
+        """Cheap readiness probe: True if the model has a loaded instance."""
+        return self._instances.get(name) is not None
+
+    def version(self, name: str) -> Optional[str]:
+        """Version (content fingerprint) of the active instance, or None if not loaded."""
+        info = self._info.get(name)
+        return info["version"] if info else None
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Readiness and version information for every registered model."""
+        return {
+            name: {
+                "ready": self.is_ready(name),
+                **self._info.get(name, {})
+            }
+            for name in self._factories
+        }
+
+    def _build(self, name: str) -> Any:
+        if name not in self._factories:
+            raise KeyError(f"Unknown model: {name}")
+
+        instance = self._factories[name]()
+        if not instance.initialize():
+            raise RuntimeError(f"Failed to initialize model '{name}'")
+        return instance
+
+    def _get_load_lock(self, name: str) -> threading.Lock:
+        lock = self._load_locks.get(name)
+        if lock is None:
+            raise KeyError(f"Unknown model: {name}")
+        return lock
+
+    def _instance_version(self, instance: Any) -> str:
+        """Use the model's content fingerprint, or a unique id if it has none."""
+        similarity_calc = getattr(instance, "similarity_calc", None)
+        fingerprint = getattr(similarity_calc, "fingerprint", None)
+        return fingerprint or uuid.uuid4().hex[:16]
+
+# Global registry instance
+model_registry = ModelRegistry()
+model_registry.register(
+    "resources",
+    lambda: LearningResourceRecommender(data_dir=settings.ML_DATA_DIR, model_dir=settings.ML_MODEL_DIR)
+)
+model_registry.register(
+    "books",
+    lambda: BookRecommender(data_dir=settings.ML_DATA_DIR, model_dir=settings.ML_MODEL_DIR)
+)
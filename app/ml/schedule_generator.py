@@ -165,9 +165,10 @@ class MLScheduleGenerator:
         # Sort goals by difficulty and deadline
         sorted_goals = sorted(goals, key=lambda g: (g.difficulty_level, g.deadline or '9999-12-31'))
         
-        for goal in sorted_goals:
-            # Use ML model to get recommendations for this goal
-            recommendations = self._get_ml_recommendations(goal)
+        # Score every goal against the ML model in one batch
+        recommendations_per_goal = self._get_ml_recommendations_batch(sorted_goals)
+        
+        for goal, recommendations in zip(sorted_goals, recommendations_per_goal):
             
             if not recommendations:
                 continue
@@ -195,30 +196,35 @@ class MLScheduleGenerator:
     
     def _get_ml_recommendations(self, goal: LearningGoal) -> List[Dict[str, Any]]:
         """Get ML recommendations for a specific goal."""
+        return self._get_ml_recommendations_batch([goal])[0]
+    
+    def _get_ml_recommendations_batch(self, goals: List[LearningGoal]) -> List[List[Dict[str, Any]]]:
+        """Get ML recommendations for several goals with one batched scoring pass."""
         try:
-            # Use the trained ML model to get recommendations
-            recommendations = self.recommender.get_recommendations(
-                topic=goal.goal_title,
-                top_k=5
-            )
-            
-            # Convert to schedule-friendly format
-            ml_resources = []
-            for rec in recommendations:
-                ml_resources.append({
+            # Use the trained ML model to get recommendations for all goals at once
+            recommendations_per_goal = self.recommender.get_recommendations_batch([
+                {'topic': goal.goal_title, 'top_k': 5}
+                for goal in goals
+            ])
+        except Exception as e:
+            logger.warning(f"Error getting ML recommendations for {len(goals)} goals: {e}")
+            return [[] for _ in goals]
+        
+        # Convert to schedule-friendly format
+        return [
+            [
+                {
                     'title': rec['title'],
                     'type': rec['type'],
                     'url': rec['url'],
                     'confidence': rec['confidence'],
                     'difficulty_level': self._estimate_difficulty(rec, goal.difficulty_level),
                     'estimated_hours': self._estimate_duration(rec, goal.target_hours)
-                })
-            
-            return ml_resources
-            
-        except Exception as e:
-            logger.warning(f"Error getting ML recommendations for goal {goal.goal_title}: {e}")
-            return []
+                }
+                for rec in recommendations
+            ]
+            for goal, recommendations in zip(goals, recommendations_per_goal)
+        ]
     
     def _estimate_difficulty(self, recommendation: Dict[str, Any], goal_difficulty: int) -> int:
         """Estimate difficulty level based on ML confidence and goal difficulty."""
@@ -0,0 +1,310 @@
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.ml.book_recommender import BookRecommender
+from app.ml.preprocess import preprocess_batch, preprocess_for_similarity
+from app.ml.recommender import LearningResourceRecommender
+from app.ml.utils.facets import FacetIndex
+from app.ml.utils.loader import combine_text_columns
+from app.ml.utils.similarity import SimilarityCalculator, top_k_indices
+
+class TestSimilarityScoring:
+    """Test cases for the precomputed corpus scoring path."""
+
+    documents = [
+        "python programming tutorial",
+        "machine learning basics",
+        "web development guide",
+        "advanced python machine learning"
+    ]
+
+    def test_score_matches_cosine_similarity(self):
+        """Scoring against the corpus matrix matches sklearn's cosine similarity."""
+        calc = SimilarityCalculator()
+        calc.fit_vectorizer(self.documents)
+        calc.build_corpus_matrix(self.documents)
+
+        scores = calc.score("python machine learning")
+        expected = cosine_similarity(
+            calc.vectorizer.transform(["python machine learning"]),
+            calc.vectorizer.transform(self.documents)
+        ).ravel()
+
+        assert scores.shape == (len(self.documents),)
+        assert np.allclose(scores, expected)
+
+    def test_fit_does_not_vectorize_corpus(self):
+        """Fitting leaves the corpus matrix to build_corpus_matrix."""
+        calc = SimilarityCalculator()
+        calc.fit_vectorizer(self.documents)
+
+        assert calc.is_fitted
+        assert calc.corpus_matrix is None
+
+    def test_corpus_matrix_keeps_empty_rows(self):
+        """Empty texts become zero rows instead of shifting row alignment."""
+        calc = SimilarityCalculator()
+        calc.fit_vectorizer(self.documents)
+        calc.build_corpus_matrix(["python programming", "", "web guide"])
+
+        scores = calc.score("web guide")
+        assert scores.shape == (3,)
+        assert scores[1] == 0.0
+        assert int(np.argmax(scores)) == 2
+
+    def test_score_batch_matches_score(self):
+        """Batch scoring returns one row per query, equal to scoring each query alone."""
+        calc = SimilarityCalculator()
+        calc.fit_vectorizer(self.documents)
+        calc.build_corpus_matrix(self.documents)
+        queries = ["python machine learning", "web guide", "unknownword"]
+
+        scores = calc.score_batch(queries)
+
+        assert scores.shape == (len(queries), len(self.documents))
+        for row, query in enumerate(queries):
+            assert np.allclose(scores[row], calc.score(query))
+        assert calc.score_batch([]).shape == (0, len(self.documents))
+
+    def test_top_k_indices(self):
+        """Top-k selection returns the highest scores in descending order."""
+        scores = np.array([0.1, 0.9, 0.0, 0.5, 0.7])
+
+        assert top_k_indices(scores, 3).tolist() == [1, 4, 3]
+        assert top_k_indices(scores, 10).tolist() == [1, 4, 3, 0, 2]
+        assert top_k_indices(scores, 0).tolist() == []
+
+    def test_top_k_indices_with_candidates(self):
+        """Candidate restriction returns corpus indices, not candidate positions."""
+        scores = np.array([0.1, 0.9, 0.0, 0.5, 0.7])
+        candidates = np.array([0, 2, 3])
+
+        assert top_k_indices(scores, 2, candidates).tolist() == [3, 0]
+
+class TestArtifactBundle:
+    """Test cases for the persisted, memory-mapped artifact bundle."""
+
+    documents = TestSimilarityScoring.documents
+
+    def test_bundle_round_trip(self, tmp_path):
+        """A loaded bundle scores queries exactly like the in-memory model."""
+        calc = SimilarityCalculator()
+        calc.fit_vectorizer(self.documents)
+        calc.build_corpus_matrix(self.documents)
+        expected = calc.score("python machine learning")
+
+        calc.save_bundle(str(tmp_path), row_ids=[10, 11, 12, 13], signature="test")
+
+        loaded = SimilarityCalculator()
+        assert loaded.load_bundle(str(tmp_path), signature="test")
+        assert loaded.row_ids.tolist() == [10, 11, 12, 13]
+        assert loaded.fingerprint == calc.fingerprint
+        assert np.allclose(loaded.score("python machine learning"), expected)
+
+    def test_stale_bundle_is_ignored(self, tmp_path):
+        """A bundle built from different source data is not loaded."""
+        calc = SimilarityCalculator()
+        calc.fit_vectorizer(self.documents)
+        calc.build_corpus_matrix(self.documents)
+        calc.save_bundle(str(tmp_path), row_ids=[1, 2, 3, 4], signature="old")
+
+        assert not SimilarityCalculator().load_bundle(str(tmp_path), signature="new")
+
+class TestFilteredRetrieval:
+    """Test cases for filter-aware top-k retrieval."""
+
+    def _recommender(self, tmp_path):
+        recommender = LearningResourceRecommender(model_dir=str(tmp_path))
+        assert recommender.load_data()
+        recommender.train_model()
+        return recommender
+
+    def test_filtered_recommendations_are_not_truncated(self, tmp_path):
+        """Type filters are applied before the top-k cut."""
+        recommender = self._recommender(tmp_path)
+
+        recommendations = recommender.get_recommendations("python", top_k=3, filter_type="article")
+
+        article_count = len(recommender.type_indices["article"])
+        assert len(recommendations) == min(3, article_count)
+        assert all(rec["type"].lower() == "article" for rec in recommendations)
+
+    def test_by_type_matches_filtered_recommendations(self, tmp_path):
+        """The single-pass by-type retrieval matches per-type filtered queries."""
+        recommender = self._recommender(tmp_path)
+
+        by_type = recommender.get_recommendations_by_type("python", top_k=2)
+
+        assert by_type
+        for resource_type, recommendations in by_type.items():
+            assert recommendations == recommender.get_recommendations(
+                "python", top_k=2, filter_type=resource_type
+            )
+
+    def test_batch_matches_per_topic_recommendations(self, tmp_path):
+        """Batch recommendations match per-topic recommendations, in order."""
+        recommender = self._recommender(tmp_path)
+
+        queries = [
+            {"topic": "python", "top_k": 3},
+            {"topic": "machine learning", "top_k": 2, "filter_type": "video"},
+            {"topic": "!!!"}
+        ]
+        results = recommender.get_recommendations_batch(queries)
+
+        assert len(results) == 3
+        assert results[0] == recommender.get_recommendations("python", top_k=3)
+        assert results[1] == recommender.get_recommendations(
+            "machine learning", top_k=2, filter_type="video"
+        )
+        # Topics that are empty after preprocessing get no recommendations
+        assert results[2] == []
+
+    def test_trained_matrix_is_aligned_with_resources(self, tmp_path):
+        """Training builds one corpus row per resource."""
+        recommender = self._recommender(tmp_path)
+
+        assert recommender.similarity_calc.corpus_matrix.shape[0] == len(recommender.resources_df)
+
+class TestBookColumnStore:
+    """Test cases for the columnar book filtering path."""
+
+    def _recommender(self, tmp_path):
+        recommender = BookRecommender(model_dir=str(tmp_path))
+        assert recommender.initialize()
+        return recommender
+
+    def _reference(self, recommender, topic, top_k, genre=None, difficulty_level=None, min_rating=0.0):
+        """Filter and rank with plain pandas, as the DataFrame implementation did."""
+        df = recommender.books_df.copy()
+        df['similarity_score'] = recommender.similarity_calc.score(topic)
+        if genre:
+            df = df[df['genre'].str.lower() == genre.lower()]
+        if difficulty_level:
+            df = df[df['difficulty_level'].str.lower() == difficulty_level.lower()]
+        if min_rating > 0:
+            df = df[df['rating'].astype(float) >= min_rating]
+        df = df.sort_values(by=['similarity_score', 'id'], ascending=[False, True], kind='stable')
+        return df['id'].head(top_k).tolist()
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"genre": "PROGRAMMING"},
+        {"difficulty_level": "intermediate", "min_rating": 4.5},
+        {"genre": "Machine Learning", "difficulty_level": "Advanced"},
+        {"genre": "no such genre"},
+    ])
+    def test_matches_dataframe_filtering(self, tmp_path, filters):
+        """Mask filtering and top-k selection match filtering the DataFrame."""
+        recommender = self._recommender(tmp_path)
+
+        recommendations = recommender.get_book_recommendations("python programming", top_k=5, **filters)
+
+        assert [book["id"] for book in recommendations] == self._reference(
+            recommender, "python programming", 5, **filters
+        )
+
+    def test_results_do_not_share_records(self, tmp_path):
+        """Returned dictionaries are copies, so callers cannot corrupt the store."""
+        recommender = self._recommender(tmp_path)
+
+        first = recommender.get_book_recommendations("python", top_k=1)
+        first[0]["title"] = "changed"
+
+        assert recommender.get_book_recommendations("python", top_k=1)[0]["title"] != "changed"
+
+class TestBookSearchIndex:
+    """Test cases for the indexed book search."""
+
+    @pytest.fixture
+    def recommender(self, tmp_path):
+        recommender = BookRecommender(model_dir=str(tmp_path))
+        assert recommender.initialize()
+        return recommender
+
+    @pytest.mark.parametrize("query", ["python", "pro", "a", "learning", "Clean Code", "ing s", "xyz"])
+    @pytest.mark.parametrize("genre", [None, "programming", "no such genre"])
+    def test_matches_substring_scan(self, recommender, query, genre):
+        """The index returns exactly the books whose text contains the query."""
+        df = recommender.books_df
+        text = df['title'].str.lower() + ' ' + df['author'].str.lower() + ' ' + df['description'].str.lower()
+        mask = text.str.contains(query.lower(), regex=False)
+        if genre:
+            mask &= df['genre'].str.lower() == genre
+        expected = set(df.loc[mask, 'id'])
+
+        results = recommender.search_books(query, top_k=len(df), genre=genre)
+
+        assert {book["id"] for book in results} == expected
+        assert len(results) == len(expected)
+
+    def test_title_matches_rank_first(self, recommender):
+        """Books matching in the title rank above description-only matches."""
+        results = recommender.search_books("python", top_k=20)
+
+        assert results
+        in_title = ["python" in book["title"].lower() for book in results]
+        assert in_title == sorted(in_title, reverse=True)
+
+class TestFacetIndex:
+    """Test cases for precomputed facet counts."""
+
+    books = pd.DataFrame({
+        "genre": ["Programming", "Programming", "Data", "Programming", "Data"],
+        "topic": ["Python", "Go", "Python", "Python", "SQL"],
+    })
+
+    def test_counts_match_value_counts(self):
+        """Facet counts match pandas value_counts, most common first."""
+        facets = FacetIndex.build(self.books, ("genre", "topic"))
+
+        assert facets.top("topic") == [("Python", 3), ("Go", 1), ("SQL", 1)]
+        assert facets.top("topic", limit=1) == [("Python", 3)]
+        assert facets.values("genre") == ["Data", "Programming"]
+
+    def test_cross_facet_counts(self):
+        """Counts within another facet's value are matched case-insensitively."""
+        facets = FacetIndex.build(self.books, ("genre", "topic"))
+
+        assert facets.top("topic", within=("genre", "data")) == [("Python", 1), ("SQL", 1)]
+        assert facets.top("genre", within=("topic", "Python")) == [("Programming", 2), ("Data", 1)]
+        assert facets.top("topic", within=("genre", "unknown")) == []
+
+class TestBatchPreprocessing:
+    """Test cases for the corpus-wide text pipeline."""
+
+    texts = [
+        "Hello, World!",
+        "  Multiple   spaces\tand\nlines  ",
+        "Ünïcödé — dashes_and_underscores (C++)",
+        "...",
+        "",
+        None,
+    ]
+
+    def test_batch_matches_single_text_preprocessing(self):
+        """Batch preprocessing gives the same text as the per-text function."""
+        assert preprocess_batch(self.texts) == [preprocess_for_similarity(text) for text in self.texts]
+        assert preprocess_batch(self.texts)[:2] == ["hello world", "multiple spaces and lines"]
+        assert preprocess_batch([]) == []
+
+    def test_combine_text_columns(self):
+        """Columns are joined row-wise, skipping empty parts and formatting missing values."""
+        df = pd.DataFrame({
+            "title": ["A", "B", ""],
+            "description": ["d", np.nan, "x"],
+        })
+
+        assert combine_text_columns(df, ["title", "description", "tags"]) == ["A d", "B nan", "x"]
+        assert combine_text_columns(df, ["title", "description"], skip_empty=False) == ["A d", "B nan", " x"]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
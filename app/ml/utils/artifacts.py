@@ -0,0 +1,245 @@
+"""
+Recommender Artifact Bundles
+
+Persists a fitted TF-IDF model as a versioned directory of raw .npy arrays
+(vocabulary, IDF weights, corpus CSR matrix and row-to-id map) plus a JSON
+manifest. Bundles are opened with np.load(mmap_mode='r'), so every worker
+process maps the same page-cached files and skips re-vectorizing the corpus.
+
+Layout:
+    <bundle_dir>/CURRENT            name of the active version
+    <bundle_dir>/<version>/         manifest.json and the .npy arrays
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT_VERSION = 1
+
+# Number of bundle versions kept on disk (the active one plus its predecessor)
+KEEP_VERSIONS = 2
+
+# TfidfVectorizer parameters needed to rebuild an equivalent transformer
+VECTORIZER_PARAMS = (
+    "lowercase", "strip_accents", "analyzer", "token_pattern", "ngram_range",
+    "stop_words", "max_df", "min_df", "max_features", "norm", "use_idf",
+    "smooth_idf", "sublinear_tf",
+)
+
+ARRAY_FILES = (
+    "vocabulary", "idf", "corpus_data", "corpus_indices", "corpus_indptr", "row_ids",
+)
+
+@dataclass
+class ArtifactBundle:
+    """A loaded recommender artifact bundle."""
+    version: str
+    path: str
+    vectorizer: TfidfVectorizer
+    corpus_matrix: sp.csr_matrix
+    row_ids: np.ndarray
+    manifest: Dict[str, Any]
+
+    @property
+    def fingerprint(self) -> str:
+        return self.manifest["fingerprint"]
+
+def source_signature(*paths: str) -> str:
+    """
+    Build a cheap signature of the source data files (size and mtime).
+
+    Args:
+        paths: Source data file paths
+
+    Returns:
+        Signature string, stored in the manifest to detect stale bundles
+    """
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{os.path.basename(path)}:missing")
+    return "|".join(parts)
+
+def _fingerprint(arrays: Dict[str, np.ndarray], shape, signature: str) -> str:
+    """Hash the bundle contents into a short, stable fingerprint."""
+    digest = hashlib.sha1()
+    digest.update(signature.encode("utf-8"))
+    digest.update(repr(tuple(shape)).encode("utf-8"))
+    for name in ARRAY_FILES:
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()[:16]
+
+def _vectorizer_params(vectorizer: TfidfVectorizer) -> Dict[str, Any]:
+    params = vectorizer.get_params()
+    return {
+        name: list(params[name]) if isinstance(params[name], tuple) else params[name]
+        for name in VECTORIZER_PARAMS
+    }
+
+def save_artifact_bundle(
+    bundle_dir: str,
+    vectorizer: TfidfVectorizer,
+    corpus_matrix: sp.csr_matrix,
+    row_ids: np.ndarray,
+    signature: str = ""
+) -> str:
+    """
+    Write a new bundle version and atomically make it the current one.
+
+    Args:
+        bundle_dir: Directory holding all versions of this bundle
+        vectorizer: Fitted TF-IDF vectorizer
+        corpus_matrix: L2-normalized corpus matrix, one row per document
+        row_ids: Source record id for each corpus row
+        signature: Source data signature (see source_signature)
+
+    Returns:
+        The new version name
+    """
+    vocabulary = vectorizer.vocabulary_
+    terms = np.array(sorted(vocabulary, key=vocabulary.get))
+    matrix = sp.csr_matrix(corpus_matrix)
+    matrix.sort_indices()
+
+    arrays = {
+        "vocabulary": terms,
+        "idf": np.asarray(vectorizer.idf_, dtype=np.float64),
+        "corpus_data": matrix.data,
+        "corpus_indices": matrix.indices,
+        "corpus_indptr": matrix.indptr,
+        "row_ids": np.asarray(row_ids, dtype=np.int64),
+    }
+
+    version = time.strftime("%Y%m%d%H%M%S") + f"-{os.getpid()}-{time.monotonic_ns() % 1000000:06d}"
+    manifest = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "shape": list(matrix.shape),
+        "nnz": int(matrix.nnz),
+        "vectorizer_params": _vectorizer_params(vectorizer),
+        "source_signature": signature,
+        "fingerprint": _fingerprint(arrays, matrix.shape, signature),
+    }
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    tmp_dir = os.path.join(bundle_dir, f".tmp-{version}")
+    os.makedirs(tmp_dir)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), array, allow_pickle=False)
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        os.rename(tmp_dir, os.path.join(bundle_dir, version))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Switch the CURRENT pointer atomically so readers never see a partial bundle
+    pointer_tmp = os.path.join(bundle_dir, f".CURRENT-{version}")
+    with open(pointer_tmp, "w") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(bundle_dir, "CURRENT"))
+
+    _prune_versions(bundle_dir, keep=version)
+    logger.info(f"Artifact bundle {version} saved to {bundle_dir}")
+    return version
+
+def _prune_versions(bundle_dir: str, keep: str):
+    """Remove old bundle versions, keeping the newest KEEP_VERSIONS."""
+    versions = sorted(
+        name for name in os.listdir(bundle_dir)
+        if not name.startswith(".") and name != "CURRENT"
+        and os.path.isdir(os.path.join(bundle_dir, name))
+    )
+    for name in versions[:-KEEP_VERSIONS]:
+        if name != keep:
+            # Workers that still map the old files keep them alive until they swap
+            shutil.rmtree(os.path.join(bundle_dir, name), ignore_errors=True)
+
+def current_version(bundle_dir: str) -> Optional[str]:
+    """Return the active version name of a bundle, or None if there is none."""
+    try:
+        with open(os.path.join(bundle_dir, "CURRENT")) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def load_artifact_bundle(
+    bundle_dir: str,
+    signature: Optional[str] = None,
+    mmap: bool = True
+) -> Optional[ArtifactBundle]:
+    """
+    Open the current bundle version.
+
+    Args:
+        bundle_dir: Directory holding all versions of this bundle
+        signature: Expected source data signature; a mismatch means the bundle is stale
+        mmap: Memory-map the corpus arrays instead of reading them into memory
+
+    Returns:
+        The loaded bundle, or None if it is missing, stale or incompatible
+    """
+    version = current_version(bundle_dir)
+    if not version:
+        return None
+
+    path = os.path.join(bundle_dir, version)
+    try:
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read artifact manifest in {path}: {e}")
+        return None
+
+    if manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        logger.info(f"Artifact bundle {version} has an unsupported format, ignoring it")
+        return None
+
+    if signature is not None and manifest.get("source_signature") != signature:
+        logger.info(f"Artifact bundle {version} is stale for the current source data")
+        return None
+
+    mmap_mode = "r" if mmap else None
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+        for name in ARRAY_FILES
+    }
+
+    corpus_matrix = sp.csr_matrix(
+        (arrays["corpus_data"], arrays["corpus_indices"], arrays["corpus_indptr"]),
+        shape=tuple(manifest["shape"]),
+        copy=False
+    )
+
+    params = dict(manifest["vectorizer_params"])
+    params["ngram_range"] = tuple(params["ngram_range"])
+    vocabulary = {str(term): index for index, term in enumerate(arrays["vocabulary"])}
+    vectorizer = TfidfVectorizer(vocabulary=vocabulary, **params)
+    vectorizer.idf_ = np.array(arrays["idf"], dtype=np.float64)
+
+    return ArtifactBundle(
+        version=version,
+        path=path,
+        vectorizer=vectorizer,
+        corpus_matrix=corpus_matrix,
+        row_ids=arrays["row_ids"],
+        manifest=manifest
+    )
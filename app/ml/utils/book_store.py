@@ -0,0 +1,121 @@
+"""
+Columnar Book Store
+
+Precomputed, read-only columns over the books DataFrame, built once per load:
+
+- lower-cased categorical codes for genre and difficulty level, with one
+  boolean row mask per distinct value
+- ratings parsed to a float array
+- the formatted output record of every book
+
+Filtering a request is then a few mask intersections, top-k selection runs on
+the masked scores, and only the k selected records are copied, instead of
+copying, filtering and sorting the whole DataFrame per request.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from .similarity import top_k_indices
+
+class BookColumnStore:
+    """
+    Column arrays and facet masks for a books DataFrame.
+    """
+
+    def __init__(self, books_df: pd.DataFrame):
+        """
+        Args:
+            books_df: Loaded books, one row per book
+        """
+        self.size = len(books_df)
+        self.rating = pd.to_numeric(books_df['rating'], errors='coerce').to_numpy(dtype=np.float64)
+        self.genre_codes, self.genre_masks = self._encode(books_df['genre'])
+        self.difficulty_codes, self.difficulty_masks = self._encode(books_df['difficulty_level'])
+        self.records = [self._format(book) for book in books_df.to_dict('records')]
+
+    @staticmethod
+    def _encode(column: pd.Series):
+        """Factorize a column case-insensitively into codes and per-value row masks."""
+        codes, values = pd.factorize(column.fillna('').astype(str).str.lower())
+        masks = {value: codes == code for code, value in enumerate(values) if value}
+        return codes, masks
+
+    @staticmethod
+    def _format(book: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": int(book['id']),
+            "title": book['title'],
+            "author": book['author'],
+            "genre": book['genre'],
+            "topic": book['topic'],
+            "description": book['description'],
+            "rating": float(book['rating']),
+            "price": book['price'],
+            "isbn": book['isbn'],
+            "amazon_url": book['amazon_url'],
+            "goodreads_url": book['goodreads_url'],
+            "publication_year": int(book['publication_year']),
+            "pages": int(book['pages']),
+            "language": book['language'],
+            "difficulty_level": book['difficulty_level']
+        }
+
+    def filter_mask(
+        self,
+        genre: Optional[str] = None,
+        difficulty_level: Optional[str] = None,
+        min_rating: float = 0.0
+    ) -> Optional[np.ndarray]:
+        """
+        Intersect the facet masks for a set of filters.
+
+        Args:
+            genre: Genre to keep (case-insensitive)
+            difficulty_level: Difficulty level to keep (case-insensitive)
+            min_rating: Minimum rating
+
+        Returns:
+            Boolean row mask, or None when no filter applies
+        """
+        masks = []
+        if genre:
+            masks.append(self.genre_masks.get(genre.lower()))
+        if difficulty_level:
+            masks.append(self.difficulty_masks.get(difficulty_level.lower()))
+        if min_rating > 0:
+            masks.append(self.rating >= min_rating)
+
+        if not masks:
+            return None
+        if any(mask is None for mask in masks):
+            # Unknown facet value: nothing matches
+            return np.zeros(self.size, dtype=bool)
+
+        mask = masks[0]
+        for other in masks[1:]:
+            mask = mask & other
+        return mask
+
+    def top_k(self, scores: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Select the k best-scoring rows among those allowed by mask.
+
+        Args:
+            scores: Similarity score per row
+            k: Number of rows to return
+            mask: Optional boolean row mask
+
+        Returns:
+            Row indices ordered by descending score
+        """
+        candidates = np.flatnonzero(mask) if mask is not None else None
+        return top_k_indices(scores, k, candidates)
+
+    def format(self, indices: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+        """Copy the output records of the selected rows, adding their similarity score."""
+        return [
+            {**self.records[idx], "similarity_score": round(float(scores[idx]), 3)}
+            for idx in indices
+        ]
@@ -0,0 +1,87 @@
+"""
+Facet Index
+
+Precomputed facet statistics for a catalog DataFrame: the count of every
+value of each facet column, plus cross-facet counts (for example the topics
+within one genre). The index is immutable and built once per catalog load, so
+facet endpoints only read prepared lists; a reloaded catalog comes with a
+new index that replaces the old one in a single reference swap.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# (value, count) pairs ordered by descending count, ties in catalog order
+FacetCounts = List[Tuple[str, int]]
+
+def _ranked(column: pd.Series) -> FacetCounts:
+    counts = column.value_counts(sort=False)
+    first_seen = {value: i for i, value in enumerate(pd.unique(column))}
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], first_seen[item[0]]))
+    return [(value, int(count)) for value, count in ranked]
+
+@dataclass(frozen=True)
+class FacetIndex:
+    """
+    Immutable value counts and cross-facet counts for a set of columns.
+    """
+    counts: Dict[str, FacetCounts] = field(default_factory=dict)
+    # (facet, within facet) -> lower-cased value of the within facet -> counts
+    cross_counts: Dict[Tuple[str, str], Dict[str, FacetCounts]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, facets: Sequence[str]) -> "FacetIndex":
+        """
+        Count facet values, alone and within every value of each other facet.
+
+        Args:
+            df: Catalog rows
+            facets: Facet column names
+        """
+        columns = {name: df[name] for name in facets}
+        counts = {name: _ranked(column.dropna()) for name, column in columns.items()}
+
+        cross_counts: Dict[Tuple[str, str], Dict[str, FacetCounts]] = {}
+        for name in facets:
+            for within in facets:
+                if within == name:
+                    continue
+                groups = df[[name, within]].dropna().groupby(
+                    df[within].astype(str).str.lower(), sort=False
+                )
+                cross_counts[(name, within)] = {
+                    key: _ranked(group[name]) for key, group in groups
+                }
+
+        return cls(counts=counts, cross_counts=cross_counts)
+
+    def top(
+        self,
+        facet: str,
+        limit: Optional[int] = None,
+        within: Optional[Tuple[str, str]] = None
+    ) -> FacetCounts:
+        """
+        Most frequent values of a facet.
+
+        Args:
+            facet: Facet column name
+            limit: Maximum number of values (None = all)
+            within: Optional (facet, value) pair restricting the rows counted;
+                the value is matched case-insensitively
+
+        Returns:
+            (value, count) pairs ordered by descending count
+        """
+        if within is None:
+            ranked = self.counts.get(facet, [])
+        else:
+            other, value = within
+            ranked = self.cross_counts.get((facet, other), {}).get(str(value).lower(), [])
+        return ranked if limit is None else ranked[:limit]
+
+    def values(self, facet: str) -> List[str]:
+        """All values of a facet in sorted order."""
+        return sorted(value for value, _ in self.counts.get(facet, []))
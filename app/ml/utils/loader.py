@@ -1,10 +1,44 @@
 import pandas as pd
+import numpy as np
 import os
 from typing import List, Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+def combine_text_columns(df: pd.DataFrame, columns: List[str], skip_empty: bool = True) -> List[str]:
+    """
+    Join text columns row-wise with single spaces, column at a time.
+    
+    Values are converted with str(), as per-row formatting would (so a
+    missing value becomes "nan", whatever the pandas version); columns
+    absent from df are left out.
+    
+    Args:
+        df: Source DataFrame
+        columns: Columns to join, in order
+        skip_empty: Leave out empty strings instead of joining them
+        
+    Returns:
+        One combined text per row
+    """
+    parts = [df[column].map(str) for column in columns if column in df.columns]
+    if not parts:
+        return [''] * len(df)
+    
+    combined = parts[0].str.cat(parts[1:], sep=' ') if len(parts) > 1 else parts[0].copy()
+    
+    if skip_empty:
+        # Rare rows with empty parts are re-joined without them
+        has_empty = np.logical_or.reduce([(part == '').to_numpy() for part in parts])
+        if has_empty.any():
+            combined[has_empty] = [
+                ' '.join(filter(None, values))
+                for values in zip(*(part[has_empty] for part in parts))
+            ]
+    
+    return combined.tolist()
+
 class DataLoader:
     """
     Handles loading and preprocessing of learning resource data.
@@ -143,18 +177,8 @@ class DataLoader:
             List of combined text strings
         """
         try:
-            texts = []
-            for _, row in df.iterrows():
-                # Combine title, description, and tags
-                text_parts = [
-                    str(row.get('title', '')),
-                    str(row.get('description', '')),
-                    str(row.get('tags', ''))
-                ]
-                combined_text = ' '.join(filter(None, text_parts))
-                texts.append(combined_text)
-            
-            return texts
+            # Combine title, description, and tags column-wise
+            return combine_text_columns(df, ['title', 'description', 'tags'])
             
         except Exception as e:
             logger.error(f"Error extracting resource texts: {e}")
@@ -0,0 +1,161 @@
+"""
+Book Search Index
+
+Prebuilt indexes for substring search over book title, author and description:
+
+- a character trigram index that narrows a query of 3 or more characters to
+  the books containing all of its trigrams; candidates are then confirmed
+  with a real substring check, so matching is exactly "query occurs in the text"
+- an inverted token index (token to posting list) used to rank books that
+  contain every query word as a whole word above partial-word matches
+- genre posting lists, so genre filtering is a posting-list intersection
+
+Shorter queries match most of the catalog anyway, so they skip the index and
+use one vectorized substring pass over all texts instead. For longer queries
+the search cost depends on the posting lists touched and the number of
+matches, not on the catalog size.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Length of the indexed character n-grams; shorter queries are scanned
+_GRAM_SIZE = 3
+
+# Weight of a match in each field when ranking
+_FIELD_WEIGHTS = (4.0, 2.0, 1.0)  # title, author, description
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text)
+
+def _grams(text: str, n: int) -> Iterable[str]:
+    return (text[i:i + n] for i in range(len(text) - n + 1))
+
+def _postings(index: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+    return {key: np.asarray(rows, dtype=np.int64) for key, rows in index.items()}
+
+def _intersect(postings: List[np.ndarray]) -> np.ndarray:
+    """Intersect sorted posting lists, smallest first so the work stays small."""
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for posting in postings[1:]:
+        if result.size == 0:
+            break
+        result = np.intersect1d(result, posting, assume_unique=True)
+    return result
+
+class BookSearchIndex:
+    """
+    Substring search over books with match-quality ranking.
+    """
+
+    def __init__(self, books_df: pd.DataFrame):
+        """
+        Args:
+            books_df: Loaded books, one row per book
+        """
+        columns = [
+            books_df[column].fillna('').astype(str).str.lower().tolist()
+            for column in ('title', 'author', 'description')
+        ]
+        self.fields = list(zip(*columns))
+        self.texts = [' '.join(fields) for fields in self.fields]
+        self.text_series = pd.Series(self.texts, dtype=object)
+        self.size = len(self.texts)
+
+        gram_index: Dict[str, List[int]] = {}
+        token_index: Dict[str, List[int]] = {}
+        for row, text in enumerate(self.texts):
+            for gram in set(_grams(text, _GRAM_SIZE)):
+                gram_index.setdefault(gram, []).append(row)
+            for token in set(_tokens(text)):
+                token_index.setdefault(token, []).append(row)
+
+        genre_index: Dict[str, List[int]] = {}
+        for row, genre in enumerate(books_df['genre'].fillna('').astype(str).str.lower()):
+            genre_index.setdefault(genre, []).append(row)
+
+        self.gram_postings = _postings(gram_index)
+        self.token_postings = _postings(token_index)
+        self.genre_postings = _postings(genre_index)
+
+    def _candidates(self, query: str) -> np.ndarray:
+        """Rows containing every trigram of the query (a superset of the matches)."""
+        postings = []
+        for gram in set(_grams(query, _GRAM_SIZE)):
+            posting = self.gram_postings.get(gram)
+            if posting is None:
+                return np.empty(0, dtype=np.int64)
+            postings.append(posting)
+        return _intersect(postings)
+
+    def _score(self, row: int, query: str, whole_words: bool) -> float:
+        score = 1.0 if whole_words else 0.0
+        for field, weight in zip(self.fields[row], _FIELD_WEIGHTS):
+            if field == query:
+                score += 3.0 * weight
+            elif field.startswith(query):
+                score += 2.0 * weight
+            elif f" {query}" in field:
+                score += 1.5 * weight
+            elif query in field:
+                score += weight
+        return score
+
+    def search(self, query: str, top_k: int = 10, genre: Optional[str] = None) -> np.ndarray:
+        """
+        Find the books whose text contains the query, best matches first.
+
+        Ranking favours matches in the title, then author, then description,
+        and within a field an exact match, then a prefix, then a word start.
+
+        Args:
+            query: Search query (case-insensitive substring)
+            top_k: Number of rows to return
+            genre: Optional genre filter (case-insensitive)
+
+        Returns:
+            Row indices of the matching books
+        """
+        query = query.lower()
+        if top_k <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        postings = []
+        if len(query) >= _GRAM_SIZE:
+            postings.append(self._candidates(query))
+        elif query:
+            # Too short to index: one vectorized scan is exact, no confirm step needed
+            contains = self.text_series.str.contains(query, regex=False).to_numpy(dtype=bool)
+            postings.append(np.flatnonzero(contains).astype(np.int64))
+        if genre:
+            postings.append(self.genre_postings.get(genre.lower(), np.empty(0, dtype=np.int64)))
+
+        if postings:
+            candidates = _intersect(postings)
+        else:
+            candidates = np.arange(self.size, dtype=np.int64)
+
+        if not query:
+            return candidates[:top_k]
+
+        if len(query) >= _GRAM_SIZE:
+            # Trigrams can match out of order, so confirm the real substring
+            matches = [int(row) for row in candidates if query in self.texts[row]]
+        else:
+            matches = candidates.tolist()
+        if not matches:
+            return np.empty(0, dtype=np.int64)
+
+        query_tokens = _tokens(query)
+        whole_word_rows = set()
+        if query_tokens and all(token in self.token_postings for token in query_tokens):
+            whole_word_rows = set(_intersect([self.token_postings[token] for token in query_tokens]).tolist())
+
+        scores = np.array([self._score(row, query, row in whole_word_rows) for row in matches])
+        order = np.argsort(-scores, kind='stable')[:top_k]
+        return np.asarray(matches, dtype=np.int64)[order]
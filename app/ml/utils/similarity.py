@@ -2,13 +2,50 @@ import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 import pickle
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from .artifacts import save_artifact_bundle, load_artifact_bundle
 import logging
 
 logger = logging.getLogger(__name__)
 
+def top_k_indices(scores: np.ndarray, k: int, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Select the indices of the k highest scores, ordered by descending score.
+    
+    Uses argpartition so only the selected k entries are sorted.
+    
+    Args:
+        scores: 1-D array of scores
+        k: Number of indices to return
+        candidates: Optional array of row indices to restrict the selection to
+        
+    Returns:
+        Array of row indices into scores
+    """
+    if candidates is not None:
+        candidate_scores = scores[candidates]
+    else:
+        candidate_scores = scores
+    
+    n = candidate_scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    
+    if k < n:
+        selected = np.argpartition(-candidate_scores, k - 1)[:k]
+    else:
+        selected = np.arange(n)
+    
+    # Sort only the selected entries (stable, so ties keep corpus order)
+    selected = selected[np.argsort(-candidate_scores[selected], kind='stable')]
+    
+    if candidates is not None:
+        return candidates[selected]
+    return selected
+
 class SimilarityCalculator:
     """
     Handles TF-IDF vectorization and cosine similarity calculations.
@@ -23,19 +60,98 @@ class SimilarityCalculator:
             max_df=0.8
         )
         self.is_fitted = False
+        self.corpus_matrix = None
+        self.row_ids = None
+        self.fingerprint = None
     
     def fit_vectorizer(self, texts: List[str]):
-        """Fit the TF-IDF vectorizer on texts."""
+        """
+        Fit the TF-IDF vectorizer on texts.
+        
+        Only fits; call build_corpus_matrix with the full corpus afterwards,
+        so the corpus is transformed exactly once.
+        """
         try:
             self.vectorizer.fit(texts)
-            # Store the fitted text vectors for later use
-            self.fitted_texts_vectors = self.vectorizer.transform(texts)
             self.is_fitted = True
             logger.info("TF-IDF vectorizer fitted successfully")
         except Exception as e:
             logger.error(f"Error fitting vectorizer: {e}")
             raise
     
+    def build_corpus_matrix(self, texts: List[str]):
+        """
+        Vectorize the corpus once into an L2-normalized CSR matrix.
+        
+        Rows keep the order of texts, so empty texts become all-zero rows
+        instead of shifting the alignment with the source data.
+        
+        Args:
+            texts: Preprocessed corpus texts
+        """
+        if not self.is_fitted:
+            raise ValueError("Vectorizer must be fitted before building the corpus matrix")
+        
+        matrix = self.vectorizer.transform(texts)
+        self.corpus_matrix = normalize(matrix, norm='l2', copy=False).tocsr()
+        self.fitted_texts_vectors = self.corpus_matrix
+        self.row_ids = None
+        self.fingerprint = None
+    
+    def vectorize_query(self, query: str):
+        """Transform a query into an L2-normalized sparse row vector."""
+        if not self.is_fitted:
+            raise ValueError("Vectorizer must be fitted before vectorizing queries")
+        
+        return normalize(self.vectorizer.transform([query]), norm='l2', copy=False)
+    
+    def vectorize_queries(self, queries: List[str]):
+        """Transform many queries into one L2-normalized sparse matrix, one row per query."""
+        if not self.is_fitted:
+            raise ValueError("Vectorizer must be fitted before vectorizing queries")
+        
+        return normalize(self.vectorizer.transform(queries), norm='l2', copy=False).tocsr()
+    
+    def score(self, query: str) -> np.ndarray:
+        """
+        Score a query against the precomputed corpus matrix.
+        
+        Both sides are L2-normalized, so cosine similarity reduces to a single
+        sparse matrix-vector product.
+        
+        Args:
+            query: Preprocessed query text
+            
+        Returns:
+            Array of similarity scores, one per corpus row
+        """
+        if self.corpus_matrix is None:
+            raise ValueError("No corpus matrix available. Call build_corpus_matrix first.")
+        
+        query_vector = self.vectorize_query(query)
+        scores = self.corpus_matrix.dot(query_vector.T)
+        return scores.toarray().ravel()
+    
+    def score_batch(self, queries: List[str]) -> np.ndarray:
+        """
+        Score many queries against the corpus matrix in one sparse product.
+        
+        Args:
+            queries: Preprocessed query texts
+            
+        Returns:
+            Array of shape (len(queries), corpus rows) with one row of scores per query
+        """
+        if self.corpus_matrix is None:
+            raise ValueError("No corpus matrix available. Call build_corpus_matrix first.")
+        
+        if not queries:
+            return np.zeros((0, self.corpus_matrix.shape[0]))
+        
+        query_matrix = self.vectorize_queries(queries)
+        scores = self.corpus_matrix.dot(query_matrix.T)
+        return scores.T.toarray()
+    
     def calculate_similarity(self, query: str, texts: List[str]) -> List[float]:
         """
         Calculate cosine similarity between query and texts.
@@ -79,17 +195,10 @@ class SimilarityCalculator:
             raise ValueError("Vectorizer must be fitted before getting similarities")
         
         try:
-            # Transform query
-            query_vector = self.vectorizer.transform([query])
+            if self.corpus_matrix is None:
+                raise ValueError("No corpus matrix available. Call build_corpus_matrix first.")
             
-            # Get the fitted texts (we need to store them during fitting)
-            if not hasattr(self, 'fitted_texts_vectors'):
-                raise ValueError("No fitted texts available. Call fit_vectorizer with texts first.")
-            
-            # Calculate cosine similarity
-            similarities = cosine_similarity(query_vector, self.fitted_texts_vectors).flatten()
-            
-            return similarities.tolist()
+            return self.score(query).tolist()
             
         except Exception as e:
             logger.error(f"Error getting similarities: {e}")
@@ -112,8 +221,63 @@ class SimilarityCalculator:
             with open(filepath, 'rb') as f:
                 self.vectorizer = pickle.load(f)
             self.is_fitted = True
-            # Note: fitted_texts_vectors are not saved/loaded, they need to be recreated
+            self.corpus_matrix = None
+            # Note: the corpus matrix is not saved/loaded, call build_corpus_matrix to recreate it
             logger.info(f"Model loaded from {filepath}")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def save_bundle(self, bundle_dir: str, row_ids: List[int], signature: str = "") -> str:
+        """
+        Persist the vectorizer and corpus matrix as a memory-mappable artifact bundle.
+        
+        Args:
+            bundle_dir: Bundle directory
+            row_ids: Source record id for each corpus row
+            signature: Source data signature used to detect stale bundles
+            
+        Returns:
+            The saved bundle version
+        """
+        if not self.is_fitted or self.corpus_matrix is None:
+            raise ValueError("Vectorizer and corpus matrix are required to save a bundle")
+        
+        try:
+            version = save_artifact_bundle(bundle_dir, self.vectorizer, self.corpus_matrix, np.asarray(row_ids), signature)
+        except Exception as e:
+            logger.error(f"Error saving artifact bundle: {e}")
+            raise
+        
+        # Switch to the memory-mapped copy so workers share the same pages
+        self.load_bundle(bundle_dir, signature=signature)
+        return version
+    
+    def load_bundle(self, bundle_dir: str, signature: Optional[str] = None) -> bool:
+        """
+        Load the vectorizer and a memory-mapped corpus matrix from an artifact bundle.
+        
+        Args:
+            bundle_dir: Bundle directory
+            signature: Expected source data signature
+            
+        Returns:
+            True if a current bundle was loaded, False otherwise
+        """
+        try:
+            bundle = load_artifact_bundle(bundle_dir, signature=signature)
+        except Exception as e:
+            logger.warning(f"Error loading artifact bundle from {bundle_dir}: {e}")
+            return False
+        
+        if bundle is None:
+            return False
+        
+        self.vectorizer = bundle.vectorizer
+        self.corpus_matrix = bundle.corpus_matrix
+        self.fitted_texts_vectors = self.corpus_matrix
+        self.row_ids = bundle.row_ids
+        self.fingerprint = bundle.fingerprint
+        self.is_fitted = True
+        logger.info(f"Artifact bundle {bundle.version} loaded from {bundle_dir}")
+        return True
@@ -3,6 +3,7 @@ from fastapi.responses import RedirectResponse
 from typing import Dict, Any
 from app.services.auth_service import AuthService
 from app.utils.db_utils import DatabaseManager
+from app.utils.executors import run_db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,11 +28,11 @@ async def test_login():
         }
         
         # Check if test user exists
-        existing_user = db.get_user_by_google_id("test_user_123")
+        existing_user = await run_db(db.get_user_by_google_id, "test_user_123")
         
         if not existing_user:
             # Create test user
-            user_id = db.create_user(**test_user_data)
+            user_id = await run_db(db.create_user, **test_user_data)
             logger.info(f"Created test user with ID: {user_id}")
         else:
             user_id = existing_user["id"]
@@ -111,7 +112,7 @@ async def google_callback(code: str = None, error: str = None):
             )
         
         # Exchange code for token
-        token_response = auth_service.exchange_code_for_token(code)
+        token_response = await auth_service.exchange_code_for_token(code)
         if not token_response:
             raise HTTPException(
                 status_code=400,
@@ -126,7 +127,7 @@ async def google_callback(code: str = None, error: str = None):
             )
         
         # Get user info from Google
-        google_user_info = auth_service.get_google_user_info(access_token)
+        google_user_info = await auth_service.get_google_user_info(access_token)
         if not google_user_info:
             raise HTTPException(
                 status_code=400,
@@ -134,10 +135,10 @@ async def google_callback(code: str = None, error: str = None):
             )
         
         # Authenticate user
-        auth_result = auth_service.authenticate_user(google_user_info)
+        auth_result = await run_db(auth_service.authenticate_user, google_user_info)
         
         # Log the login event
-        db.log_event("user_login", ip_address="127.0.0.1")  # You might want to get real IP
+        await run_db(db.log_event, "user_login", ip_address="127.0.0.1")  # You might want to get real IP
         
         return {
             "status": "success",
@@ -174,7 +175,7 @@ async def logout(request: Request):
         token = auth_header.split(" ")[1]
         
         # Logout user
-        success = auth_service.logout_user(token)
+        success = await run_db(auth_service.logout_user, token)
         
         if success:
             return {
@@ -216,7 +217,7 @@ async def get_current_user_info(request: Request):
         token = auth_header.split(" ")[1]
         
         # Get current user
-        user = auth_service.get_current_user(token)
+        user = await run_db(auth_service.get_current_user, token)
         if not user:
             raise HTTPException(
                 status_code=401,
@@ -5,9 +5,13 @@ This module provides API endpoints for book recommendations.
 Completely separate from the schedule maker functionality.
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Optional
-from app.ml.book_recommender import BookRecommender
+from app.ml.recommendation_cache import coalesced_recommendations
+from app.ml.registry import model_registry
+from app.utils.executors import run_ml
+from app.utils.http_cache import conditional_response
+from app.utils.responses import FastJSONResponse
 from app.middleware.auth_middleware import get_current_user_optional
 import logging
 
@@ -15,18 +19,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/books", tags=["Book Recommendations"])
 
-# Initialize the book recommender
-book_recommender = BookRecommender()
-
 @router.on_event("startup")
 async def startup_event():
-    """Initialize the book recommender on startup."""
+    """Load the shared book recommender on startup."""
     try:
-        success = book_recommender.initialize()
-        if success:
-            logger.info("Book Recommender initialized successfully")
-        else:
-            logger.error("Failed to initialize Book Recommender")
+        await run_ml(model_registry.load, "books")
+        logger.info("Book Recommender initialized successfully")
     except Exception as e:
         logger.error(f"Error during Book Recommender initialization: {e}")
 
@@ -64,8 +62,11 @@ async def get_book_recommendations(
         
         logger.info(f"Getting book recommendations for topic: '{topic}'")
         
-        # Get recommendations from the book recommender
-        recommendations = book_recommender.get_book_recommendations(
+        # Get recommendations from the shared book recommender
+        # (identical concurrent queries share one computation)
+        recommendations = await coalesced_recommendations(
+            "books",
+            "get_book_recommendations",
             topic=topic,
             top_k=top_k,
             genre=genre,
@@ -74,14 +75,14 @@ async def get_book_recommendations(
         )
         
         if not recommendations:
-            return {
+            return FastJSONResponse({
                 "status": "success",
                 "message": f"No book recommendations found for topic '{topic}'",
                 "data": [],
                 "total_recommendations": 0
-            }
+            })
         
-        return {
+        return FastJSONResponse({
             "status": "success",
             "message": f"Found {len(recommendations)} book recommendations for topic '{topic}'",
             "data": recommendations,
@@ -91,7 +92,7 @@ async def get_book_recommendations(
                 "difficulty_level": difficulty_level,
                 "min_rating": min_rating
             }
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error getting book recommendations: {e}")
@@ -128,21 +129,23 @@ async def search_books(
         logger.info(f"Searching books with query: '{query}'")
         
         # Search books
-        results = book_recommender.search_books(
+        book_recommender = await run_ml(model_registry.get, "books")
+        results = await run_ml(
+            book_recommender.search_books,
             query=query,
             top_k=top_k,
             genre=genre
         )
         
         if not results:
-            return {
+            return FastJSONResponse({
                 "status": "success",
                 "message": f"No books found matching '{query}'",
                 "data": [],
                 "total_results": 0
-            }
+            })
         
-        return {
+        return FastJSONResponse({
             "status": "success",
             "message": f"Found {len(results)} books matching '{query}'",
             "data": results,
@@ -150,7 +153,7 @@ async def search_books(
             "filters_applied": {
                 "genre": genre
             }
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error searching books: {e}")
@@ -161,6 +164,8 @@ async def search_books(
 
 @router.get("/genres")
 async def get_available_genres(
+    request: Request,
+    response: Response,
     current_user: Optional[dict] = Depends(get_current_user_optional)
 ):
     """
@@ -170,23 +175,25 @@ async def get_available_genres(
         List of available genres
     """
     try:
-        if book_recommender.books_df is None:
-            book_recommender.load_books_data()
+        book_recommender, version = await run_ml(model_registry.get_versioned, "books")
+        not_modified = conditional_response(request, response, version)
+        if not_modified:
+            return not_modified
         
-        if book_recommender.books_df is None:
+        facets = book_recommender.facets
+        genres = facets.values("genre")
+        if not genres:
             return {
                 "status": "success",
                 "message": "No book data available",
                 "data": []
             }
         
-        genres = book_recommender.books_df['genre'].unique().tolist()
-        genres.sort()
-        
         return {
             "status": "success",
             "message": f"Found {len(genres)} available genres",
-            "data": genres
+            "data": genres,
+            "counts": dict(facets.top("genre"))
         }
         
     except Exception as e:
@@ -198,6 +205,8 @@ async def get_available_genres(
 
 @router.get("/difficulty-levels")
 async def get_difficulty_levels(
+    request: Request,
+    response: Response,
     current_user: Optional[dict] = Depends(get_current_user_optional)
 ):
     """
@@ -207,23 +216,25 @@ async def get_difficulty_levels(
         List of available difficulty levels
     """
     try:
-        if book_recommender.books_df is None:
-            book_recommender.load_books_data()
+        book_recommender, version = await run_ml(model_registry.get_versioned, "books")
+        not_modified = conditional_response(request, response, version)
+        if not_modified:
+            return not_modified
         
-        if book_recommender.books_df is None:
+        facets = book_recommender.facets
+        difficulty_levels = facets.values("difficulty_level")
+        if not difficulty_levels:
             return {
                 "status": "success",
                 "message": "No book data available",
                 "data": []
             }
         
-        difficulty_levels = book_recommender.books_df['difficulty_level'].unique().tolist()
-        difficulty_levels.sort()
-        
         return {
             "status": "success",
             "message": f"Found {len(difficulty_levels)} difficulty levels",
-            "data": difficulty_levels
+            "data": difficulty_levels,
+            "counts": dict(facets.top("difficulty_level"))
         }
         
     except Exception as e:
@@ -235,34 +246,44 @@ async def get_difficulty_levels(
 
 @router.get("/topics")
 async def get_popular_topics(
+    request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=50, description="Number of topics to return"),
+    genre: Optional[str] = Query(None, description="Only count books in this genre"),
     current_user: Optional[dict] = Depends(get_current_user_optional)
 ):
     """
     Get list of popular book topics.
     
+    Args:
+        limit: Number of topics to return
+        genre: Optional genre to count topics within
+    
     Returns:
-        List of popular topics
+        List of popular topics, most common first
     """
     try:
-        if book_recommender.books_df is None:
-            book_recommender.load_books_data()
+        book_recommender, version = await run_ml(model_registry.get_versioned, "books")
+        not_modified = conditional_response(request, response, version)
+        if not_modified:
+            return not_modified
         
-        if book_recommender.books_df is None:
+        facets = book_recommender.facets
+        if not facets.counts.get("topic"):
             return {
                 "status": "success",
                 "message": "No book data available",
                 "data": []
             }
         
-        # Get topic counts
-        topic_counts = book_recommender.books_df['topic'].value_counts().head(limit)
-        topics = topic_counts.index.tolist()
+        # Precomputed topic counts, optionally within one genre
+        topic_counts = facets.top("topic", limit, within=("genre", genre) if genre else None)
         
         return {
             "status": "success",
-            "message": f"Found {len(topics)} popular topics",
-            "data": topics
+            "message": f"Found {len(topic_counts)} popular topics",
+            "data": [topic for topic, _ in topic_counts],
+            "counts": dict(topic_counts)
         }
         
     except Exception as e:
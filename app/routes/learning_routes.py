@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List, Dict, Any, Optional
 from app.utils.db_utils import DatabaseManager
+from app.utils.executors import run_db
 from pydantic import BaseModel
 import logging
 
@@ -67,7 +68,8 @@ async def create_learning_goal(
     try:
         user_id = get_current_user_id(request)
         
-        goal_id = db.create_learning_goal(
+        goal_id = await run_db(
+            db.create_learning_goal,
             user_id=user_id,
             goal_title=goal_data.goal_title,
             description=goal_data.description,
@@ -77,7 +79,7 @@ async def create_learning_goal(
         )
         
         # Get the created goal
-        goals = db.get_user_learning_goals(user_id)
+        goals = await run_db(db.get_user_learning_goals, user_id)
         created_goal = next((goal for goal in goals if goal['id'] == goal_id), None)
         
         if not created_goal:
@@ -106,7 +108,7 @@ async def get_learning_goals(request: Request):
     """
     try:
         user_id = get_current_user_id(request)
-        goals = db.get_user_learning_goals(user_id)
+        goals = await run_db(db.get_user_learning_goals, user_id)
         
         return {
             "status": "success",
@@ -148,13 +150,13 @@ async def update_learning_goal(
             "deadline": goal_data.deadline
         }
         
-        rows_affected = db.update_learning_goal(goal_id, **update_data)
+        rows_affected = await run_db(db.update_learning_goal, goal_id, **update_data)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Learning goal not found")
         
         # Get updated goal
-        goals = db.get_user_learning_goals(user_id)
+        goals = await run_db(db.get_user_learning_goals, user_id)
         updated_goal = next((goal for goal in goals if goal['id'] == goal_id), None)
         
         return {
@@ -182,7 +184,7 @@ async def delete_learning_goal(goal_id: int, request: Request):
         Deletion confirmation
     """
     try:
-        rows_affected = db.delete_learning_goal(goal_id)
+        rows_affected = await run_db(db.delete_learning_goal, goal_id)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Learning goal not found")
@@ -216,7 +218,8 @@ async def set_time_availability(
     try:
         user_id = get_current_user_id(request)
         
-        availability_id = db.set_time_availability(
+        availability_id = await run_db(
+            db.set_time_availability,
             user_id=user_id,
             day_of_week=availability_data.day_of_week,
             start_time=availability_data.start_time,
@@ -225,7 +228,7 @@ async def set_time_availability(
         )
         
         # Get the created availability
-        availability = db.get_user_time_availability(user_id)
+        availability = await run_db(db.get_user_time_availability, user_id)
         created_availability = next((avail for avail in availability if avail['id'] == availability_id), None)
         
         if not created_availability:
@@ -254,7 +257,7 @@ async def get_time_availability(request: Request):
     """
     try:
         user_id = get_current_user_id(request)
-        availability = db.get_user_time_availability(user_id)
+        availability = await run_db(db.get_user_time_availability, user_id)
         
         return {
             "status": "success",
@@ -292,13 +295,14 @@ async def update_time_availability(
             "is_available": availability_data.is_available
         }
         
-        rows_affected = db.update_time_availability(availability_id, **update_data)
+        rows_affected = await run_db(db.update_time_availability, availability_id, **update_data)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Time availability not found")
         
         # Get updated availability
-        updated_availability = db.execute_query(
+        updated_availability = await run_db(
+            db.execute_query,
             "SELECT * FROM time_availability WHERE id = ?", 
             (availability_id,)
         )
@@ -328,7 +332,7 @@ async def delete_time_availability(availability_id: int, request: Request):
         Deletion confirmation
     """
     try:
-        rows_affected = db.delete_time_availability(availability_id)
+        rows_affected = await run_db(db.delete_time_availability, availability_id)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Time availability not found")
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Optional
-from app.schemas.ml_schema import RecommendationRequest, RecommendationResponse, ErrorResponse
-from app.ml.recommender import LearningResourceRecommender
+from app.schemas.ml_schema import (
+    RecommendationRequest, RecommendationResponse, ErrorResponse,
+    BatchRecommendationRequest, BatchRecommendationResponse
+)
+from app.ml.recommendation_cache import coalesced_recommendations
+from app.ml.registry import model_registry
+from app.utils.executors import run_ml
+from app.utils.http_cache import conditional_response
 from app.middleware.auth_middleware import get_current_user_optional
 import logging
 
@@ -11,18 +17,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/ml", tags=["ML"])
 
-# Initialize the recommender
-recommender = LearningResourceRecommender()
-
 @router.on_event("startup")
 async def startup_event():
-    """Initialize the ML recommender on startup."""
+    """Load the shared ML recommender on startup."""
     try:
-        success = recommender.initialize()
-        if success:
-            logger.info("ML Recommender initialized successfully")
-        else:
-            logger.error("Failed to initialize ML Recommender")
+        await run_ml(model_registry.load, "resources")
+        logger.info("ML Recommender initialized successfully")
     except Exception as e:
         logger.error(f"Error during ML Recommender initialization: {e}")
 
@@ -50,8 +50,10 @@ async def get_recommendations(
                 detail="Topic cannot be empty"
             )
         
-        # Get recommendations
-        recommendations = recommender.get_recommendations(
+        # Get recommendations (identical concurrent queries share one computation)
+        recommendations = await coalesced_recommendations(
+            "resources",
+            "get_recommendations",
             topic=topic,
             top_k=top_k,
             filter_type=resource_type
@@ -77,6 +79,50 @@ async def get_recommendations(
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.post("/recommendations/batch", response_model=BatchRecommendationResponse)
+async def get_recommendations_batch(request: BatchRecommendationRequest):
+    """
+    Get learning resource recommendations for many topics in one call.
+    
+    All topics are vectorized together and scored against the corpus with a
+    single sparse product; each query keeps its own top_k and type filter.
+    
+    Args:
+        request: Queries with topic, top_k and optional resource_type
+        
+    Returns:
+        One result per query, in request order
+    """
+    try:
+        recommender = await run_ml(model_registry.get, "resources")
+        results = await run_ml(
+            recommender.get_recommendations_batch,
+            [
+                {
+                    "topic": query.topic,
+                    "top_k": query.top_k,
+                    "filter_type": query.resource_type
+                }
+                for query in request.queries
+            ]
+        )
+        
+        return BatchRecommendationResponse(
+            status="success",
+            message=f"Recommendations fetched successfully for {len(results)} topics",
+            data=[
+                {"topic": query.topic, "data": recommendations}
+                for query, recommendations in zip(request.queries, results)
+            ]
+        )
+        
+    except Exception as e:
+        logger.error(f"Error getting batch recommendations: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
 @router.get("/recommendations/by-type", response_model=dict)
 async def get_recommendations_by_type(
     topic: str = Query(..., description="Topic for which to get recommendations"),
@@ -100,7 +146,9 @@ async def get_recommendations_by_type(
             )
         
         # Get recommendations by type
-        recommendations_by_type = recommender.get_recommendations_by_type(
+        recommendations_by_type = await coalesced_recommendations(
+            "resources",
+            "get_recommendations_by_type",
             topic=topic,
             top_k=top_k
         )
@@ -119,7 +167,7 @@ async def get_recommendations_by_type(
         )
 
 @router.get("/resource-types", response_model=dict)
-async def get_resource_types():
+async def get_resource_types(request: Request, response: Response):
     """
     Get all available resource types.
     
@@ -127,7 +175,12 @@ async def get_resource_types():
         List of available resource types
     """
     try:
-        resource_types = recommender.get_all_resource_types()
+        recommender, version = await run_ml(model_registry.get_versioned, "resources")
+        not_modified = conditional_response(request, response, version)
+        if not_modified:
+            return not_modified
+        
+        resource_types = await run_ml(recommender.get_all_resource_types)
         
         return {
             "status": "success",
@@ -164,7 +217,9 @@ async def get_recommendations_post(request: RecommendationRequest):
             )
         
         # Get recommendations
-        recommendations = recommender.get_recommendations(
+        recommendations = await coalesced_recommendations(
+            "resources",
+            "get_recommendations",
             topic=request.topic,
             top_k=5  # Default to 5 recommendations
         )
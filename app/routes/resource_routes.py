@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import List, Dict, Any, Optional
 from app.utils.db_utils import DatabaseManager
+from app.utils.executors import run_db
+from app.utils.http_cache import conditional_response
+from app.utils.responses import FastJSONResponse
+from app.utils.streaming import ndjson_response
 from pydantic import BaseModel
 import logging
 
@@ -9,6 +13,13 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/resources", tags=["Resource Management"])
 db = DatabaseManager()
 
+async def get_catalog():
+    """
+    Serve the resource catalog from memory after checking its version against
+    the database (off the event loop), reloading it when any process wrote to it.
+    """
+    return await run_db(db.get_resource_catalog)
+
 # Pydantic models for request/response validation
 class ResourceRequest(BaseModel):
     title: str
@@ -49,26 +60,27 @@ async def get_all_resources(
         List of learning resources
     """
     try:
+        catalog = await get_catalog()
         if resource_type:
-            resources = db.get_resources_by_type(resource_type)
+            resources = catalog.active_by_type.get(resource_type, [])
         elif difficulty_level:
-            resources = db.get_resources_by_difficulty(difficulty_level)
+            resources = catalog.active_by_difficulty.get(difficulty_level, [])
         else:
-            resources = db.get_all_resources(active_only=active_only)
+            resources = catalog.active if active_only else catalog.resources
         
-        return {
+        return FastJSONResponse({
             "status": "success",
             "message": "Resources retrieved successfully",
             "data": resources,
             "count": len(resources)
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error getting resources: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get resources: {str(e)}")
 
 @router.get("/types", response_model=Dict[str, Any])
-async def get_resource_types():
+async def get_resource_types(request: Request, response: Response):
     """
     Get all available resource types.
     
@@ -76,8 +88,12 @@ async def get_resource_types():
         List of resource types
     """
     try:
-        resources = db.get_all_resources(active_only=True)
-        types = list(set(resource['type'] for resource in resources))
+        catalog = await get_catalog()
+        not_modified = conditional_response(request, response, catalog.fingerprint)
+        if not_modified:
+            return not_modified
+        
+        types = catalog.types
         
         return {
             "status": "success",
@@ -93,7 +109,7 @@ async def get_resource_types():
         raise HTTPException(status_code=500, detail=f"Failed to get resource types: {str(e)}")
 
 @router.get("/difficulty-levels", response_model=Dict[str, Any])
-async def get_difficulty_levels():
+async def get_difficulty_levels(request: Request, response: Response):
     """
     Get all available difficulty levels.
     
@@ -101,8 +117,12 @@ async def get_difficulty_levels():
         List of difficulty levels
     """
     try:
-        resources = db.get_all_resources(active_only=True)
-        levels = sorted(list(set(resource['difficulty_level'] for resource in resources)))
+        catalog = await get_catalog()
+        not_modified = conditional_response(request, response, catalog.fingerprint)
+        if not_modified:
+            return not_modified
+        
+        levels = catalog.difficulty_levels
         
         return {
             "status": "success",
@@ -129,7 +149,8 @@ async def create_resource(resource_data: ResourceRequest):
         Created resource information
     """
     try:
-        resource_id = db.create_resource(
+        resource_id = await run_db(
+            db.create_resource,
             title=resource_data.title,
             description=resource_data.description,
             type=resource_data.type,
@@ -140,8 +161,7 @@ async def create_resource(resource_data: ResourceRequest):
         )
         
         # Get the created resource
-        resources = db.get_all_resources(active_only=False)
-        created_resource = next((resource for resource in resources if resource['id'] == resource_id), None)
+        created_resource = await run_db(db.get_resource_by_id, resource_id)
         
         if not created_resource:
             raise HTTPException(status_code=500, detail="Failed to retrieve created resource")
@@ -156,6 +176,36 @@ async def create_resource(resource_data: ResourceRequest):
         logger.error(f"Error creating resource: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create resource: {str(e)}")
 
+@router.get("/export")
+async def export_resources(
+    active_only: bool = Query(True, description="Only export active resources"),
+    cursor: Optional[str] = Query(None, description="Resume after this cursor"),
+    batch_size: int = Query(500, ge=1, le=5000, description="Rows fetched per page")
+):
+    """
+    Stream resources as NDJSON (one JSON object per line), ordered by id.
+    
+    Each page of rows is followed by a {"next_cursor": ...} line; pass its
+    value as cursor to resume. The final line has a null next_cursor.
+    
+    Args:
+        active_only: Only export active resources
+        cursor: Opaque keyset cursor to resume from
+        batch_size: Rows fetched from the database per page
+    """
+    async def fetch_page(page_cursor: Optional[str]):
+        return await run_db(db.get_resources_page, cursor=page_cursor, limit=batch_size, active_only=active_only)
+    
+    try:
+        first_page = await fetch_page(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting resources: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to export resources: {str(e)}")
+    
+    return ndjson_response(fetch_page, first_page, filename="resources.ndjson")
+
 @router.get("/{resource_id}", response_model=Dict[str, Any])
 async def get_resource(resource_id: int):
     """
@@ -168,18 +218,15 @@ async def get_resource(resource_id: int):
         Resource information
     """
     try:
-        resources = db.execute_query(
-            "SELECT * FROM resources WHERE id = ?", 
-            (resource_id,)
-        )
+        resource = (await get_catalog()).by_id.get(resource_id)
         
-        if not resources:
+        if not resource:
             raise HTTPException(status_code=404, detail="Resource not found")
         
         return {
             "status": "success",
             "message": "Resource retrieved successfully",
-            "data": resources[0]
+            "data": resource
         }
         
     except HTTPException:
@@ -214,21 +261,18 @@ async def update_resource(
             "tags": resource_data.tags
         }
         
-        rows_affected = db.update_resource(resource_id, **update_data)
+        rows_affected = await run_db(db.update_resource, resource_id, **update_data)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Resource not found")
         
         # Get updated resource
-        resources = db.execute_query(
-            "SELECT * FROM resources WHERE id = ?", 
-            (resource_id,)
-        )
+        updated_resource = await run_db(db.get_resource_by_id, resource_id)
         
         return {
             "status": "success",
             "message": "Resource updated successfully",
-            "data": resources[0] if resources else None
+            "data": updated_resource
         }
         
     except HTTPException:
@@ -249,7 +293,7 @@ async def delete_resource(resource_id: int):
         Deletion confirmation
     """
     try:
-        rows_affected = db.update_resource(resource_id, is_active=False)
+        rows_affected = await run_db(db.update_resource, resource_id, is_active=False)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Resource not found")
@@ -269,45 +313,50 @@ async def delete_resource(resource_id: int):
 async def search_resources(
     query: str,
     resource_type: Optional[str] = Query(None, description="Filter by resource type"),
-    difficulty_level: Optional[int] = Query(None, description="Filter by difficulty level")
+    difficulty_level: Optional[int] = Query(None, description="Filter by difficulty level"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip")
 ):
     """
-    Search resources by title or description.
+    Search resources by title, description and tags, best matches first.
+    
+    Words match whole or, for the last word, as a prefix. Results are ranked
+    with BM25 and carry a highlighted snippet.
     
     Args:
         query: Search query
         resource_type: Filter by resource type
         difficulty_level: Filter by difficulty level
+        limit: Maximum number of results
+        offset: Number of results to skip
         
     Returns:
         List of matching resources
     """
     try:
-        search_query = f"%{query}%"
-        sql_query = """
-            SELECT * FROM resources 
-            WHERE (title LIKE ? OR description LIKE ?) AND is_active = 1
-        """
-        params = [search_query, search_query]
-        
-        if resource_type:
-            sql_query += " AND type = ?"
-            params.append(resource_type)
-        
-        if difficulty_level:
-            sql_query += " AND difficulty_level = ?"
-            params.append(difficulty_level)
-        
-        sql_query += " ORDER BY title"
-        
-        resources = db.execute_query(sql_query, tuple(params))
+        # Fetch one extra row to know whether another page exists
+        resources = await run_db(
+            db.search_resources,
+            query,
+            resource_type=resource_type,
+            difficulty_level=difficulty_level,
+            limit=limit + 1,
+            offset=offset
+        )
+        has_more = len(resources) > limit
+        resources = resources[:limit]
         
         return {
             "status": "success",
             "message": "Search completed successfully",
             "data": resources,
             "count": len(resources),
-            "query": query
+            "query": query,
+            "pagination": {
+                "limit": limit,
+                "offset": offset,
+                "has_more": has_more
+            }
         }
         
     except Exception as e:
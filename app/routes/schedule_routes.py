@@ -7,6 +7,9 @@ Handles learning schedule generation, retrieval, and management.
 from fastapi import APIRouter, HTTPException, Depends, Request, Query
 from typing import List, Dict, Any, Optional
 from app.utils.db_utils import DatabaseManager
+from app.utils.executors import run_db, run_ml
+from app.utils.responses import FastJSONResponse
+from app.utils.streaming import ndjson_response
 from app.ml.optimizer import ScheduleOptimizer
 from app.schemas.schedule_schema import (
     ScheduleGenerationRequest, ScheduleGenerationResponse,
@@ -189,7 +192,8 @@ async def generate_schedule(
         # Step 1: Get user's learning goals
         goals_data = []
         for goal_id in request_data.goal_ids:
-            goal = db.execute_query(
+            goal = await run_db(
+                db.execute_query,
                 "SELECT * FROM learning_goals WHERE id = ? AND user_id = ?",
                 (goal_id, user_id)
             )
@@ -202,10 +206,10 @@ async def generate_schedule(
                 )
         
         # Step 2: Get user's time availability
-        time_availability = db.get_user_time_availability(user_id)
+        time_availability = await run_db(db.get_user_time_availability, user_id)
         
         # Step 3: Get available resources
-        resources_data = db.get_all_resources(active_only=True)
+        resources_data = await run_db(db.get_all_resources, active_only=True)
         
         # Step 4: Validate schedule feasibility
         from app.ml.optimizer import LearningGoal, LearningResource
@@ -245,7 +249,8 @@ async def generate_schedule(
             )
         
         # Step 5: Generate optimized schedule
-        schedule_data = optimizer.generate_schedule(
+        schedule_data = await run_ml(
+            optimizer.generate_schedule,
             user_id=user_id,
             goals=goals,
             time_availability=time_availability,
@@ -256,31 +261,25 @@ async def generate_schedule(
             description=request_data.description
         )
         
-        # Step 6: Save schedule to database
-        schedule_id = db.create_schedule(
+        # Step 6: Save schedule and items in one transaction, getting the persisted rows back
+        complete_schedule = await run_db(
+            db.create_schedule_with_items,
             user_id=user_id,
             title=schedule_data['title'],
             start_date=request_data.start_date,
             end_date=request_data.end_date,
-            description=schedule_data['description']
+            description=schedule_data['description'],
+            items=[
+                {
+                    'resource_id': item.resource_id,
+                    'day_of_week': item.day_of_week,
+                    'start_time': item.start_time.strftime('%H:%M'),
+                    'end_time': item.end_time.strftime('%H:%M'),
+                    'order_index': item.order_index
+                } for item in schedule_data['schedule_items']
+            ]
         )
-        
-        # Step 7: Save schedule items
-        for item in schedule_data['schedule_items']:
-            db.add_schedule_item(
-                schedule_id=schedule_id,
-                resource_id=item.resource_id,
-                day_of_week=item.day_of_week,
-                start_time=item.start_time.strftime('%H:%M'),
-                end_time=item.end_time.strftime('%H:%M'),
-                order_index=item.order_index
-            )
-        
-        # Step 8: Get complete schedule with items
-        complete_schedule = db.get_schedule_with_items(schedule_id)
-        
-        if not complete_schedule:
-            raise HTTPException(status_code=500, detail="Failed to retrieve created schedule")
+        schedule_id = complete_schedule['schedule']['id']
         
         # Convert to response format
         schedule_response = ScheduleResponse(
@@ -333,7 +332,7 @@ async def get_user_schedules(
     current_user: Dict[str, Any] = Depends(get_current_user),
     status: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(10, ge=1, le=100, description="Number of schedules to return"),
-    offset: int = Query(0, ge=0, description="Number of schedules to skip")
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor")
 ):
     """
     Get all schedules for the current user.
@@ -342,75 +341,141 @@ async def get_user_schedules(
         current_user: Authenticated user
         status: Filter by schedule status (active, completed, etc.)
         limit: Maximum number of schedules to return
-        offset: Number of schedules to skip
+        cursor: Opaque keyset cursor for the next page
     """
     try:
         user_id = current_user["id"]
         
-        # Build query
-        query = "SELECT * FROM schedules WHERE user_id = ?"
-        params = [user_id]
-        
-        if status:
-            query += " AND status = ?"
-            params.append(status)
+        # One aggregate query for the page (item counts and hours per schedule)
+        try:
+            page = await run_db(db.list_user_schedules, user_id, status=status, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        
-        schedules = db.execute_query(query, tuple(params))
+        # Goals count is the same for every schedule, so compute it once
+        goals_count_rows = await run_db(
+            db.execute_query,
+            "SELECT COUNT(*) as count FROM learning_goals WHERE user_id = ?",
+            (user_id,)
+        )
+        goals_count = goals_count_rows[0]['count']
         
-        # Get additional info for each schedule
-        schedule_list = []
-        for schedule in schedules:
-            # Get schedule items count
-            items_count = db.execute_query(
-                "SELECT COUNT(*) as count FROM schedule_items WHERE schedule_id = ?",
-                (schedule['id'],)
-            )[0]['count']
-            
-            # Get goals count
-            goals_count = db.execute_query(
-                "SELECT COUNT(*) as count FROM learning_goals WHERE user_id = ?",
-                (user_id,)
-            )[0]['count']
-            
-            # Calculate total hours and efficiency
-            total_hours = db.execute_query(
-                "SELECT SUM(estimated_hours) as total FROM schedule_items WHERE schedule_id = ?",
-                (schedule['id'],)
-            )[0]['total'] or 0
-            
-            schedule_list.append({
+        schedule_list = [
+            {
                 'id': schedule['id'],
                 'title': schedule['title'],
                 'description': schedule['description'],
                 'start_date': schedule['start_date'],
                 'end_date': schedule['end_date'],
                 'status': schedule['status'],
-                'total_hours': total_hours,
+                'total_hours': schedule['total_hours'],
                 'efficiency': 85.0,  # Placeholder - would calculate from actual data
                 'goals_count': goals_count,
-                'items_count': items_count,
+                'items_count': schedule['items_count'],
                 'created_at': schedule['created_at']
-            })
+            } for schedule in page['schedules']
+        ]
         
-        return {
+        return FastJSONResponse({
             "status": "success",
             "message": "Schedules retrieved successfully",
             "data": schedule_list,
             "count": len(schedule_list),
             "pagination": {
                 "limit": limit,
-                "offset": offset,
-                "total": len(schedule_list)
+                "cursor": cursor,
+                "next_cursor": page['next_cursor'],
+                "total": page['total']
             }
-        }
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting schedules: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get schedules: {str(e)}")
 
+@router.get("/export")
+async def export_user_schedules(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    cursor: Optional[str] = Query(None, description="Resume after this cursor"),
+    batch_size: int = Query(200, ge=1, le=1000, description="Schedules fetched per page")
+):
+    """
+    Stream the current user's schedules (with item counts and hours) as NDJSON, newest first.
+    
+    Each page of rows is followed by a {"next_cursor": ...} line; pass its
+    value as cursor to resume. The final line has a null next_cursor.
+    
+    Args:
+        current_user: Authenticated user
+        status: Filter by schedule status
+        cursor: Opaque keyset cursor to resume from
+        batch_size: Schedules fetched from the database per page
+    """
+    user_id = current_user["id"]
+    
+    async def fetch_page(page_cursor: Optional[str]):
+        return await run_db(
+            db.list_user_schedules, user_id, status=status, limit=batch_size,
+            cursor=page_cursor, include_total=False
+        )
+    
+    try:
+        first_page = await fetch_page(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting schedules: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to export schedules: {str(e)}")
+    
+    return ndjson_response(fetch_page, first_page, items_key="schedules", filename="schedules.ndjson")
+
+@router.get("/{schedule_id}/items/export")
+async def export_schedule_items(
+    schedule_id: int,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Resume after this cursor"),
+    batch_size: int = Query(500, ge=1, le=5000, description="Items fetched per page")
+):
+    """
+    Stream a schedule's items as NDJSON, in the same order as the schedule detail endpoint.
+    
+    Each page of rows is followed by a {"next_cursor": ...} line; pass its
+    value as cursor to resume. The final line has a null next_cursor.
+    
+    Args:
+        schedule_id: ID of the schedule
+        current_user: Authenticated user
+        cursor: Opaque keyset cursor to resume from
+        batch_size: Items fetched from the database per page
+    """
+    async def fetch_page(page_cursor: Optional[str]):
+        return await run_db(db.get_schedule_items_page, schedule_id, cursor=page_cursor, limit=batch_size)
+    
+    try:
+        # Verify schedule belongs to user
+        schedule_check = await run_db(
+            db.execute_query,
+            "SELECT id FROM schedules WHERE id = ? AND user_id = ?",
+            (schedule_id, current_user["id"])
+        )
+        
+        if not schedule_check:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        
+        first_page = await fetch_page(cursor)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting schedule items: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to export schedule items: {str(e)}")
+    
+    return ndjson_response(fetch_page, first_page, filename=f"schedule-{schedule_id}-items.ndjson")
+
 @router.get("/{schedule_id}", response_model=Dict[str, Any])
 async def get_schedule(schedule_id: int, current_user: Dict[str, Any] = Depends(get_current_user)):
     """
@@ -424,7 +489,8 @@ async def get_schedule(schedule_id: int, current_user: Dict[str, Any] = Depends(
         user_id = current_user["id"]
         
         # Verify schedule belongs to user
-        schedule_check = db.execute_query(
+        schedule_check = await run_db(
+            db.execute_query,
             "SELECT * FROM schedules WHERE id = ? AND user_id = ?",
             (schedule_id, user_id)
         )
@@ -433,7 +499,7 @@ async def get_schedule(schedule_id: int, current_user: Dict[str, Any] = Depends(
             raise HTTPException(status_code=404, detail="Schedule not found")
         
         # Get complete schedule with items
-        complete_schedule = db.get_schedule_with_items(schedule_id)
+        complete_schedule = await run_db(db.get_schedule_with_items, schedule_id)
         
         if not complete_schedule:
             raise HTTPException(status_code=404, detail="Schedule not found")
@@ -443,7 +509,7 @@ async def get_schedule(schedule_id: int, current_user: Dict[str, Any] = Depends(
         completed_items = sum(1 for item in complete_schedule['items'] if item.get('is_completed', False))
         completion_rate = (completed_items / len(complete_schedule['items']) * 100) if complete_schedule['items'] else 0
         
-        return {
+        return FastJSONResponse({
             "status": "success",
             "message": "Schedule retrieved successfully",
             "data": {
@@ -456,7 +522,7 @@ async def get_schedule(schedule_id: int, current_user: Dict[str, Any] = Depends(
                     "total_hours": total_hours
                 }
             }
-        }
+        })
         
     except HTTPException:
         raise
@@ -482,7 +548,8 @@ async def update_schedule(
         user_id = current_user["id"]
         
         # Verify schedule belongs to user
-        schedule_check = db.execute_query(
+        schedule_check = await run_db(
+            db.execute_query,
             "SELECT * FROM schedules WHERE id = ? AND user_id = ?",
             (schedule_id, user_id)
         )
@@ -500,7 +567,8 @@ async def update_schedule(
             update_fields['status'] = update_data.status
         
         if update_fields:
-            rows_affected = db.execute_update(
+            rows_affected = await run_db(
+                db.execute_update,
                 "UPDATE schedules SET " + ", ".join([f"{k} = ?" for k in update_fields.keys()]) + " WHERE id = ?",
                 tuple(update_fields.values()) + (schedule_id,)
             )
@@ -509,7 +577,8 @@ async def update_schedule(
                 raise HTTPException(status_code=500, detail="Failed to update schedule")
         
         # Get updated schedule
-        updated_schedule = db.execute_query(
+        updated_schedule = await run_db(
+            db.execute_query,
             "SELECT * FROM schedules WHERE id = ?", (schedule_id,)
         )
         
@@ -538,7 +607,8 @@ async def delete_schedule(schedule_id: int, current_user: Dict[str, Any] = Depen
         user_id = current_user["id"]
         
         # Verify schedule belongs to user
-        schedule_check = db.execute_query(
+        schedule_check = await run_db(
+            db.execute_query,
             "SELECT * FROM schedules WHERE id = ? AND user_id = ?",
             (schedule_id, user_id)
         )
@@ -547,13 +617,15 @@ async def delete_schedule(schedule_id: int, current_user: Dict[str, Any] = Depen
             raise HTTPException(status_code=404, detail="Schedule not found")
         
         # Delete schedule items first
-        db.execute_update(
+        await run_db(
+            db.execute_update,
             "DELETE FROM schedule_items WHERE schedule_id = ?",
             (schedule_id,)
         )
         
         # Delete schedule
-        rows_affected = db.execute_update(
+        rows_affected = await run_db(
+            db.execute_update,
             "DELETE FROM schedules WHERE id = ?",
             (schedule_id,)
         )
@@ -586,7 +658,8 @@ async def mark_item_completed(schedule_id: int, item_id: int, current_user: Dict
         user_id = current_user["id"]
         
         # Verify schedule belongs to user
-        schedule_check = db.execute_query(
+        schedule_check = await run_db(
+            db.execute_query,
             "SELECT * FROM schedules WHERE id = ? AND user_id = ?",
             (schedule_id, user_id)
         )
@@ -595,7 +668,7 @@ async def mark_item_completed(schedule_id: int, item_id: int, current_user: Dict
             raise HTTPException(status_code=404, detail="Schedule not found")
         
         # Mark item as completed
-        rows_affected = db.mark_schedule_item_completed(item_id)
+        rows_affected = await run_db(db.mark_schedule_item_completed, item_id)
         
         if rows_affected == 0:
             raise HTTPException(status_code=404, detail="Schedule item not found")
@@ -622,43 +695,13 @@ async def get_schedule_stats(current_user: Dict[str, Any] = Depends(get_current_
     try:
         user_id = current_user["id"]
         
-        # Get basic stats
-        total_schedules = db.execute_query(
-            "SELECT COUNT(*) as count FROM schedules WHERE user_id = ?",
-            (user_id,)
-        )[0]['count']
-        
-        active_schedules = db.execute_query(
-            "SELECT COUNT(*) as count FROM schedules WHERE user_id = ? AND status = 'active'",
-            (user_id,)
-        )[0]['count']
-        
-        completed_schedules = db.execute_query(
-            "SELECT COUNT(*) as count FROM schedules WHERE user_id = ? AND status = 'completed'",
-            (user_id,)
-        )[0]['count']
-        
-        # Get total learning hours
-        total_hours = db.execute_query(
-            """
-            SELECT SUM(si.estimated_hours) as total 
-            FROM schedule_items si 
-            JOIN schedules s ON si.schedule_id = s.id 
-            WHERE s.user_id = ?
-            """,
-            (user_id,)
-        )[0]['total'] or 0
-        
-        # Get completed hours
-        completed_hours = db.execute_query(
-            """
-            SELECT SUM(si.estimated_hours) as total 
-            FROM schedule_items si 
-            JOIN schedules s ON si.schedule_id = s.id 
-            WHERE s.user_id = ? AND si.is_completed = 1
-            """,
-            (user_id,)
-        )[0]['total'] or 0
+        # Precomputed summary row, maintained on write
+        stats = await run_db(db.get_user_schedule_stats, user_id)
+        total_schedules = stats['total_schedules']
+        active_schedules = stats['active_schedules']
+        completed_schedules = stats['completed_schedules']
+        total_hours = stats['total_hours'] or 0
+        completed_hours = stats['completed_hours'] or 0
         
         completion_rate = (completed_hours / total_hours * 100) if total_hours > 0 else 0
         
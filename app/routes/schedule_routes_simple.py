@@ -9,7 +9,8 @@ from typing import List, Dict, Any, Optional
 from app.utils.db_utils import DatabaseManager
 from app.schemas.schedule_schema import ScheduleGenerationRequest
 from app.ml.schedule_generator import MLScheduleGenerator, LearningGoal
-from app.ml.recommender import LearningResourceRecommender
+from app.ml.registry import model_registry
+from app.utils.executors import run_ml
 import logging
 from datetime import datetime
 
@@ -18,9 +19,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/schedules", tags=["Schedule Management"])
 db = DatabaseManager()
 
-# Initialize ML components
-recommender = LearningResourceRecommender()
-schedule_generator = MLScheduleGenerator(recommender)
+def get_schedule_generator() -> MLScheduleGenerator:
+    """Build a schedule generator around the shared, currently active recommender."""
+    return MLScheduleGenerator(model_registry.get("resources"))
 
 # Import authentication middleware
 from app.middleware.auth_middleware import get_current_user, get_current_user_optional
@@ -34,10 +35,7 @@ async def test_schedule_generator():
     try:
         logger.info("Generating real ML-powered schedule using trained models")
         
-        # Initialize ML components if not already done
-        if not recommender.is_trained:
-            logger.info("Initializing ML recommender...")
-            recommender.initialize()
+        schedule_generator = await run_ml(get_schedule_generator)
         
         # Create sample learning goals
         goals = [
@@ -71,7 +69,8 @@ async def test_schedule_generator():
         ]
         
         # Generate schedule using real ML model
-        schedule_data = schedule_generator.generate_schedule(
+        schedule_data = await run_ml(
+            schedule_generator.generate_schedule,
             user_id=2,
             goals=goals,
             time_availability=time_availability,
@@ -108,10 +107,7 @@ async def generate_schedule(
         user_id = current_user["id"] if current_user else 2
         logger.info(f"Generating real ML-powered schedule for user {user_id}")
         
-        # Initialize ML components if not already done
-        if not recommender.is_trained:
-            logger.info("Initializing ML recommender...")
-            recommender.initialize()
+        schedule_generator = await run_ml(get_schedule_generator)
         
         # Create learning goals from request
         goals = [
@@ -137,7 +133,8 @@ async def generate_schedule(
         ]
         
         # Generate schedule using real ML model
-        schedule_data = schedule_generator.generate_schedule(
+        schedule_data = await run_ml(
+            schedule_generator.generate_schedule,
             user_id=user_id,
             goals=goals,
             time_availability=time_availability,
@@ -245,7 +242,9 @@ async def generate_youtube_schedule(
         ]
         
         # Generate YouTube schedule using smart breakdown
-        schedule_data = schedule_generator.generate_youtube_schedule(
+        schedule_generator = await run_ml(get_schedule_generator)
+        schedule_data = await run_ml(
+            schedule_generator.generate_youtube_schedule,
             youtube_url=youtube_url,
             duration_hours=duration_hours,
             time_availability=time_availability,
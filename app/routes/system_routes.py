@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any
 import os
 import sys
 from datetime import datetime
-from app.ml.recommender import LearningResourceRecommender
-from app.utils.db_utils import DatabaseManager
+from app.ml.recommendation_cache import recommendation_cache_stats
+from app.ml.registry import model_registry
+from app.middleware.auth_middleware import require_admin
+from app.utils.db_utils import DatabaseManager, pool_metrics
+from app.middleware.compression_middleware import compression_cache_stats
+from app.utils.executors import executor_metrics, run_db, run_ml
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,20 +64,17 @@ async def system_status():
         # Check database connection
         try:
             db = DatabaseManager()
-            db.execute_query("SELECT 1")
+            await run_db(db.execute_query, "SELECT 1")
             status_info["database"] = {"status": "connected", "error": None}
         except Exception as e:
             status_info["database"] = {"status": "error", "error": str(e)}
         
-        # Check ML system
-        try:
-            recommender = LearningResourceRecommender()
-            if recommender.initialize():
-                status_info["ml_system"] = {"status": "ready", "error": None}
-            else:
-                status_info["ml_system"] = {"status": "error", "error": "Failed to initialize ML system"}
-        except Exception as e:
-            status_info["ml_system"] = {"status": "error", "error": str(e)}
+        # Check ML system (readiness probe only, never loads or retrains models)
+        models = model_registry.status()
+        if model_registry.is_ready("resources"):
+            status_info["ml_system"] = {"status": "ready", "error": None, "models": models}
+        else:
+            status_info["ml_system"] = {"status": "not_loaded", "error": None, "models": models}
         
         return {
             "status": "success",
@@ -88,6 +89,35 @@ async def system_status():
             detail="Failed to get system status"
         )
 
+@router.post("/models/{model_name}/reload")
+async def reload_model(model_name: str, current_user: Dict[str, Any] = Depends(require_admin)):
+    """
+    Build a new version of a model and hot-swap it in.
+    
+    Args:
+        model_name: Registered model name (resources, books)
+        
+    Returns:
+        The new model status
+    """
+    try:
+        await run_ml(model_registry.reload, model_name)
+        
+        return {
+            "status": "success",
+            "message": f"Model '{model_name}' reloaded successfully",
+            "data": model_registry.status()[model_name]
+        }
+        
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model_name}")
+    except Exception as e:
+        logger.error(f"Error reloading model {model_name}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to reload model: {str(e)}"
+        )
+
 @router.get("/metrics")
 async def system_metrics():
     """
@@ -97,12 +127,18 @@ async def system_metrics():
         System metrics information
     """
     try:
+        database_pools = pool_metrics()
+        
         metrics = {
             "timestamp": datetime.utcnow().isoformat(),
             "uptime": "N/A",  # Could be calculated if needed
             "memory_usage": "N/A",  # Could be implemented if needed
             "disk_usage": "N/A",  # Could be implemented if needed
-            "active_connections": "N/A"  # Could be implemented if needed
+            "active_connections": sum(pool["in_use"] for pool in database_pools),
+            "database_pools": database_pools,
+            "executors": executor_metrics(),
+            "compression_cache": compression_cache_stats(),
+            "recommendation_cache": recommendation_cache_stats()
         }
         
         return {
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import Dict, Any
 from app.services.auth_service import AuthService
 from app.utils.db_utils import DatabaseManager
+from app.utils.executors import run_db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -115,7 +116,7 @@ async def update_user_profile(
             )
         
         # Update user in database
-        rows_affected = db.update_user(current_user["id"], **filtered_data)
+        rows_affected = await run_db(db.update_user, current_user["id"], **filtered_data)
         
         if rows_affected == 0:
             raise HTTPException(
@@ -124,7 +125,7 @@ async def update_user_profile(
             )
         
         # Get updated user data
-        updated_user = db.execute_query("SELECT * FROM users WHERE id = ?", (current_user["id"],))[0]
+        updated_user = (await run_db(db.execute_query, "SELECT * FROM users WHERE id = ?", (current_user["id"],)))[0]
         
         return {
             "status": "success",
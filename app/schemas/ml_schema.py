@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 class RecommendationRequest(BaseModel):
@@ -15,6 +15,23 @@ class RecommendationResponse(BaseModel):
     message: str
     data: List[RecommendationItem]
 
+class BatchRecommendationQuery(BaseModel):
+    topic: str = Field(..., min_length=1, max_length=200, description="Topic of interest")
+    top_k: int = Field(5, ge=1, le=10, description="Number of recommendations to return")
+    resource_type: Optional[str] = Field(None, description="Filter by resource type (video, article, course)")
+
+class BatchRecommendationRequest(BaseModel):
+    queries: List[BatchRecommendationQuery] = Field(..., min_length=1, max_length=50, description="Topics to score together")
+
+class BatchRecommendationResult(BaseModel):
+    topic: str
+    data: List[RecommendationItem]
+
+class BatchRecommendationResponse(BaseModel):
+    status: str
+    message: str
+    data: List[BatchRecommendationResult]
+
 class ErrorResponse(BaseModel):
     status: str
     message: str
@@ -4,13 +4,28 @@ except ImportError:
     import jwt
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-import requests
+import hashlib
+import time
+import uuid
 from app.config import settings
+from app.services.google_oauth_client import google_oauth_client
+from app.services.token_revocation import NEVER_EXPIRES, token_revocation_store
+from app.utils.cache import TTLCache
 from app.utils.db_utils import DatabaseManager
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Verified token payloads keyed by token digest, each kept until the token's exp
+_token_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def _token_id(payload: Dict[str, Any], digest: str) -> str:
+    """Revocation key: the token's jti, or its digest for tokens issued without one."""
+    return payload.get("jti") or digest
+
 class AuthService:
     """
     Handles authentication using Google OAuth2 and JWT tokens.
@@ -38,7 +53,8 @@ class AuthService:
             "email": email,
             "role": role,
             "exp": expire,
-            "iat": datetime.utcnow()
+            "iat": datetime.utcnow(),
+            "jti": uuid.uuid4().hex
         }
         
         encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
@@ -54,17 +70,29 @@ class AuthService:
         Returns:
             Decoded token payload or None if invalid
         """
-        try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-            return payload
-        except jwt.ExpiredSignatureError:
-            logger.warning("Token has expired")
-            return None
-        except jwt.InvalidTokenError:
-            logger.warning("Invalid token")
+        digest = _token_digest(token)
+        payload = _token_cache.get(digest)
+        if payload is None:
+            try:
+                payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+            except jwt.ExpiredSignatureError:
+                logger.warning("Token has expired")
+                return None
+            except jwt.InvalidTokenError:
+                logger.warning("Invalid token")
+                return None
+            
+            # Tokens without an expiry are verified every time
+            exp = payload.get("exp")
+            if isinstance(exp, (int, float)) and exp > time.time():
+                _token_cache.set(digest, payload, expires_at=exp)
+        
+        if token_revocation_store.is_revoked(_token_id(payload, digest)):
+            logger.warning("Token has been revoked")
             return None
+        return payload
     
-    def get_google_user_info(self, access_token: str) -> Optional[Dict[str, Any]]:
+    async def get_google_user_info(self, access_token: str) -> Optional[Dict[str, Any]]:
         """
         Get user information from Google using access token.
         
@@ -75,13 +103,7 @@ class AuthService:
             User information dictionary or None if failed
         """
         try:
-            url = "https://www.googleapis.com/oauth2/v2/userinfo"
-            headers = {"Authorization": f"Bearer {access_token}"}
-            
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            return response.json()
+            return await google_oauth_client.get_user_info(access_token)
             
         except Exception as e:
             logger.error(f"Error getting Google user info: {e}")
@@ -100,7 +122,7 @@ class AuthService:
             # Return a test URL that will show a message
             return "http://localhost:8000/api/v1/auth/test-login"
         
-        base_url = "https://accounts.google.com/o/oauth2/v2/auth"
+        base_url = f"{google_oauth_client.base_url}/o/oauth2/v2/auth"
         params = {
             "client_id": settings.GOOGLE_CLIENT_ID,
             "redirect_uri": settings.GOOGLE_REDIRECT_URI,
@@ -112,7 +134,7 @@ class AuthService:
         param_string = "&".join([f"{key}={value}" for key, value in params.items()])
         return f"{base_url}?{param_string}"
     
-    def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
+    async def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
         """
         Exchange authorization code for access token.
         
@@ -123,19 +145,7 @@ class AuthService:
             Token response or None if failed
         """
         try:
-            url = "https://oauth2.googleapis.com/token"
-            data = {
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "code": code,
-                "grant_type": "authorization_code",
-                "redirect_uri": settings.GOOGLE_REDIRECT_URI
-            }
-            
-            response = requests.post(url, data=data)
-            response.raise_for_status()
-            
-            return response.json()
+            return await google_oauth_client.exchange_code(code, settings.GOOGLE_REDIRECT_URI)
             
         except Exception as e:
             logger.error(f"Error exchanging code for token: {e}")
@@ -211,9 +221,15 @@ class AuthService:
             True if successful, False otherwise
         """
         try:
-            # For JWT tokens, we can't invalidate them server-side
-            # In a production system, you might want to maintain a blacklist
-            # For now, we'll just log the logout event
+            payload = self.verify_token(access_token)
+            if payload:
+                exp = payload.get("exp")
+                token_revocation_store.revoke(
+                    _token_id(payload, _token_digest(access_token)),
+                    expires_at=exp if isinstance(exp, (int, float)) else NEVER_EXPIRES,
+                    user_id=int(payload["sub"]) if payload.get("sub") else None
+                )
+            
             self.db.log_event("user_logout")
             return True
             
@@ -237,9 +253,7 @@ class AuthService:
                 return None
             
             user_id = int(payload.get("sub"))
-            user = self.db.execute_query("SELECT * FROM users WHERE id = ?", (user_id,))
-            
-            return user[0] if user else None
+            return self.db.get_user_by_id(user_id)
             
         except Exception as e:
             logger.error(f"Error getting current user: {e}")
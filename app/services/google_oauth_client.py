@@ -0,0 +1,202 @@
+"""
+Google OAuth2 Client
+
+Async HTTP client for the Google OAuth2 / OpenID Connect endpoints. One
+httpx.AsyncClient (and its keep-alive connection pool) is shared by all
+requests, every call has a timeout, transient failures are retried with
+exponential backoff, and the OpenID discovery document and JWKS are cached.
+
+The issuer base URL comes from settings.GOOGLE_OAUTH_BASE_URL, so tests can
+point the client at a local stub that serves its own discovery document.
+"""
+
+import asyncio
+import random
+from typing import Any, Dict, Optional
+import logging
+
+import httpx
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Used when the discovery document cannot be fetched
+DEFAULT_ENDPOINTS = {
+    "authorization_endpoint": "https://accounts.google.com/o/oauth2/v2/auth",
+    "token_endpoint": "https://oauth2.googleapis.com/token",
+    "userinfo_endpoint": "https://www.googleapis.com/oauth2/v2/userinfo",
+    "jwks_uri": "https://www.googleapis.com/oauth2/v3/certs",
+}
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class GoogleOAuthError(Exception):
+    """Raised when a Google OAuth request fails after all retries."""
+
+class GoogleOAuthClient:
+    """
+    Shared async client for Google's OAuth2 endpoints.
+
+    The underlying httpx.AsyncClient is created lazily on first use and must
+    be closed with aclose() on application shutdown.
+    """
+
+    def __init__(
+        self,
+        base_url: str = None,
+        timeout: float = None,
+        max_retries: int = None,
+        backoff_seconds: float = 0.25,
+        metadata_ttl: float = None
+    ):
+        self.base_url = (base_url or settings.GOOGLE_OAUTH_BASE_URL).rstrip("/")
+        self.timeout = timeout if timeout is not None else settings.GOOGLE_OAUTH_TIMEOUT_SECONDS
+        self.max_retries = max_retries if max_retries is not None else settings.GOOGLE_OAUTH_MAX_RETRIES
+        self.backoff_seconds = backoff_seconds
+        self._metadata = TTLCache(
+            maxsize=8,
+            ttl=metadata_ttl if metadata_ttl is not None else settings.GOOGLE_OAUTH_METADATA_TTL_SECONDS
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._metadata_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def discovery_url(self) -> str:
+        return f"{self.base_url}/.well-known/openid-configuration"
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+                headers={"Accept": "application/json"}
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, url: str, idempotent: bool = True, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transient failures with exponential backoff.
+
+        Non-idempotent requests (the single-use code exchange) are only
+        retried when the connection could not be established, i.e. when the
+        request certainly never reached Google.
+        """
+        client = self._get_client()
+        attempt = 0
+
+        while True:
+            try:
+                response = await client.request(method, url, **kwargs)
+                if response.status_code in RETRY_STATUS_CODES and idempotent and attempt < self.max_retries:
+                    logger.warning(f"Google OAuth {method} {url} returned {response.status_code}, retrying")
+                else:
+                    response.raise_for_status()
+                    return response
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                if attempt >= self.max_retries:
+                    raise GoogleOAuthError(f"{method} {url} failed: {e}") from e
+                logger.warning(f"Google OAuth {method} {url} could not connect ({e}), retrying")
+            except httpx.TransportError as e:
+                if not idempotent or attempt >= self.max_retries:
+                    raise GoogleOAuthError(f"{method} {url} failed: {e}") from e
+                logger.warning(f"Google OAuth {method} {url} failed ({e}), retrying")
+            except httpx.HTTPStatusError as e:
+                raise GoogleOAuthError(
+                    f"{method} {url} returned {e.response.status_code}: {e.response.text[:200]}"
+                ) from e
+
+            await asyncio.sleep(self.backoff_seconds * (2 ** attempt) * (1 + random.random() * 0.5))
+            attempt += 1
+
+    async def _get_metadata(self, key: str, url: str) -> Any:
+        """Fetch a cached JSON document, letting one caller refresh it at a time."""
+        cached = self._metadata.get(key)
+        if cached is not None:
+            return cached
+
+        if self._metadata_lock is None:
+            self._metadata_lock = asyncio.Lock()
+
+        async with self._metadata_lock:
+            cached = self._metadata.get(key)
+            if cached is not None:
+                return cached
+
+            response = await self._request("GET", url)
+            document = response.json()
+            self._metadata.set(key, document)
+            return document
+
+    async def get_discovery_document(self) -> Dict[str, Any]:
+        """Get the OpenID Connect discovery document (cached)."""
+        return await self._get_metadata("discovery", self.discovery_url)
+
+    async def get_endpoint(self, name: str) -> str:
+        """Resolve an endpoint URL from discovery, falling back to Google's defaults."""
+        try:
+            document = await self.get_discovery_document()
+            if document.get(name):
+                return document[name]
+        except GoogleOAuthError as e:
+            logger.warning(f"OpenID discovery failed, using default endpoints: {e}")
+            # Don't retry discovery on every login while the issuer is unreachable
+            self._metadata.set("discovery", {}, ttl=60)
+        return DEFAULT_ENDPOINTS[name]
+
+    async def get_jwks(self) -> Dict[str, Any]:
+        """Get the JSON Web Key Set used to sign Google ID tokens (cached)."""
+        jwks_uri = await self.get_endpoint("jwks_uri")
+        return await self._get_metadata("jwks", jwks_uri)
+
+    async def exchange_code(self, code: str, redirect_uri: str) -> Dict[str, Any]:
+        """
+        Exchange an authorization code for tokens.
+
+        Raises:
+            GoogleOAuthError: If the exchange fails
+        """
+        token_endpoint = await self.get_endpoint("token_endpoint")
+        response = await self._request(
+            "POST",
+            token_endpoint,
+            idempotent=False,
+            data={
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": redirect_uri
+            }
+        )
+        return response.json()
+
+    async def get_user_info(self, access_token: str) -> Dict[str, Any]:
+        """
+        Get the profile of the user an access token belongs to.
+
+        Raises:
+            GoogleOAuthError: If the request fails
+        """
+        userinfo_endpoint = await self.get_endpoint("userinfo_endpoint")
+        response = await self._request(
+            "GET",
+            userinfo_endpoint,
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        user_info = response.json()
+
+        # The OpenID userinfo endpoint identifies users by "sub"
+        if "id" not in user_info and "sub" in user_info:
+            user_info["id"] = user_info["sub"]
+        return user_info
+
+# Global client instance
+google_oauth_client = GoogleOAuthClient()
@@ -0,0 +1,208 @@
+"""
+Token Revocation
+
+Revoked access-token IDs (jti) are persisted in the revoked_tokens table and
+mirrored into an in-memory bloom filter. The common case (a token that was
+never revoked) is answered by the bloom filter alone; only a filter hit is
+confirmed with a primary-key lookup. The filter is synced incrementally by
+row id, so revocations made by other worker processes show up within
+TOKEN_REVOCATION_REFRESH_SECONDS. Expired rows are deleted periodically.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+import logging
+
+from app.config import settings
+from app.utils.db_utils import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Expiry stored for tokens without an exp claim: 9999-12-31, so cleanup
+# never deletes the row and the token stays revoked
+NEVER_EXPIRES = 253402300799.0
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN64 = 0x9E3779B97F4A7C15
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings.
+
+    Bit positions come from double hashing Python's built-in string hash.
+    It is salted per process, which is fine because a filter never leaves
+    the process that built it.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false-positive rate at capacity
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def _hashes(item: str):
+        h1 = hash(item) & _MASK64
+        h2 = ((h1 * _GOLDEN64) & _MASK64) >> 7 | 1
+        return h1, h2
+
+    def add(self, item: str):
+        h1, h2 = self._hashes(item)
+        bits, num_bits = self._bits, self.num_bits
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        if not self.count:
+            return False
+
+        h1, h2 = self._hashes(item)
+        bits, num_bits = self._bits, self.num_bits
+        # Most misses stop at the first or second probe
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+class TokenRevocationStore:
+    """
+    Persistent revocation list with a bloom-filter front.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        capacity: int = None,
+        refresh_interval: float = None,
+        cleanup_interval: float = None
+    ):
+        self.db = db
+        self.capacity = capacity or settings.TOKEN_REVOCATION_BLOOM_CAPACITY
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None else settings.TOKEN_REVOCATION_REFRESH_SECONDS
+        )
+        self.cleanup_interval = (
+            cleanup_interval if cleanup_interval is not None else settings.TOKEN_REVOCATION_CLEANUP_SECONDS
+        )
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(self.capacity)
+        self._last_id = 0
+        # Ids revoked by this process that refresh has not reached yet; they
+        # are already in the filter, so refresh must not add them again
+        self._local_ids = set()
+        self._last_refresh = 0.0
+        self._last_cleanup = time.time()
+
+    def revoke(self, jti: str, expires_at: float, user_id: Optional[int] = None):
+        """
+        Revoke a token until it expires.
+
+        Args:
+            jti: Token ID
+            expires_at: Token expiry as a Unix timestamp (NEVER_EXPIRES for
+                tokens without one)
+            user_id: Owner of the token
+        """
+        rows = self.db.execute_query(
+            "INSERT OR IGNORE INTO revoked_tokens (jti, user_id, expires_at) VALUES (?, ?, ?) RETURNING id",
+            (jti, user_id, expires_at)
+        )
+        if not rows:
+            # Already revoked; refresh picks the row up if this process has not seen it
+            return
+        with self._lock:
+            self._bloom.add(jti)
+            # _last_id cannot simply jump to this id: rows with lower ids
+            # from other processes may still be unsynced
+            if rows[0]["id"] > self._last_id:
+                self._local_ids.add(rows[0]["id"])
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether a token ID has been revoked.
+
+        Args:
+            jti: Token ID
+
+        Returns:
+            True if the token is revoked
+        """
+        if time.time() - self._last_refresh >= self.refresh_interval:
+            self.refresh()
+
+        if jti not in self._bloom:
+            return False
+
+        # Possible false positive: confirm against the table
+        rows = self.db.execute_query("SELECT 1 FROM revoked_tokens WHERE jti = ?", (jti,))
+        return bool(rows)
+
+    def refresh(self):
+        """Add rows revoked since the last sync to the filter, cleaning up expired rows when due."""
+        with self._lock:
+            now = time.time()
+            if now - self._last_refresh < self.refresh_interval:
+                return
+
+            try:
+                if now - self._last_cleanup >= self.cleanup_interval:
+                    self._cleanup(now)
+
+                rows = self.db.execute_query(
+                    "SELECT id, jti FROM revoked_tokens WHERE id > ? ORDER BY id",
+                    (self._last_id,)
+                )
+                for row in rows:
+                    if row["id"] in self._local_ids:
+                        self._local_ids.discard(row["id"])
+                    else:
+                        self._bloom.add(row["jti"])
+                    self._last_id = row["id"]
+
+                # Past capacity the false-positive rate climbs, so rebuild bigger
+                if self._bloom.count > self._bloom.capacity:
+                    self._rebuild()
+            except Exception as e:
+                logger.error(f"Error refreshing token revocation list: {e}")
+            finally:
+                self._last_refresh = now
+
+    def _cleanup(self, now: float):
+        """Delete rows for tokens that have expired anyway, then rebuild the filter."""
+        removed = self.db.execute_update("DELETE FROM revoked_tokens WHERE expires_at < ?", (now,))
+        self._last_cleanup = now
+        if removed:
+            logger.info(f"Removed {removed} expired revoked tokens")
+            self._rebuild()
+
+    def _rebuild(self):
+        rows = self.db.execute_query("SELECT id, jti FROM revoked_tokens ORDER BY id")
+        bloom = BloomFilter(max(self.capacity, len(rows) * 2))
+        for row in rows:
+            bloom.add(row["jti"])
+        self._bloom = bloom
+        self._last_id = rows[-1]["id"] if rows else self._last_id
+        self._local_ids = {row_id for row_id in self._local_ids if row_id > self._last_id}
+
+    def stats(self) -> Dict[str, Any]:
+        """Filter size and sync position."""
+        return {
+            "entries": self._bloom.count,
+            "capacity": self._bloom.capacity,
+            "last_id": self._last_id
+        }
+
+# Global revocation store
+token_revocation_store = TokenRevocationStore(DatabaseManager())
@@ -0,0 +1 @@
+# API and database tests
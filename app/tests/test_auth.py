@@ -0,0 +1,111 @@
+import sys
+import os
+import time
+import uuid
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+
+from app.services.token_revocation import NEVER_EXPIRES, TokenRevocationStore
+from app.utils.db_utils import DatabaseManager
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(str(tmp_path / "test.db"))
+
+def _store(db, **kwargs):
+    """A store that syncs on every check unless told otherwise."""
+    kwargs.setdefault("refresh_interval", 0)
+    kwargs.setdefault("cleanup_interval", 3600)
+    return TokenRevocationStore(db, **kwargs)
+
+class TestTokenRevocationStore:
+    """Test cases for the persisted, bloom-filtered revocation list."""
+
+    def test_revoked_token_is_reported(self, db):
+        """Revoked ids are reported as revoked, others are not."""
+        store = _store(db)
+        store.revoke("revoked", expires_at=time.time() + 60, user_id=1)
+
+        assert store.is_revoked("revoked")
+        assert not store.is_revoked("other")
+
+    def test_other_store_sees_revocation_after_refresh(self, db):
+        """A revocation made by another process shows up once the store refreshes."""
+        store = _store(db, refresh_interval=3600)
+        other = _store(db)
+        store.refresh()
+
+        other.revoke("remote", expires_at=time.time() + 60)
+        assert not store.is_revoked("remote")
+
+        store._last_refresh = 0.0
+        store.refresh()
+        assert store.is_revoked("remote")
+
+    def test_local_revocation_is_counted_once(self, db):
+        """Refresh does not add this process's own revocations to the filter again."""
+        store = _store(db)
+        other = _store(db)
+
+        store.revoke("local", expires_at=time.time() + 60)
+        store.revoke("local", expires_at=time.time() + 60)
+        other.revoke("remote", expires_at=time.time() + 60)
+        store.refresh()
+
+        assert store.stats()["entries"] == 2
+        assert store.is_revoked("local") and store.is_revoked("remote")
+
+    def test_cleanup_removes_expired_revocations(self, db):
+        """Expired rows are deleted and dropped from the filter; live rows stay."""
+        store = _store(db, cleanup_interval=0)
+        store.revoke("expired", expires_at=time.time() - 1)
+        store.revoke("live", expires_at=time.time() + 60)
+        store.revoke("no-exp", expires_at=NEVER_EXPIRES)
+
+        store.refresh()
+
+        remaining = {row["jti"] for row in db.execute_query("SELECT jti FROM revoked_tokens")}
+        assert remaining == {"live", "no-exp"}
+        assert not store.is_revoked("expired")
+        assert store.is_revoked("live") and store.is_revoked("no-exp")
+
+class TestLogout:
+    """Test cases for token verification after logout."""
+
+    @pytest.fixture
+    def auth(self, db, monkeypatch):
+        auth_service = pytest.importorskip("app.services.auth_service")
+        store = _store(db, cleanup_interval=0)
+        monkeypatch.setattr(auth_service, "token_revocation_store", store)
+        monkeypatch.setattr(auth_service, "DatabaseManager", lambda: db)
+        auth_service._token_cache.clear()
+        return auth_service, auth_service.AuthService(), store
+
+    def test_cached_payload_is_rejected_after_logout(self, auth):
+        """Logging out revokes a token even though its payload is cached."""
+        auth_service, service, _ = auth
+        token = service.create_access_token(1, "user@example.com")
+
+        assert service.verify_token(token) is not None
+        assert len(auth_service._token_cache) == 1
+
+        assert service.logout_user(token)
+        assert service.verify_token(token) is None
+
+    def test_token_without_exp_stays_revoked(self, auth):
+        """A revoked token without exp is still rejected after cleanup runs."""
+        auth_service, service, store = auth
+        token = auth_service.jwt.encode(
+            {"sub": "1", "jti": uuid.uuid4().hex},
+            auth_service.settings.JWT_SECRET_KEY,
+            algorithm=auth_service.settings.JWT_ALGORITHM
+        )
+
+        assert service.verify_token(token) is not None
+        assert service.logout_user(token)
+
+        store.refresh()
+        assert service.verify_token(token) is None
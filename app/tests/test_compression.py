@@ -0,0 +1,73 @@
+import sys
+import os
+import asyncio
+import gzip
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.middleware.compression_middleware import CompressionMiddleware, choose_encoding
+
+def _app(body: bytes, etag: bytes = None, content_type: bytes = b"application/json"):
+    """Minimal ASGI app sending one complete body."""
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+        if etag is not None:
+            headers.append((b"etag", etag))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+def _request(app, accept_encoding: bytes = b"gzip"):
+    """Run one request through the middleware; return (headers, body)."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding)]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, receive, send))
+    headers = dict(messages[0]["headers"])
+    return headers, b"".join(m.get("body", b"") for m in messages[1:])
+
+class TestCompressionMiddleware:
+    """Test cases for response compression."""
+
+    def test_choose_encoding(self):
+        """gzip is picked when accepted, and q=0 or an empty header disables it."""
+        assert choose_encoding("gzip, deflate") in ("br", "gzip")
+        assert choose_encoding("identity") is None
+        assert choose_encoding("gzip;q=0") is None
+        assert choose_encoding("") is None
+
+    def test_large_body_is_compressed(self):
+        """Bodies above the threshold are gzipped with Vary and a weakened ETag."""
+        body = b'{"items": "' + b"x" * 1000 + b'"}'
+        headers, compressed = _request(_app(body, etag=b'"v1"'))
+
+        assert headers[b"content-encoding"] == b"gzip"
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert headers[b"etag"] == b'W/"v1"'
+        assert int(headers[b"content-length"]) == len(compressed)
+        assert gzip.decompress(compressed) == body
+
+    def test_small_body_is_sent_unchanged(self):
+        """Bodies below the threshold skip compression."""
+        headers, body = _request(_app(b'{"ok": true}'))
+
+        assert b"content-encoding" not in headers
+        assert body == b'{"ok": true}'
+
+    def test_same_etag_with_different_bodies(self):
+        """A reused ETag never serves the compressed copy of another body."""
+        first = b'{"items": "' + b"a" * 1000 + b'"}'
+        second = b'{"items": "' + b"b" * 1000 + b'"}'
+
+        _, compressed_first = _request(_app(first, etag=b'"shared"'))
+        _, compressed_second = _request(_app(second, etag=b'"shared"'))
+
+        assert gzip.decompress(compressed_first) == first
+        assert gzip.decompress(compressed_second) == second
@@ -0,0 +1,208 @@
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from dataclasses import replace
+
+from app.utils import migrations
+from app.utils.db_utils import DatabaseManager
+from app.utils.migrations import LATEST_VERSION, get_schema_version
+
+# user_schedule_stats computed from scratch, as the migration's backfill does
+STATS_FROM_SCRATCH_QUERY = """
+    SELECT COUNT(*) AS total_schedules,
+           COALESCE(SUM(s.status IS 'active'), 0) AS active_schedules,
+           COALESCE(SUM(s.status IS 'completed'), 0) AS completed_schedules,
+           COALESCE(SUM(h.total_hours), 0) AS total_hours,
+           COALESCE(SUM(h.completed_hours), 0) AS completed_hours
+    FROM schedules s
+    LEFT JOIN (
+        SELECT si.schedule_id,
+               SUM(COALESCE(r.estimated_hours, 0)) AS total_hours,
+               SUM(CASE WHEN si.is_completed THEN COALESCE(r.estimated_hours, 0) ELSE 0 END) AS completed_hours
+        FROM schedule_items si
+        LEFT JOIN resources r ON r.id = si.resource_id
+        GROUP BY si.schedule_id
+    ) h ON h.schedule_id = s.id
+    WHERE s.user_id = ?
+"""
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(str(tmp_path / "test.db"))
+
+def _item(resource_id, day="Monday", start="09:00"):
+    return {"resource_id": resource_id, "day_of_week": day, "start_time": start, "end_time": "10:00"}
+
+class TestScheduleStatsTriggers:
+    """Test cases for the trigger-maintained user_schedule_stats table."""
+
+    @pytest.fixture
+    def setup(self, db):
+        user_id = db.create_user("google-1", "user@example.com", "User")
+        resources = [
+            db.create_resource("Short", estimated_hours=1.5),
+            db.create_resource("Long", estimated_hours=4.0),
+            db.create_resource("Untimed", estimated_hours=None),
+        ]
+        return db, user_id, resources
+
+    def _assert_in_sync(self, db, user_id):
+        stats = db.get_user_schedule_stats(user_id)
+        expected = db.execute_query(STATS_FROM_SCRATCH_QUERY, (user_id,))[0]
+        for key, value in expected.items():
+            assert stats[key] == pytest.approx(value), key
+
+    def test_database_is_fully_migrated(self, db):
+        """A new database is created at the latest schema version."""
+        with db.get_connection() as conn:
+            assert get_schema_version(conn) == LATEST_VERSION
+
+    def test_schedule_and_item_inserts(self, setup):
+        """Creating schedules and adding items updates counts and hours."""
+        db, user_id, resources = setup
+
+        schedule = db.create_schedule_with_items(
+            user_id, "Plan", "2024-01-01", "2024-01-31", [_item(r) for r in resources]
+        )
+        db.add_schedule_item(schedule["schedule"]["id"], resources[1], "Tuesday", "09:00", "10:00")
+        db.create_schedule(user_id, "Empty", "2024-02-01", "2024-02-28")
+
+        stats = db.get_user_schedule_stats(user_id)
+        assert stats["total_schedules"] == 2
+        assert stats["total_hours"] == pytest.approx(9.5)
+        self._assert_in_sync(db, user_id)
+
+    def test_item_completion_and_updates(self, setup):
+        """Completing items and moving them to another resource keeps hours in sync."""
+        db, user_id, resources = setup
+        schedule = db.create_schedule_with_items(
+            user_id, "Plan", "2024-01-01", "2024-01-31", [_item(resources[0]), _item(resources[1])]
+        )
+        first, second = (item["id"] for item in schedule["items"])
+
+        db.mark_schedule_item_completed(first)
+        assert db.get_user_schedule_stats(user_id)["completed_hours"] == pytest.approx(1.5)
+        self._assert_in_sync(db, user_id)
+
+        db.update_schedule_item(first, resource_id=resources[1])
+        db.update_schedule_item(second, resource_id=resources[2])
+        self._assert_in_sync(db, user_id)
+
+        db.update_resource(resources[1], estimated_hours=6.0)
+        assert db.get_user_schedule_stats(user_id)["completed_hours"] == pytest.approx(6.0)
+        self._assert_in_sync(db, user_id)
+
+    def test_status_changes(self, setup):
+        """Status updates move schedules between the active and completed counts."""
+        db, user_id, resources = setup
+        schedule_id = db.create_schedule(user_id, "Plan", "2024-01-01", "2024-01-31")
+
+        db.execute_update("UPDATE schedules SET status = 'completed' WHERE id = ?", (schedule_id,))
+        stats = db.get_user_schedule_stats(user_id)
+        assert (stats["active_schedules"], stats["completed_schedules"]) == (0, 1)
+        self._assert_in_sync(db, user_id)
+
+        db.execute_update("UPDATE schedules SET status = 'archived' WHERE id = ?", (schedule_id,))
+        self._assert_in_sync(db, user_id)
+
+    @pytest.mark.parametrize("items_first", [True, False])
+    def test_deletes(self, setup, items_first):
+        """Deleting a schedule removes its counts and hours, whichever rows go first."""
+        db, user_id, resources = setup
+        keep = db.create_schedule_with_items(user_id, "Keep", "2024-01-01", "2024-01-31", [_item(resources[0])])
+        drop = db.create_schedule_with_items(
+            user_id, "Drop", "2024-01-01", "2024-01-31", [_item(resources[0]), _item(resources[1])]
+        )
+        db.mark_schedule_item_completed(drop["items"][0]["id"])
+        drop_id = drop["schedule"]["id"]
+
+        statements = [
+            ("DELETE FROM schedule_items WHERE schedule_id = ?", (drop_id,)),
+            ("DELETE FROM schedules WHERE id = ?", (drop_id,)),
+        ]
+        for query, params in (statements if items_first else reversed(statements)):
+            db.execute_update(query, params)
+
+        stats = db.get_user_schedule_stats(user_id)
+        assert stats["total_schedules"] == 1
+        assert stats["total_hours"] == pytest.approx(1.5)
+        assert stats["completed_hours"] == pytest.approx(0.0)
+        self._assert_in_sync(db, user_id)
+
+        db.execute_update("DELETE FROM schedule_items WHERE id = ?", (keep["items"][0]["id"],))
+        self._assert_in_sync(db, user_id)
+
+class TestResourceSearchIndex:
+    """Test cases for the trigger-maintained resources_fts index and its fallback."""
+
+    @pytest.fixture
+    def fts_db(self, db):
+        if not db.has_resource_search_index():
+            pytest.skip("SQLite was built without FTS5")
+        return db
+
+    @pytest.fixture
+    def no_fts_db(self, tmp_path, monkeypatch):
+        """A database migrated as if SQLite had no FTS5."""
+        monkeypatch.setattr(migrations, "MIGRATIONS", [
+            replace(migration, condition=lambda conn: False) if migration.condition else migration
+            for migration in migrations.MIGRATIONS
+        ])
+        return DatabaseManager(str(tmp_path / "no_fts.db"))
+
+    def _search_ids(self, db, query, **filters):
+        return [row["id"] for row in db.search_resources(query, **filters)]
+
+    def _assert_index_consistent(self, db):
+        # Raises if the index does not match the content table
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO resources_fts(resources_fts, rank) VALUES ('integrity-check', 1)")
+
+    def test_index_follows_inserts_updates_and_deletes(self, fts_db):
+        """Search results and the index stay in sync with writes to resources."""
+        db = fts_db
+        python_id = db.create_resource("Python basics", description="Learn Python syntax", tags="python")
+        sql_id = db.create_resource("SQL joins", description="Relational queries", tags="databases")
+        self._assert_index_consistent(db)
+        assert self._search_ids(db, "python") == [python_id]
+
+        db.update_resource(sql_id, title="Python and SQL")
+        assert sorted(self._search_ids(db, "python")) == sorted([python_id, sql_id])
+        assert self._search_ids(db, "joins") == []
+        self._assert_index_consistent(db)
+
+        db.execute_update("DELETE FROM resources WHERE id = ?", (python_id,))
+        assert self._search_ids(db, "python") == [sql_id]
+        self._assert_index_consistent(db)
+
+    def test_prefix_ranking_and_filters(self, fts_db):
+        """The last word matches as a prefix, title hits rank first, and filters apply."""
+        db = fts_db
+        in_title = db.create_resource("Docker deep dive", description="Containers", type="video")
+        in_description = db.create_resource("Deployment", description="Ship with docker", type="article")
+        inactive = db.create_resource("Docker archive", type="video")
+        db.update_resource(inactive, is_active=0)
+
+        results = db.search_resources("dock")
+        assert [row["id"] for row in results] == [in_title, in_description]
+        assert "<mark>" in results[0]["snippet"]
+        assert self._search_ids(db, "docker", resource_type="article") == [in_description]
+
+    def test_like_fallback_without_fts5(self, no_fts_db):
+        """Without FTS5 the index is skipped and search falls back to LIKE."""
+        db = no_fts_db
+        with db.get_connection() as conn:
+            assert get_schema_version(conn) == LATEST_VERSION
+        assert not db.has_resource_search_index()
+
+        first = db.create_resource("Python basics", description="Learn Python")
+        second = db.create_resource("Advanced topics", description="More python")
+        db.update_resource(second, title="Advanced Python")
+
+        results = db.search_resources("python")
+        assert [row["id"] for row in results] == [second, first]
+        assert results[0]["score"] is None and results[0]["snippet"] is None
@@ -0,0 +1,206 @@
+import sys
+import os
+import json
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+
+from app.utils.db_utils import DatabaseManager, encode_cursor
+
+# Cursors that must be rejected: not base64 JSON, not a list, wrong arity, wrong types
+INVALID_CURSORS = [
+    "not a cursor!",
+    encode_cursor({"id": 1}),
+    encode_cursor([1, 2, 3, 4]),
+    encode_cursor([["nested"], 1]),
+    encode_cursor([True, "x", None]),
+]
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(str(tmp_path / "test.db"))
+
+def _create_resources(db, count):
+    return [db.create_resource(f"Resource {i}", type="video") for i in range(count)]
+
+def _create_schedule(db, resource_ids):
+    user_id = db.create_user("google-1", "user@example.com", "User")
+    days = ["Monday", "Tuesday", "Wednesday"]
+    items = [
+        {
+            "resource_id": resource_id,
+            "day_of_week": days[i % len(days)],
+            "start_time": f"{9 + i % 4:02d}:00",
+            "end_time": f"{10 + i % 4:02d}:00",
+            "order_index": i
+        }
+        for i, resource_id in enumerate(resource_ids)
+    ]
+    schedule = db.create_schedule_with_items(user_id, "Plan", "2024-01-01", "2024-01-31", items)
+    return user_id, schedule["schedule"]["id"]
+
+def _walk(fetch_page):
+    """Follow next_cursor from the first page to the last, returning every page."""
+    pages = [fetch_page(None)]
+    while pages[-1]["next_cursor"]:
+        pages.append(fetch_page(pages[-1]["next_cursor"]))
+    return pages
+
+class TestKeysetPagination:
+    """Test cases for cursor-paginated database queries."""
+
+    @pytest.mark.parametrize("count, limit", [(5, 2), (4, 2), (3, 3), (1, 5), (0, 2)])
+    def test_resource_pages_cover_every_row_once(self, db, count, limit):
+        """Pages split at the limit, never repeat or skip a row, and the last has no cursor."""
+        resource_ids = _create_resources(db, count)
+
+        pages = _walk(lambda cursor: db.get_resources_page(cursor=cursor, limit=limit))
+
+        assert [len(page["items"]) for page in pages[:-1]] == [limit] * (len(pages) - 1)
+        assert pages[-1]["next_cursor"] is None
+        assert [row["id"] for page in pages for row in page["items"]] == resource_ids
+
+    def test_resource_pages_skip_inactive_rows(self, db):
+        """active_only pages leave out deactivated resources."""
+        resource_ids = _create_resources(db, 5)
+        db.update_resource(resource_ids[1], is_active=0)
+
+        pages = _walk(lambda cursor: db.get_resources_page(cursor=cursor, limit=2))
+
+        exported = [row["id"] for page in pages for row in page["items"]]
+        assert exported == [rid for rid in resource_ids if rid != resource_ids[1]]
+
+    def test_resume_from_cursor(self, db):
+        """A cursor resumes right after the last row of its page."""
+        resource_ids = _create_resources(db, 5)
+
+        first = db.get_resources_page(limit=2)
+        resumed = db.get_resources_page(cursor=first["next_cursor"], limit=10)
+
+        assert [row["id"] for row in resumed["items"]] == resource_ids[2:]
+        assert resumed["next_cursor"] is None
+
+    def test_schedule_item_pages_match_schedule_order(self, db):
+        """Item pages concatenate to the same rows, in order, as the schedule detail."""
+        _, schedule_id = _create_schedule(db, _create_resources(db, 7))
+
+        pages = _walk(lambda cursor: db.get_schedule_items_page(schedule_id, cursor=cursor, limit=3))
+
+        expected = [item["id"] for item in db.get_schedule_with_items(schedule_id)["items"]]
+        assert [row["id"] for page in pages for row in page["items"]] == expected
+
+    def test_user_schedule_pages(self, db):
+        """Schedule pages are newest first with a total that ignores the page size."""
+        user_id, _ = _create_schedule(db, _create_resources(db, 1))
+        for _ in range(4):
+            db.create_schedule_with_items(user_id, "Plan", "2024-01-01", "2024-01-31", [])
+
+        pages = _walk(lambda cursor: db.list_user_schedules(user_id, limit=2, cursor=cursor))
+
+        ids = [row["id"] for page in pages for row in page["schedules"]]
+        assert len(ids) == len(set(ids)) == 5
+        assert pages[0]["total"] == 5
+        assert ids == sorted(ids, reverse=True)
+
+    @pytest.mark.parametrize("cursor", INVALID_CURSORS)
+    def test_invalid_cursor_is_rejected(self, db, cursor):
+        """Malformed or tampered cursors raise ValueError on every paginated query."""
+        with pytest.raises(ValueError):
+            db.get_resources_page(cursor=cursor)
+        with pytest.raises(ValueError):
+            db.get_schedule_items_page(1, cursor=cursor)
+        with pytest.raises(ValueError):
+            db.list_user_schedules(1, cursor=cursor)
+
+class TestNdjsonExport:
+    """Test cases for the streaming NDJSON export endpoints."""
+
+    user = None
+
+    @pytest.fixture
+    def client(self, db, monkeypatch):
+        pytest.importorskip("fastapi")
+        pytest.importorskip("httpx")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from app.routes import resource_routes, schedule_routes
+
+        monkeypatch.setattr(resource_routes, "db", db)
+        monkeypatch.setattr(schedule_routes, "db", db)
+
+        app = FastAPI()
+        app.include_router(resource_routes.router)
+        app.include_router(schedule_routes.router)
+        app.dependency_overrides[schedule_routes.get_current_user] = lambda: self.user
+        return TestClient(app)
+
+    def _lines(self, response):
+        """Split an export into its rows and its next_cursor meta lines."""
+        rows, cursors = [], []
+        for line in response.text.splitlines():
+            record = json.loads(line)
+            if set(record) == {"next_cursor"}:
+                cursors.append(record["next_cursor"])
+            else:
+                rows.append(record)
+        return rows, cursors
+
+    def test_resource_export_streams_every_row(self, db, client):
+        """The export has one line per active resource and ends with a null cursor."""
+        _create_resources(db, 7)
+        table_count = db.execute_query("SELECT COUNT(*) AS count FROM resources WHERE is_active = 1")[0]["count"]
+
+        response = client.get("/api/v1/resources/export", params={"batch_size": 3})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows, cursors = self._lines(response)
+        assert len(rows) == table_count == 7
+        # One meta line per page, the last one marking the end of the export
+        assert len(cursors) == 3
+        assert cursors[-1] is None and all(cursors[:-1])
+
+    def test_resource_export_resumes_from_meta_cursor(self, db, client):
+        """Resuming with a streamed cursor returns exactly the remaining rows."""
+        resource_ids = _create_resources(db, 7)
+
+        full_rows, cursors = self._lines(client.get("/api/v1/resources/export", params={"batch_size": 3}))
+        resumed = client.get("/api/v1/resources/export", params={"batch_size": 3, "cursor": cursors[0]})
+
+        resumed_rows, _ = self._lines(resumed)
+        assert [row["id"] for row in full_rows] == resource_ids
+        assert [row["id"] for row in resumed_rows] == resource_ids[3:]
+
+    @pytest.mark.parametrize("cursor", INVALID_CURSORS)
+    def test_invalid_cursor_returns_400(self, client, cursor):
+        """A bad cursor is reported as 400 before any row is streamed."""
+        response = client.get("/api/v1/resources/export", params={"cursor": cursor})
+
+        assert response.status_code == 400
+        assert not response.headers["content-type"].startswith("application/x-ndjson")
+
+    def test_schedule_item_export(self, db, client):
+        """Schedule item exports stream every item and reject bad cursors."""
+        user_id, schedule_id = _create_schedule(db, _create_resources(db, 5))
+        self.user = {"id": user_id}
+
+        response = client.get(f"/api/v1/schedules/{schedule_id}/items/export", params={"batch_size": 2})
+        rows, cursors = self._lines(response)
+
+        assert response.status_code == 200
+        assert len(rows) == 5 and cursors[-1] is None
+        bad = client.get(f"/api/v1/schedules/{schedule_id}/items/export", params={"cursor": INVALID_CURSORS[0]})
+        assert bad.status_code == 400
+
+    def test_schedule_export(self, db, client):
+        """The schedule export streams every schedule of the current user."""
+        user_id, _ = _create_schedule(db, _create_resources(db, 1))
+        db.create_schedule_with_items(user_id, "Plan", "2024-01-01", "2024-01-31", [])
+        self.user = {"id": user_id}
+
+        rows, cursors = self._lines(client.get("/api/v1/schedules/export", params={"batch_size": 1}))
+
+        assert len(rows) == 2
+        assert cursors[-1] is None
@@ -1,10 +1,298 @@
 import sqlite3
 import os
+import base64
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
 from typing import List, Dict, Any, Optional
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.migrations import apply_migrations
+from app.utils.resource_catalog import CatalogSnapshot, ResourceCatalog
 import logging
 
 logger = logging.getLogger(__name__)
 
+class ConnectionPool:
+    """
+    Thread-safe pool of reusable SQLite connections.
+    
+    Each thread keeps one connection that is opened and configured (WAL,
+    synchronous=NORMAL, cache/mmap sizes, busy timeout) once and reused for
+    every statement. A semaphore bounds how many connections are checked out
+    at the same time. Connections run in autocommit mode; explicit
+    transactions are started with BEGIN.
+    """
+    
+    def __init__(self, db_path: str, max_connections: int = 16, busy_timeout_ms: int = 5000,
+                 cache_size_kb: int = 16384, mmap_size: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        
+        self._local = threading.local()
+        self._semaphore = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        
+        # Metrics
+        self._checkouts = 0
+        self._in_use = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """
+        Check out the calling thread's connection.
+        
+        Nested checkouts on the same thread reuse the connection without
+        taking another pool slot. The outermost checkout commits an open
+        transaction on success and rolls it back on error.
+        """
+        depth = getattr(self._local, "depth", 0)
+        
+        if depth == 0:
+            start = time.perf_counter()
+            self._semaphore.acquire()
+            waited = time.perf_counter() - start
+            
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._semaphore.release()
+                    raise
+                self._local.conn = conn
+            
+            with self._lock:
+                self._checkouts += 1
+                self._in_use += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+        else:
+            conn = self._local.conn
+        
+        self._local.depth = depth + 1
+        try:
+            yield conn
+            if depth == 0 and conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if depth == 0 and conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                with self._lock:
+                    self._in_use -= 1
+                self._semaphore.release()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Pool usage metrics."""
+        with self._lock:
+            return {
+                "db_path": self.db_path,
+                "max_connections": self.max_connections,
+                "open_connections": len(self._connections),
+                "in_use": self._in_use,
+                "checkouts": self._checkouts,
+                "total_wait_ms": round(self._total_wait * 1000, 3),
+                "avg_wait_ms": round(self._total_wait * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3)
+            }
+    
+    def close_all(self):
+        """Close every connection opened by this pool."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.warning(f"Error closing database connection: {e}")
+        self._local = threading.local()
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Get the shared connection pool for a database file, creating it on first use."""
+    key = os.path.abspath(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    db_path,
+                    max_connections=settings.DB_POOL_MAX_CONNECTIONS,
+                    busy_timeout_ms=settings.SQLITE_BUSY_TIMEOUT_MS,
+                    cache_size_kb=settings.SQLITE_CACHE_SIZE_KB,
+                    mmap_size=settings.SQLITE_MMAP_SIZE
+                )
+                _pools[key] = pool
+    return pool
+
+_user_caches: Dict[str, TTLCache] = {}
+
+def get_user_cache(db_path: str) -> TTLCache:
+    """Get the shared user-record cache for a database file."""
+    key = os.path.abspath(db_path)
+    cache = _user_caches.get(key)
+    if cache is None:
+        with _pools_lock:
+            cache = _user_caches.setdefault(
+                key, TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+            )
+    return cache
+
+_resource_catalogs: Dict[str, ResourceCatalog] = {}
+
+def get_resource_catalog(db_path: str) -> ResourceCatalog:
+    """Get the shared resource catalog cache for a database file."""
+    key = os.path.abspath(db_path)
+    catalog = _resource_catalogs.get(key)
+    if catalog is None:
+        with _pools_lock:
+            catalog = _resource_catalogs.setdefault(
+                key, ResourceCatalog(ttl=settings.RESOURCE_CATALOG_TTL_SECONDS)
+            )
+    return catalog
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def fts_match_expression(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+    
+    Every word must match; the last one also matches as a prefix, so results
+    update while the user is still typing. Words are quoted, so FTS5 operators
+    in the input are treated as plain text.
+    
+    Returns:
+        The expression, or None if the query has no searchable words
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+RESOURCE_SEARCH_FTS_QUERY = """
+    SELECT r.*,
+           -bm25(resources_fts, 10.0, 2.0, 5.0) AS score,
+           snippet(resources_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet
+    FROM resources_fts
+    JOIN resources r ON r.id = resources_fts.rowid
+    WHERE resources_fts MATCH ? AND r.is_active = 1{filters}
+    ORDER BY bm25(resources_fts, 10.0, 2.0, 5.0)
+    LIMIT ? OFFSET ?
+"""
+
+RESOURCE_SEARCH_LIKE_QUERY = """
+    SELECT r.*, NULL AS score, NULL AS snippet
+    FROM resources r
+    WHERE (r.title LIKE ? OR r.description LIKE ?) AND r.is_active = 1{filters}
+    ORDER BY r.title
+    LIMIT ? OFFSET ?
+"""
+
+_fts_available: Dict[str, bool] = {}
+
+SCHEDULE_ITEMS_QUERY = """
+    SELECT si.*, r.title, r.type, r.url, r.difficulty_level, r.estimated_hours
+    FROM schedule_items si
+    JOIN resources r ON si.resource_id = r.id
+    WHERE si.schedule_id = ?
+    ORDER BY si.day_of_week, si.start_time
+"""
+
+# Same rows and order as SCHEDULE_ITEMS_QUERY, paged by (day_of_week, start_time, id)
+SCHEDULE_ITEMS_PAGE_QUERY = """
+    SELECT si.*, r.title, r.type, r.url, r.difficulty_level, r.estimated_hours
+    FROM schedule_items si
+    JOIN resources r ON si.resource_id = r.id
+    WHERE si.schedule_id = ? AND (si.day_of_week, si.start_time, si.id) > (?, ?, ?)
+    ORDER BY si.day_of_week, si.start_time, si.id
+    LIMIT ?
+"""
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode keyset pagination values as an opaque cursor string."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _keyset_page(rows: List[Dict[str, Any]], limit: int, key) -> tuple:
+    """
+    Trim a page fetched with LIMIT limit + 1 and build the cursor for the next one.
+    
+    Returns:
+        Tuple of (page rows, next cursor or None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+def decode_cursor(cursor: str, types: tuple) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Opaque cursor string
+        types: Expected type of each keyset value, in order
+    
+    Raises:
+        ValueError: If the cursor is malformed or does not match types
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid pagination cursor")
+    for value, expected in zip(values, types):
+        # bool is an int subclass but never a valid key
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError("Invalid pagination cursor")
+    return values
+
+# Database files whose schema is up to date in this process
+_initialized_databases = set()
+_initialized_lock = threading.Lock()
+
+def pool_metrics() -> List[Dict[str, Any]]:
+    """Metrics for every connection pool in this process."""
+    return [pool.metrics() for pool in list(_pools.values())]
+
 class DatabaseManager:
     """
     Manages database connections and operations using raw SQL.
@@ -13,6 +301,9 @@ class DatabaseManager:
     def __init__(self, db_path: str = "app/data/clario.db"):
         self.db_path = db_path
         self.ensure_db_directory()
+        self.pool = get_pool(db_path)
+        self.user_cache = get_user_cache(db_path)
+        self.resource_catalog = get_resource_catalog(db_path)
         self.init_database()
     
     def ensure_db_directory(self):
@@ -22,161 +313,56 @@ class DatabaseManager:
             os.makedirs(db_dir, exist_ok=True)
     
     def get_connection(self):
-        """Get a database connection."""
-        return sqlite3.connect(self.db_path)
+        """Check out this thread's pooled database connection (use as a context manager)."""
+        return self.pool.connection()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: run several statements in one write transaction.
+        
+        Commits once when the block exits and rolls everything back on error.
+        Nested calls join the enclosing transaction.
+        """
+        with self.get_connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
     
     def init_database(self):
-        """Initialize the database with required tables."""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Create users table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        google_id TEXT UNIQUE,
-                        email TEXT UNIQUE,
-                        name TEXT,
-                        picture TEXT,
-                        role TEXT DEFAULT 'user',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Create learning_goals table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS learning_goals (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER,
-                        goal_title TEXT NOT NULL,
-                        description TEXT,
-                        difficulty_level INTEGER DEFAULT 1,
-                        target_hours INTEGER DEFAULT 10,
-                        deadline DATE,
-                        status TEXT DEFAULT 'active',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                """)
-                
-                # Create time_availability table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS time_availability (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER,
-                        day_of_week TEXT NOT NULL,
-                        start_time TIME NOT NULL,
-                        end_time TIME NOT NULL,
-                        is_available BOOLEAN DEFAULT 1,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                """)
-                
-                # Create resources table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS resources (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        description TEXT,
-                        type TEXT NOT NULL,
-                        url TEXT,
-                        difficulty_level INTEGER DEFAULT 1,
-                        estimated_hours REAL DEFAULT 1.0,
-                        tags TEXT,
-                        is_active BOOLEAN DEFAULT 1,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Create schedules table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS schedules (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER,
-                        title TEXT NOT NULL,
-                        description TEXT,
-                        start_date DATE NOT NULL,
-                        end_date DATE NOT NULL,
-                        status TEXT DEFAULT 'active',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                """)
-                
-                # Create schedule_items table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS schedule_items (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        schedule_id INTEGER,
-                        resource_id INTEGER,
-                        day_of_week TEXT NOT NULL,
-                        start_time TIME NOT NULL,
-                        end_time TIME NOT NULL,
-                        order_index INTEGER DEFAULT 0,
-                        is_completed BOOLEAN DEFAULT 0,
-                        completed_at TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (schedule_id) REFERENCES schedules (id),
-                        FOREIGN KEY (resource_id) REFERENCES resources (id)
-                    )
-                """)
-                
-                # Create user_progress table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS user_progress (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER,
-                        resource_id INTEGER,
-                        schedule_item_id INTEGER,
-                        progress_percentage REAL DEFAULT 0.0,
-                        time_spent_minutes INTEGER DEFAULT 0,
-                        last_accessed TIMESTAMP,
-                        notes TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users (id),
-                        FOREIGN KEY (resource_id) REFERENCES resources (id),
-                        FOREIGN KEY (schedule_item_id) REFERENCES schedule_items (id)
-                    )
-                """)
-                
-                # Create sessions table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS sessions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER,
-                        access_token TEXT,
-                        expires_at TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users (id)
-                    )
-                """)
-                
-                # Create logs table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS logs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        event TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        ip_address TEXT
-                    )
-                """)
-                
-                # Create indexes for better performance
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_google_id ON users(google_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_learning_goals_user_id ON learning_goals(user_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_time_availability_user_id ON time_availability(user_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_schedules_user_id ON schedules(user_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_schedule_items_schedule_id ON schedule_items(schedule_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_progress_user_id ON user_progress(user_id)")
-                
-                conn.commit()
-                logger.info("Database initialized successfully with all tables")
+        """
+        Bring the database schema up to date.
+        
+        Pending migrations run once per process and database file; later
+        DatabaseManager instances attach to the already-initialized store.
+        """
+        key = os.path.abspath(self.db_path)
+        if key in _initialized_databases:
+            return
+        
+        with _initialized_lock:
+            if key in _initialized_databases:
+                return
+            
+            try:
+                with self.get_connection() as conn:
+                    applied = apply_migrations(conn)
                 
-        except Exception as e:
-            logger.error(f"Error initializing database: {e}")
-            raise
+                _initialized_databases.add(key)
+                if applied:
+                    logger.info(f"Database initialized successfully ({applied} migrations applied)")
+                    
+            except Exception as e:
+                logger.error(f"Error initializing database: {e}")
+                raise
     
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """
@@ -191,7 +377,6 @@ class DatabaseManager:
         """
         try:
             with self.get_connection() as conn:
-                conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 cursor.execute(query, params)
                 
@@ -217,7 +402,6 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, params)
-                conn.commit()
                 return cursor.lastrowid
                 
         except Exception as e:
@@ -239,7 +423,6 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, params)
-                conn.commit()
                 return cursor.rowcount
                 
         except Exception as e:
@@ -261,6 +444,17 @@ class DatabaseManager:
         results = self.execute_query(query, (google_id,))
         return results[0] if results else None
     
+    def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Get user by ID, served from a short-TTL cache."""
+        user = self.user_cache.get(user_id)
+        if user is None:
+            results = self.execute_query("SELECT * FROM users WHERE id = ?", (user_id,))
+            if not results:
+                return None
+            user = results[0]
+            self.user_cache.set(user_id, user)
+        return dict(user)
+    
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email."""
         query = "SELECT * FROM users WHERE email = ?"
@@ -275,7 +469,10 @@ class DatabaseManager:
         set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
         query = f"UPDATE users SET {set_clause} WHERE id = ?"
         params = tuple(kwargs.values()) + (user_id,)
-        return self.execute_update(query, params)
+        try:
+            return self.execute_update(query, params)
+        finally:
+            self.user_cache.delete(user_id)
     
     # Session management methods
     def create_session(self, user_id: int, access_token: str, expires_at: str) -> int:
@@ -376,25 +573,120 @@ class DatabaseManager:
             INSERT INTO resources (title, description, type, url, difficulty_level, estimated_hours, tags)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """
-        return self.execute_insert(query, (title, description, type, url, difficulty_level, estimated_hours, tags))
+        try:
+            return self.execute_insert(query, (title, description, type, url, difficulty_level, estimated_hours, tags))
+        finally:
+            self.resource_catalog.invalidate()
     
-    def get_all_resources(self, active_only: bool = True) -> List[Dict[str, Any]]:
-        """Get all learning resources."""
+    def get_resource_catalog(self) -> CatalogSnapshot:
+        """
+        Get the cached resource catalog, reloading it after writes or when it expires.
+        
+        Every call compares the trigger-maintained catalog version in the
+        database with the snapshot's, so writes from other processes are seen
+        on the next read.
+        """
+        return self.resource_catalog.get(
+            lambda: self.execute_query("SELECT * FROM resources ORDER BY title"),
+            db_version=self.get_resource_catalog_version
+        )
+    
+    def get_resource_catalog_version(self) -> int:
+        """Get the database catalog version, bumped by triggers on every write to resources."""
+        rows = self.execute_query("SELECT version FROM resource_catalog_version WHERE id = 1")
+        return rows[0]["version"] if rows else 0
+    
+    def get_resources_page(self, cursor: str = None, limit: int = 500,
+                           active_only: bool = True) -> Dict[str, Any]:
+        """
+        Get one keyset page of resources ordered by id, straight from the database.
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after_id = 0
+        if cursor:
+            after_id = decode_cursor(cursor, (int,))[0]
+        
+        query = "SELECT * FROM resources WHERE id > ?"
         if active_only:
-            query = "SELECT * FROM resources WHERE is_active = 1 ORDER BY title"
+            query += " AND is_active = 1"
+        query += " ORDER BY id LIMIT ?"
+        
+        rows = self.execute_query(query, (after_id, limit + 1))
+        rows, next_cursor = _keyset_page(rows, limit, lambda last: [last['id']])
+        return {"items": rows, "next_cursor": next_cursor}
+    
+    def has_resource_search_index(self) -> bool:
+        """Check whether the resources_fts full-text index exists in this database."""
+        key = os.path.abspath(self.db_path)
+        available = _fts_available.get(key)
+        if available is None:
+            available = bool(self.execute_query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'resources_fts'"
+            ))
+            _fts_available[key] = available
+        return available
+    
+    def search_resources(self, query: str, resource_type: str = None, difficulty_level: int = None,
+                         limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Full-text search over active resources.
+        
+        Uses the FTS5 index (BM25 ranking weighted towards title, then tags,
+        then description, with a highlighted snippet) when it is available,
+        and falls back to a LIKE scan ordered by title otherwise.
+        
+        Args:
+            query: Free-text query
+            resource_type: Filter by resource type
+            difficulty_level: Filter by difficulty level
+            limit: Maximum number of rows
+            offset: Number of rows to skip
+            
+        Returns:
+            Matching resources with "score" and "snippet" (None without FTS5)
+        """
+        filters = ""
+        filter_params: List[Any] = []
+        if resource_type:
+            filters += " AND r.type = ?"
+            filter_params.append(resource_type)
+        if difficulty_level:
+            filters += " AND r.difficulty_level = ?"
+            filter_params.append(difficulty_level)
+        
+        match = fts_match_expression(query)
+        if match is not None and self.has_resource_search_index():
+            sql = RESOURCE_SEARCH_FTS_QUERY.format(filters=filters)
+            params = [match, *filter_params, limit, offset]
         else:
-            query = "SELECT * FROM resources ORDER BY title"
-        return self.execute_query(query)
+            sql = RESOURCE_SEARCH_LIKE_QUERY.format(filters=filters)
+            pattern = f"%{query}%"
+            params = [pattern, pattern, *filter_params, limit, offset]
+        
+        return self.execute_query(sql, tuple(params))
+    
+    def get_resource_by_id(self, resource_id: int) -> Optional[Dict[str, Any]]:
+        """Get a resource by ID from the catalog cache."""
+        resource = self.get_resource_catalog().by_id.get(resource_id)
+        return dict(resource) if resource else None
+    
+    def get_all_resources(self, active_only: bool = True) -> List[Dict[str, Any]]:
+        """Get all learning resources."""
+        catalog = self.get_resource_catalog()
+        resources = catalog.active if active_only else catalog.resources
+        return [dict(resource) for resource in resources]
     
     def get_resources_by_type(self, resource_type: str) -> List[Dict[str, Any]]:
         """Get resources by type."""
-        query = "SELECT * FROM resources WHERE type = ? AND is_active = 1 ORDER BY title"
-        return self.execute_query(query, (resource_type,))
+        resources = self.get_resource_catalog().active_by_type.get(resource_type, [])
+        return [dict(resource) for resource in resources]
     
     def get_resources_by_difficulty(self, difficulty_level: int) -> List[Dict[str, Any]]:
         """Get resources by difficulty level."""
-        query = "SELECT * FROM resources WHERE difficulty_level = ? AND is_active = 1 ORDER BY title"
-        return self.execute_query(query, (difficulty_level,))
+        resources = self.get_resource_catalog().active_by_difficulty.get(difficulty_level, [])
+        return [dict(resource) for resource in resources]
     
     def update_resource(self, resource_id: int, **kwargs) -> int:
         """Update a resource."""
@@ -404,7 +696,10 @@ class DatabaseManager:
         set_clause = ", ".join([f"{key} = ?" for key in kwargs.keys()])
         query = f"UPDATE resources SET {set_clause} WHERE id = ?"
         params = tuple(kwargs.values()) + (resource_id,)
-        return self.execute_update(query, params)
+        try:
+            return self.execute_update(query, params)
+        finally:
+            self.resource_catalog.invalidate()
     
     # Schedules methods
     def create_schedule(self, user_id: int, title: str, start_date: str, end_date: str, 
@@ -416,11 +711,99 @@ class DatabaseManager:
         """
         return self.execute_insert(query, (user_id, title, description, start_date, end_date))
     
+    def get_user_schedule_stats(self, user_id: int) -> Dict[str, Any]:
+        """
+        Get a user's schedule statistics.
+        
+        The user_schedule_stats row is kept current by triggers on schedules,
+        schedule_items and resources, so this is a single primary-key lookup.
+        """
+        rows = self.execute_query(
+            "SELECT * FROM user_schedule_stats WHERE user_id = ?",
+            (user_id,)
+        )
+        if rows:
+            return rows[0]
+        return {
+            'user_id': user_id,
+            'total_schedules': 0,
+            'active_schedules': 0,
+            'completed_schedules': 0,
+            'total_hours': 0.0,
+            'completed_hours': 0.0
+        }
+    
     def get_user_schedules(self, user_id: int) -> List[Dict[str, Any]]:
         """Get all schedules for a user."""
         query = "SELECT * FROM schedules WHERE user_id = ? ORDER BY created_at DESC"
         return self.execute_query(query, (user_id,))
     
+    def list_user_schedules(self, user_id: int, status: str = None, limit: int = 10,
+                            cursor: str = None, include_total: bool = True) -> Dict[str, Any]:
+        """
+        List a user's schedules with item counts and hours in a single aggregate query.
+        
+        Uses keyset pagination on (created_at, id), newest first.
+        
+        Args:
+            user_id: Owner of the schedules
+            status: Optional status filter
+            limit: Page size
+            cursor: Opaque cursor from a previous page's next_cursor
+            include_total: Also count all matching schedules (skip when streaming pages)
+            
+        Returns:
+            Dictionary with schedules, the total count (None if not requested) and the next cursor (or None)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        filters = "s.user_id = ?"
+        params: List[Any] = [user_id]
+        
+        if status:
+            filters += " AND s.status = ?"
+            params.append(status)
+        
+        total = None
+        if include_total:
+            total = self.execute_query(
+                f"SELECT COUNT(*) AS count FROM schedules s WHERE {filters}",
+                tuple(params)
+            )[0]['count']
+        
+        page_filters = filters
+        page_params = list(params)
+        if cursor:
+            values = decode_cursor(cursor, (str, int))
+            page_filters += " AND (s.created_at, s.id) < (?, ?)"
+            page_params.extend(values)
+        
+        # Fetch one extra row to know whether another page exists
+        rows = self.execute_query(
+            f"""
+                SELECT s.*,
+                       COUNT(si.id) AS items_count,
+                       COALESCE(SUM(r.estimated_hours), 0) AS total_hours
+                FROM schedules s
+                LEFT JOIN schedule_items si ON si.schedule_id = s.id
+                LEFT JOIN resources r ON r.id = si.resource_id
+                WHERE {page_filters}
+                GROUP BY s.id
+                ORDER BY s.created_at DESC, s.id DESC
+                LIMIT ?
+            """,
+            tuple(page_params) + (limit + 1,)
+        )
+        
+        rows, next_cursor = _keyset_page(rows, limit, lambda last: [last['created_at'], last['id']])
+        
+        return {
+            "schedules": rows,
+            "total": total,
+            "next_cursor": next_cursor
+        }
+    
     def get_schedule_with_items(self, schedule_id: int) -> Dict[str, Any]:
         """Get a schedule with its items."""
         # Get schedule
@@ -431,20 +814,79 @@ class DatabaseManager:
             return None
         
         # Get schedule items
-        items_query = """
-            SELECT si.*, r.title, r.type, r.url, r.difficulty_level, r.estimated_hours
-            FROM schedule_items si
-            JOIN resources r ON si.resource_id = r.id
-            WHERE si.schedule_id = ?
-            ORDER BY si.day_of_week, si.start_time
-        """
-        items = self.execute_query(items_query, (schedule_id,))
+        items = self.execute_query(SCHEDULE_ITEMS_QUERY, (schedule_id,))
         
         return {
             "schedule": schedule[0],
             "items": items
         }
     
+    def get_schedule_items_page(self, schedule_id: int, cursor: str = None,
+                                limit: int = 500) -> Dict[str, Any]:
+        """
+        Get one keyset page of a schedule's items, in get_schedule_with_items order.
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = ["", "", 0]
+        if cursor:
+            after = decode_cursor(cursor, (str, str, int))
+        
+        rows = self.execute_query(SCHEDULE_ITEMS_PAGE_QUERY, (schedule_id, *after, limit + 1))
+        rows, next_cursor = _keyset_page(
+            rows, limit, lambda last: [last['day_of_week'], last['start_time'], last['id']]
+        )
+        return {"items": rows, "next_cursor": next_cursor}
+    
+    def create_schedule_with_items(self, user_id: int, title: str, start_date: str, end_date: str,
+                                   items: List[Dict[str, Any]], description: str = None) -> Dict[str, Any]:
+        """
+        Create a schedule and all of its items in a single transaction.
+        
+        Args:
+            user_id: Owner of the schedule
+            title: Schedule title
+            start_date: Schedule start date
+            end_date: Schedule end date
+            items: Item dictionaries with resource_id, day_of_week, start_time,
+                end_time and order_index
+            description: Schedule description
+            
+        Returns:
+            Dictionary with the persisted schedule row and its item rows
+        """
+        with self.transaction() as conn:
+            schedule = conn.execute(
+                """
+                    INSERT INTO schedules (user_id, title, description, start_date, end_date)
+                    VALUES (?, ?, ?, ?, ?)
+                    RETURNING *
+                """,
+                (user_id, title, description, start_date, end_date)
+            ).fetchone()
+            schedule = dict(schedule)
+            
+            conn.executemany(
+                """
+                    INSERT INTO schedule_items (schedule_id, resource_id, day_of_week, start_time, end_time, order_index)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (schedule["id"], item["resource_id"], item["day_of_week"],
+                     item["start_time"], item["end_time"], item.get("order_index", 0))
+                    for item in items
+                ]
+            )
+            
+            # Read the items back joined with their resources, inside the same transaction
+            persisted_items = [dict(row) for row in conn.execute(SCHEDULE_ITEMS_QUERY, (schedule["id"],)).fetchall()]
+        
+        return {
+            "schedule": schedule,
+            "items": persisted_items
+        }
+    
     def add_schedule_item(self, schedule_id: int, resource_id: int, day_of_week: str, 
                          start_time: str, end_time: str, order_index: int = 0) -> int:
         """Add an item to a schedule."""
@@ -0,0 +1,137 @@
+"""
+Workload Executors
+
+Bounded thread pools for the blocking work done by async route handlers.
+SQLite queries, sklearn/pandas scoring and outbound HTTP each get their own
+pool, so a burst in one workload class cannot starve the others and none of
+them blocks the event loop.
+
+Usage:
+    rows = await run_db(db.get_user_schedules, user_id)
+    recommendations = await run_ml(recommender.get_recommendations, topic, top_k=5)
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class WorkloadExecutor:
+    """
+    A named, bounded thread pool that tracks its queue depth.
+
+    Work beyond max_workers waits in the executor queue; the queued and
+    active counts are exposed through metrics() for monitoring.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"clario-{name}"
+        )
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in this pool and await its result.
+
+        Context variables (e.g. request-scoped logging state) are propagated
+        to the worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, func, *args, **kwargs)
+
+        with self._lock:
+            self._submitted += 1
+        return await loop.run_in_executor(self._executor, call)
+
+    def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self._active += 1
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        else:
+            with self._lock:
+                self._completed += 1
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current pool usage and queue depth."""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": self._submitted - finished - self._active,
+                "completed": self._completed,
+                "failed": self._failed
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+def _default_workers(configured: int, fallback: int) -> int:
+    return configured if configured > 0 else fallback
+
+_cpu_count = os.cpu_count() or 1
+
+db_executor = WorkloadExecutor(
+    "db",
+    # More DB workers than pooled connections would only queue on the pool
+    _default_workers(settings.DB_EXECUTOR_WORKERS, settings.DB_POOL_MAX_CONNECTIONS)
+)
+ml_executor = WorkloadExecutor(
+    "ml",
+    _default_workers(settings.ML_EXECUTOR_WORKERS, _cpu_count)
+)
+http_executor = WorkloadExecutor(
+    "http",
+    _default_workers(settings.HTTP_EXECUTOR_WORKERS, min(32, _cpu_count * 4))
+)
+
+_executors = (db_executor, ml_executor, http_executor)
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking database work in the DB pool."""
+    return await db_executor.run(func, *args, **kwargs)
+
+async def run_ml(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run CPU-bound model scoring and pandas work in the ML pool."""
+    return await ml_executor.run(func, *args, **kwargs)
+
+async def run_http(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking outbound HTTP calls in the HTTP pool."""
+    return await http_executor.run(func, *args, **kwargs)
+
+def executor_metrics() -> Dict[str, Dict[str, Any]]:
+    """Usage and queue depth of every workload pool."""
+    return {executor.name: executor.metrics() for executor in _executors}
+
+def shutdown_executors(wait: bool = True):
+    """Shut down all workload pools (application shutdown)."""
+    for executor in _executors:
+        executor.shutdown(wait=wait)
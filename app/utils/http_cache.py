@@ -0,0 +1,82 @@
+"""
+HTTP Response Caching
+
+Strong ETags for endpoints whose payload only changes when a catalog or model
+is reloaded. The ETag is derived from the request path and query plus the
+version of the data behind it, so it can be computed without building the
+response; a matching If-None-Match short-circuits to 304 Not Modified.
+
+Usage:
+    @router.get("/genres")
+    async def get_genres(request: Request, response: Response):
+        cached = conditional_response(request, response, model_registry.version("books"))
+        if cached:
+            return cached
+        ...
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.config import settings
+
+def make_etag(*parts: str) -> str:
+    """Build a strong, quoted ETag from version parts."""
+    digest = hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:20]
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses weak comparison, as RFC 9110 requires for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    version: Optional[str],
+    max_age: int = None
+) -> Optional[Response]:
+    """
+    Apply ETag/Cache-Control headers and answer conditional GETs.
+
+    Args:
+        request: Incoming request
+        response: The endpoint's response object (headers are set on it)
+        version: Version or content fingerprint of the data behind the endpoint;
+            None disables caching for this response
+        max_age: Cache-Control max-age in seconds
+
+    Returns:
+        A 304 response if the client's copy is current, otherwise None
+    """
+    if version is None:
+        return None
+
+    max_age = settings.HTTP_CACHE_MAX_AGE_SECONDS if max_age is None else max_age
+    etag = make_etag(request.url.path, request.url.query, version)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}"
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
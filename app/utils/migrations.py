@@ -0,0 +1,506 @@
+"""
+Database Migrations
+
+Versioned schema migrations for the SQLite database. The applied version is
+recorded in the schema_migrations table; apply_migrations() runs only the
+pending migrations, inside a single write transaction, so a fully migrated
+database costs one read-only query to check.
+
+To change the schema, append a new Migration with the next version number.
+Never edit a migration that has already shipped.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A single schema migration.
+    
+    If condition is set and returns False for the connection, the migration
+    is recorded as applied without running its statements. Use it for
+    optional SQLite features; code relying on them must check at runtime.
+    """
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+    condition: Optional[Callable[[sqlite3.Connection], bool]] = None
+
+def has_fts5(conn: sqlite3.Connection) -> bool:
+    """Check whether the SQLite library was built with FTS5."""
+    return bool(conn.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0])
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Initial schema",
+        statements=(
+            # users
+            """
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    google_id TEXT UNIQUE,
+                    email TEXT UNIQUE,
+                    name TEXT,
+                    picture TEXT,
+                    role TEXT DEFAULT 'user',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """,
+            # learning_goals
+            """
+                CREATE TABLE IF NOT EXISTS learning_goals (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    goal_title TEXT NOT NULL,
+                    description TEXT,
+                    difficulty_level INTEGER DEFAULT 1,
+                    target_hours INTEGER DEFAULT 10,
+                    deadline DATE,
+                    status TEXT DEFAULT 'active',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            """,
+            # time_availability
+            """
+                CREATE TABLE IF NOT EXISTS time_availability (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    day_of_week TEXT NOT NULL,
+                    start_time TIME NOT NULL,
+                    end_time TIME NOT NULL,
+                    is_available BOOLEAN DEFAULT 1,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            """,
+            # resources
+            """
+                CREATE TABLE IF NOT EXISTS resources (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    type TEXT NOT NULL,
+                    url TEXT,
+                    difficulty_level INTEGER DEFAULT 1,
+                    estimated_hours REAL DEFAULT 1.0,
+                    tags TEXT,
+                    is_active BOOLEAN DEFAULT 1,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """,
+            # schedules
+            """
+                CREATE TABLE IF NOT EXISTS schedules (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    start_date DATE NOT NULL,
+                    end_date DATE NOT NULL,
+                    status TEXT DEFAULT 'active',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            """,
+            # schedule_items
+            """
+                CREATE TABLE IF NOT EXISTS schedule_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    schedule_id INTEGER,
+                    resource_id INTEGER,
+                    day_of_week TEXT NOT NULL,
+                    start_time TIME NOT NULL,
+                    end_time TIME NOT NULL,
+                    order_index INTEGER DEFAULT 0,
+                    is_completed BOOLEAN DEFAULT 0,
+                    completed_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (schedule_id) REFERENCES schedules (id),
+                    FOREIGN KEY (resource_id) REFERENCES resources (id)
+                )
+            """,
+            # user_progress
+            """
+                CREATE TABLE IF NOT EXISTS user_progress (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    resource_id INTEGER,
+                    schedule_item_id INTEGER,
+                    progress_percentage REAL DEFAULT 0.0,
+                    time_spent_minutes INTEGER DEFAULT 0,
+                    last_accessed TIMESTAMP,
+                    notes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id),
+                    FOREIGN KEY (resource_id) REFERENCES resources (id),
+                    FOREIGN KEY (schedule_item_id) REFERENCES schedule_items (id)
+                )
+            """,
+            # sessions
+            """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    access_token TEXT,
+                    expires_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            """,
+            # logs
+            """
+                CREATE TABLE IF NOT EXISTS logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event TEXT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ip_address TEXT
+                )
+            """,
+            # Indexes
+            "CREATE INDEX IF NOT EXISTS idx_users_google_id ON users(google_id)",
+            "CREATE INDEX IF NOT EXISTS idx_learning_goals_user_id ON learning_goals(user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_time_availability_user_id ON time_availability(user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_schedules_user_id ON schedules(user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_schedule_items_schedule_id ON schedule_items(schedule_id)",
+            "CREATE INDEX IF NOT EXISTS idx_user_progress_user_id ON user_progress(user_id)",
+        )
+    ),
+    Migration(
+        version=2,
+        description="Keyset pagination index for schedule listing",
+        statements=(
+            "CREATE INDEX IF NOT EXISTS idx_schedules_user_created ON schedules(user_id, created_at, id)",
+        )
+    ),
+    Migration(
+        version=3,
+        description="Per-user schedule statistics maintained by triggers",
+        statements=(
+            """
+                CREATE TABLE IF NOT EXISTS user_schedule_stats (
+                    user_id INTEGER PRIMARY KEY,
+                    total_schedules INTEGER NOT NULL DEFAULT 0,
+                    active_schedules INTEGER NOT NULL DEFAULT 0,
+                    completed_schedules INTEGER NOT NULL DEFAULT 0,
+                    total_hours REAL NOT NULL DEFAULT 0,
+                    completed_hours REAL NOT NULL DEFAULT 0,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            """,
+            # Item hours come from the linked resource
+            "CREATE INDEX IF NOT EXISTS idx_schedule_items_resource_id ON schedule_items(resource_id)",
+            # Backfill from existing data
+            """
+                INSERT OR REPLACE INTO user_schedule_stats
+                    (user_id, total_schedules, active_schedules, completed_schedules, total_hours, completed_hours)
+                SELECT s.user_id,
+                       COUNT(*),
+                       SUM(s.status IS 'active'),
+                       SUM(s.status IS 'completed'),
+                       COALESCE(SUM(h.total_hours), 0),
+                       COALESCE(SUM(h.completed_hours), 0)
+                FROM schedules s
+                LEFT JOIN (
+                    SELECT si.schedule_id,
+                           SUM(COALESCE(r.estimated_hours, 0)) AS total_hours,
+                           SUM(CASE WHEN si.is_completed THEN COALESCE(r.estimated_hours, 0) ELSE 0 END) AS completed_hours
+                    FROM schedule_items si
+                    LEFT JOIN resources r ON r.id = si.resource_id
+                    GROUP BY si.schedule_id
+                ) h ON h.schedule_id = s.id
+                WHERE s.user_id IS NOT NULL
+                GROUP BY s.user_id
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_schedules_stats_insert
+                AFTER INSERT ON schedules
+                WHEN NEW.user_id IS NOT NULL
+                BEGIN
+                    INSERT OR IGNORE INTO user_schedule_stats (user_id) VALUES (NEW.user_id);
+                    UPDATE user_schedule_stats
+                    SET total_schedules = total_schedules + 1,
+                        active_schedules = active_schedules + (NEW.status IS 'active'),
+                        completed_schedules = completed_schedules + (NEW.status IS 'completed')
+                    WHERE user_id = NEW.user_id;
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_schedules_stats_status
+                AFTER UPDATE OF status ON schedules
+                WHEN NEW.user_id IS NOT NULL AND OLD.status IS NOT NEW.status
+                BEGIN
+                    UPDATE user_schedule_stats
+                    SET active_schedules = active_schedules - (OLD.status IS 'active') + (NEW.status IS 'active'),
+                        completed_schedules = completed_schedules - (OLD.status IS 'completed') + (NEW.status IS 'completed')
+                    WHERE user_id = NEW.user_id;
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_schedules_stats_delete
+                AFTER DELETE ON schedules
+                WHEN OLD.user_id IS NOT NULL
+                BEGIN
+                    UPDATE user_schedule_stats
+                    SET total_schedules = total_schedules - 1,
+                        active_schedules = active_schedules - (OLD.status IS 'active'),
+                        completed_schedules = completed_schedules - (OLD.status IS 'completed'),
+                        total_hours = total_hours - COALESCE((
+                            SELECT SUM(r.estimated_hours)
+                            FROM schedule_items si JOIN resources r ON r.id = si.resource_id
+                            WHERE si.schedule_id = OLD.id
+                        ), 0),
+                        completed_hours = completed_hours - COALESCE((
+                            SELECT SUM(r.estimated_hours)
+                            FROM schedule_items si JOIN resources r ON r.id = si.resource_id
+                            WHERE si.schedule_id = OLD.id AND si.is_completed
+                        ), 0)
+                    WHERE user_id = OLD.user_id;
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_schedule_items_stats_insert
+                AFTER INSERT ON schedule_items
+                BEGIN
+                    UPDATE user_schedule_stats
+                    SET total_hours = total_hours
+                            + COALESCE((SELECT estimated_hours FROM resources WHERE id = NEW.resource_id), 0),
+                        completed_hours = completed_hours + CASE WHEN NEW.is_completed
+                            THEN COALESCE((SELECT estimated_hours FROM resources WHERE id = NEW.resource_id), 0)
+                            ELSE 0 END
+                    WHERE user_id = (SELECT user_id FROM schedules WHERE id = NEW.schedule_id);
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_schedule_items_stats_update
+                AFTER UPDATE OF is_completed, resource_id, schedule_id ON schedule_items
+                BEGIN
+                    UPDATE user_schedule_stats
+                    SET total_hours = total_hours
+                            - COALESCE((SELECT estimated_hours FROM resources WHERE id = OLD.resource_id), 0),
+                        completed_hours = completed_hours - CASE WHEN OLD.is_completed
+                            THEN COALESCE((SELECT estimated_hours FROM resources WHERE id = OLD.resource_id), 0)
+                            ELSE 0 END
+                    WHERE user_id = (SELECT user_id FROM schedules WHERE id = OLD.schedule_id);
+                    UPDATE user_schedule_stats
+                    SET total_hours = total_hours
+                            + COALESCE((SELECT estimated_hours FROM resources WHERE id = NEW.resource_id), 0),
+                        completed_hours = completed_hours + CASE WHEN NEW.is_completed
+                            THEN COALESCE((SELECT estimated_hours FROM resources WHERE id = NEW.resource_id), 0)
+                            ELSE 0 END
+                    WHERE user_id = (SELECT user_id FROM schedules WHERE id = NEW.schedule_id);
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_schedule_items_stats_delete
+                AFTER DELETE ON schedule_items
+                BEGIN
+                    UPDATE user_schedule_stats
+                    SET total_hours = total_hours
+                            - COALESCE((SELECT estimated_hours FROM resources WHERE id = OLD.resource_id), 0),
+                        completed_hours = completed_hours - CASE WHEN OLD.is_completed
+                            THEN COALESCE((SELECT estimated_hours FROM resources WHERE id = OLD.resource_id), 0)
+                            ELSE 0 END
+                    WHERE user_id = (SELECT user_id FROM schedules WHERE id = OLD.schedule_id);
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_resources_stats_hours
+                AFTER UPDATE OF estimated_hours ON resources
+                WHEN OLD.estimated_hours IS NOT NEW.estimated_hours
+                BEGIN
+                    UPDATE user_schedule_stats
+                    SET total_hours = total_hours
+                            + (COALESCE(NEW.estimated_hours, 0) - COALESCE(OLD.estimated_hours, 0)) * (
+                                SELECT COUNT(*) FROM schedule_items si JOIN schedules s ON s.id = si.schedule_id
+                                WHERE si.resource_id = NEW.id AND s.user_id = user_schedule_stats.user_id
+                            ),
+                        completed_hours = completed_hours
+                            + (COALESCE(NEW.estimated_hours, 0) - COALESCE(OLD.estimated_hours, 0)) * (
+                                SELECT COUNT(*) FROM schedule_items si JOIN schedules s ON s.id = si.schedule_id
+                                WHERE si.resource_id = NEW.id AND s.user_id = user_schedule_stats.user_id
+                                  AND si.is_completed
+                            )
+                    WHERE user_id IN (
+                        SELECT s.user_id FROM schedule_items si JOIN schedules s ON s.id = si.schedule_id
+                        WHERE si.resource_id = NEW.id
+                    );
+                END
+            """,
+        )
+    ),
+    Migration(
+        version=4,
+        description="Revoked access tokens",
+        statements=(
+            # AUTOINCREMENT keeps ids monotonic so readers can sync incrementally
+            """
+                CREATE TABLE IF NOT EXISTS revoked_tokens (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    jti TEXT NOT NULL UNIQUE,
+                    user_id INTEGER,
+                    expires_at REAL NOT NULL,
+                    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at ON revoked_tokens(expires_at)",
+        )
+    ),
+    Migration(
+        version=5,
+        description="Full-text search index over resources",
+        condition=has_fts5,
+        statements=(
+            # External-content table: the text lives in resources, FTS5 keeps only the index
+            """
+                CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
+                    title, description, tags,
+                    content='resources', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+            """,
+            "INSERT INTO resources_fts(resources_fts) VALUES ('rebuild')",
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_resources_fts_insert
+                AFTER INSERT ON resources
+                BEGIN
+                    INSERT INTO resources_fts (rowid, title, description, tags)
+                    VALUES (NEW.id, NEW.title, NEW.description, NEW.tags);
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_resources_fts_delete
+                AFTER DELETE ON resources
+                BEGIN
+                    INSERT INTO resources_fts (resources_fts, rowid, title, description, tags)
+                    VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.tags);
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_resources_fts_update
+                AFTER UPDATE OF title, description, tags ON resources
+                BEGIN
+                    INSERT INTO resources_fts (resources_fts, rowid, title, description, tags)
+                    VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.tags);
+                    INSERT INTO resources_fts (rowid, title, description, tags)
+                    VALUES (NEW.id, NEW.title, NEW.description, NEW.tags);
+                END
+            """,
+        )
+    ),
+    Migration(
+        version=6,
+        description="Resource catalog version maintained by triggers",
+        statements=(
+            # Bumped on every write to resources, so each worker process can
+            # tell whether its cached catalog is current with one PK lookup
+            """
+                CREATE TABLE IF NOT EXISTS resource_catalog_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """,
+            "INSERT OR IGNORE INTO resource_catalog_version (id, version) VALUES (1, 0)",
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_resources_catalog_insert
+                AFTER INSERT ON resources
+                BEGIN
+                    UPDATE resource_catalog_version SET version = version + 1 WHERE id = 1;
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_resources_catalog_update
+                AFTER UPDATE ON resources
+                BEGIN
+                    UPDATE resource_catalog_version SET version = version + 1 WHERE id = 1;
+                END
+            """,
+            """
+                CREATE TRIGGER IF NOT EXISTS trg_resources_catalog_delete
+                AFTER DELETE ON resources
+                BEGIN
+                    UPDATE resource_catalog_version SET version = version + 1 WHERE id = 1;
+                END
+            """,
+        )
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Get the schema version recorded in the database.
+    
+    Args:
+        conn: Database connection
+        
+    Returns:
+        Highest applied migration version, or 0 for an unversioned database
+    """
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    except sqlite3.OperationalError:
+        # schema_migrations does not exist yet
+        return 0
+    return row[0] or 0
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Apply all pending migrations.
+    
+    The version check is read-only; the write lock is only taken when
+    migrations are pending, and the version is re-checked under the lock so
+    concurrent workers never apply the same migration twice.
+    
+    Args:
+        conn: Database connection in autocommit mode
+        
+    Returns:
+        Number of migrations applied
+    """
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return 0
+    
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        current_version = get_schema_version(conn)
+        pending = [m for m in MIGRATIONS if m.version > current_version]
+        
+        for migration in pending:
+            if migration.condition is not None and not migration.condition(conn):
+                logger.warning(
+                    f"Skipping database migration {migration.version} ({migration.description}): "
+                    "required SQLite feature is unavailable"
+                )
+            else:
+                for statement in migration.statements:
+                    conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                (migration.version, migration.description)
+            )
+            logger.info(f"Applied database migration {migration.version}: {migration.description}")
+        
+        conn.execute("COMMIT")
+        return len(pending)
+        
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
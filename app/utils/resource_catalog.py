@@ -0,0 +1,147 @@
+"""
+Resource Catalog Cache
+
+In-process, read-through cache of the resources table. The whole catalog is
+loaded with one query into an immutable snapshot with precomputed type and
+difficulty facets. Triggers on resources bump a version row in the database,
+and every read compares it with the version the snapshot was loaded at, so
+writes made by any worker process cause a reload on the next read. Writes
+through DatabaseManager also bump an in-process version, and a TTL bounds the
+age of a snapshot.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    An immutable view of the resources table. Treat the rows as read-only.
+    
+    The fingerprint hashes the row contents, so it is identical across
+    processes that loaded the same data (unlike the in-process version).
+    """
+    version: int
+    loaded_at: float
+    resources: List[Dict[str, Any]]
+    db_version: Optional[int] = None
+    fingerprint: str = ""
+    by_id: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    active: List[Dict[str, Any]] = field(default_factory=list)
+    active_by_type: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    active_by_difficulty: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+    types: List[str] = field(default_factory=list)
+    difficulty_levels: List[int] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, version: int, resources: List[Dict[str, Any]],
+              db_version: Optional[int] = None) -> "CatalogSnapshot":
+        """
+        Build a snapshot from resource rows ordered by title.
+
+        Args:
+            version: In-process catalog version the rows were loaded at
+            resources: All resource rows, active and inactive
+            db_version: Database catalog version read before loading the rows
+        """
+        active = [resource for resource in resources if resource["is_active"]]
+        active_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        active_by_difficulty: Dict[int, List[Dict[str, Any]]] = {}
+        for resource in active:
+            active_by_type.setdefault(resource["type"], []).append(resource)
+            active_by_difficulty.setdefault(resource["difficulty_level"], []).append(resource)
+
+        return cls(
+            version=version,
+            loaded_at=time.time(),
+            resources=resources,
+            db_version=db_version,
+            fingerprint=hashlib.sha1(
+                json.dumps(resources, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()[:16],
+            by_id={resource["id"]: resource for resource in resources},
+            active=active,
+            active_by_type=active_by_type,
+            active_by_difficulty=active_by_difficulty,
+            types=list(active_by_type),
+            difficulty_levels=sorted(level for level in active_by_difficulty if level is not None)
+        )
+
+class ResourceCatalog:
+    """
+    Version-stamped holder of the current catalog snapshot.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Args:
+            ttl: Maximum snapshot age in seconds
+        """
+        self.ttl = ttl
+        self._version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+        self._version_lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self):
+        """Mark the current snapshot stale (call after every write to resources)."""
+        with self._version_lock:
+            self._version += 1
+
+    def peek(self, db_version: Optional[int] = None) -> Optional[CatalogSnapshot]:
+        """
+        Return the snapshot if it is still fresh, without ever loading.
+
+        Args:
+            db_version: Current database catalog version; the snapshot is
+                stale if it was loaded at a different one
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._version:
+            return None
+        if db_version is not None and snapshot.db_version != db_version:
+            return None
+        if time.time() - snapshot.loaded_at >= self.ttl:
+            return None
+        return snapshot
+
+    def get(
+        self,
+        load: Callable[[], List[Dict[str, Any]]],
+        db_version: Optional[Callable[[], int]] = None
+    ) -> CatalogSnapshot:
+        """
+        Return a fresh snapshot, loading it with load() if needed.
+
+        Concurrent readers wait for a single in-progress load.
+
+        Args:
+            load: Returns all resource rows ordered by title
+            db_version: Returns the current database catalog version
+        """
+        current_db_version = db_version() if db_version is not None else None
+        snapshot = self.peek(current_db_version)
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            # Re-read: another thread may have loaded a newer snapshot meanwhile
+            current_db_version = db_version() if db_version is not None else None
+            snapshot = self.peek(current_db_version)
+            if snapshot is not None:
+                return snapshot
+
+            # Stamp with the versions seen before loading, so a write that
+            # lands mid-load leaves the snapshot stale instead of hiding it
+            version = self._version
+            snapshot = CatalogSnapshot.build(version, load(), db_version=current_db_version)
+            self._snapshot = snapshot
+            return snapshot
@@ -0,0 +1,82 @@
+"""
+Single-Flight Request Coalescing
+
+Concurrent callers asking for the same key share one in-flight computation
+instead of each running it, and the result is kept in a short-lived TTL cache
+for callers that arrive just after it finished.
+
+The computation runs as its own task, so a caller that disconnects (and is
+cancelled) does not cancel the work the other callers are waiting on.
+Failures are shared with the callers already waiting but never cached.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.utils.cache import TTLCache
+
+_MISSING = object()
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls and caches their results.
+
+    Cached results are shared between callers; treat them as read-only.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        """
+        Args:
+            maxsize: Maximum number of cached results
+            ttl: How long a result stays cached, in seconds (0 disables caching)
+        """
+        self._results = TTLCache(maxsize=maxsize if ttl > 0 else 0, ttl=ttl)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._coalesced = 0
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the result for key, computing it at most once at a time.
+
+        Args:
+            key: Hashable key identifying the computation
+            compute: Coroutine function producing the result
+
+        Returns:
+            The cached, shared or freshly computed result
+        """
+        result = self._results.get(key, _MISSING)
+        if result is not _MISSING:
+            return result
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self._coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        # Retrieving the exception also keeps asyncio from logging it as unhandled
+        # when every waiter has gone away
+        if task.exception() is None:
+            self._results.set(key, task.result())
+
+    def clear(self):
+        """Drop all cached results (in-flight computations are unaffected)."""
+        self._results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters plus in-flight and coalesced call counts."""
+        return {
+            **self._results.stats(),
+            "in_flight": len(self._inflight),
+            "coalesced": self._coalesced
+        }
@@ -0,0 +1,64 @@
+"""
+Streaming Exports
+
+NDJSON streaming over keyset-paginated queries. Each page is fetched by one
+executor call (pooled SQLite connections belong to a thread, so a cursor is
+never carried across awaits), serialized, and flushed before the next page
+is read. Memory stays bounded by the page size, and the first bytes go out
+as soon as the first page is ready.
+
+Every page is followed by a meta line {"next_cursor": ...} holding the cursor
+to resume after the rows sent so far; the last one is {"next_cursor": null}.
+A client whose download breaks resumes from the last meta line it received,
+and a stream that does not end with a null cursor was cut short.
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+from app.utils.responses import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+PageFetcher = Callable[[Optional[str]], Awaitable[Dict[str, Any]]]
+
+async def iter_ndjson(fetch_page: PageFetcher, first_page: Dict[str, Any],
+                      items_key: str = "items") -> AsyncIterator[bytes]:
+    """
+    Yield NDJSON chunks, one chunk per page: its rows, then its next_cursor meta line.
+
+    Args:
+        fetch_page: Coroutine function taking a cursor and returning a page dict
+            with the rows under items_key and a "next_cursor"
+        first_page: The already fetched first page
+        items_key: Key of the rows in the page dict
+    """
+    page = first_page
+    while True:
+        cursor = page.get("next_cursor")
+        lines = [dumps(item) + b"\n" for item in page[items_key]]
+        lines.append(dumps({"next_cursor": cursor}) + b"\n")
+        yield b"".join(lines)
+
+        if not cursor:
+            break
+        page = await fetch_page(cursor)
+
+def ndjson_response(fetch_page: PageFetcher, first_page: Dict[str, Any],
+                    items_key: str = "items", filename: str = None) -> StreamingResponse:
+    """
+    Build a streaming NDJSON response over a paginated query.
+
+    The caller fetches the first page itself, so an invalid starting cursor
+    can still be turned into an error status before streaming begins.
+    """
+    headers = {"X-Content-Type-Options": "nosniff"}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    return StreamingResponse(
+        iter_ndjson(fetch_page, first_page, items_key),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers
+    )
@@ -4,6 +4,10 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from app.routes import router
 from app.config import settings
+from app.middleware.compression_middleware import CompressionMiddleware
+from app.services.google_oauth_client import google_oauth_client
+from app.utils.executors import shutdown_executors
+from app.utils.responses import FastJSONResponse
 import logging
 import traceback
 
@@ -19,7 +23,8 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Clario Backend API with ML-powered learning recommendations",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -31,6 +36,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (added last so it wraps CORS and sees final headers)
+app.add_middleware(CompressionMiddleware)
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -62,6 +70,11 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # Include all routes
 app.include_router(router)
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await google_oauth_client.aclose()
+    shutdown_executors(wait=False)
+
 @app.get("/")
 def root():
     return {